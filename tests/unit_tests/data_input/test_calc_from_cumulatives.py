@@ -2,6 +2,7 @@ from typing import List
 from pathlib import Path
 
 import pytest
+import numpy as np
 import pandas as pd
 
 import webviz_subsurface._datainput.from_timeseries_cumulatives as from_cum
@@ -182,3 +183,43 @@ def test_calc_from_cumulatives_errors(
             time_index_input=time_index_input,
             as_rate=as_rate,
         )
+
+
+def test_calc_from_cumulatives_intervals() -> None:
+    dates = pd.date_range("2000-01-01", "2000-12-31", freq="D")
+    data_df = pd.concat(
+        [
+            pd.DataFrame(
+                {"DATE": dates, "ENSEMBLE": ens, "REAL": real, "FOPT": np.arange(366.0)}
+            )
+            for ens in ["iter-0", "iter-1"]
+            for real in [0, 3]
+        ]
+    )
+    calc_df = from_cum.calc_from_cumulatives(
+        data=data_df,
+        column_keys="FOPT",
+        time_index="quarterly",
+        time_index_input="daily",
+        as_rate=False,
+    )
+    assert list(calc_df.columns) == ["DATE", "ENSEMBLE", "REAL", "INTVL_FOPT"]
+    assert list(calc_df["REAL"]) == [0] * 4 + [3] * 4 + [0] * 4 + [3] * 4
+    assert list(calc_df["DATE"].dt.strftime("%m-%d")[:4]) == [
+        "01-01",
+        "04-01",
+        "07-01",
+        "10-01",
+    ]
+    assert list(calc_df["INTVL_FOPT"][:4]) == [91, 91, 92, 0]
+
+    # Weeks start on Mondays, 2000-01-01 was a Saturday
+    calc_df = from_cum.calc_from_cumulatives(
+        data=data_df,
+        column_keys=["FOPT"],
+        time_index="weekly",
+        time_index_input="daily",
+        as_rate=True,
+    )
+    assert str(calc_df["DATE"][0].date()) == "1999-12-27"
+    assert list(calc_df["AVG_FOPR"][:3]) == [2 / 7, 1, 1]
@@ -0,0 +1,42 @@
+from typing import Any
+from pathlib import Path
+
+import numpy as np
+import pytest
+import xtgeo
+
+import webviz_subsurface._datainput.grid as grid_input
+
+
+def test_load_grid_parameter_values(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    grid = xtgeo.create_box_grid((4, 3, 2))
+    actnum = grid.get_actnum()
+    actnum.values[0, 0, 0] = 0
+    grid.set_actnum(actnum)
+    prop = xtgeo.GridProperty(
+        grid, values=np.arange(24, dtype=np.float64).reshape(4, 3, 2), name="PORO"
+    )
+    grid.to_file(str(tmp_path / "grid.roff"), fformat="roff")
+    prop.to_file(str(tmp_path / "poro.roff"), fformat="roff", name="PORO")
+
+    # The grid must be given when reading properties in formats without
+    # dimensions, e.g. GRDECL and INIT
+    grids = []
+    from_file = xtgeo.gridproperty_from_file
+
+    def gridproperty_from_file(*args: Any, **kwargs: Any) -> xtgeo.GridProperty:
+        grids.append(kwargs.get("grid"))
+        return from_file(*args, **kwargs)
+
+    monkeypatch.setattr(
+        grid_input.xtgeo, "gridproperty_from_file", gridproperty_from_file
+    )
+    values = grid_input.load_grid_parameter_values(
+        str(tmp_path / "grid.roff"), str(tmp_path / "poro.roff")
+    )
+    assert isinstance(grids[0], xtgeo.Grid)
+    assert values.shape == (4, 3, 2)
+    assert np.isnan(values[0, 0, 0])
+    np.testing.assert_array_equal(values.ravel()[1:], np.arange(1.0, 24.0))
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from webviz_subsurface.plugins._reservoir_simulation_timeseries import (
+    calculate_delta,
+    get_delta_rows,
+)
+
+
+def test_calculate_delta() -> None:
+    smry = pd.DataFrame(
+        {
+            "ENSEMBLE": ["iter-0"] * 4 + ["iter-1"] * 3,
+            "REAL": [0, 0, 1, 1, 1, 0, 0],
+            "DATE": pd.to_datetime(["2000", "2001"] * 2 + ["2001", "2001", "2000"]),
+            "FOPT": [1.0, 2.0, 3.0, 4.0, 10.0, np.nan, 20.0],
+        }
+    )
+    rows = get_delta_rows(smry, "iter-1", "iter-0")
+    delta = calculate_delta(smry, "iter-1", "iter-0", vectors=["FOPT"], rows=rows)
+
+    # Only (DATE, REAL) in both ensembles with defined values, sorted by DATE
+    # and REAL
+    assert list(delta["REAL"]) == [0, 1]
+    assert list(delta["DATE"].dt.year) == [2000, 2001]
+    assert list(delta["FOPT"]) == [19.0, 6.0]
+    assert set(delta["ENSEMBLE"]) == {"(iter-1) - (iter-0)"}
+    pd.testing.assert_frame_equal(calculate_delta(smry, "iter-1", "iter-0"), delta)
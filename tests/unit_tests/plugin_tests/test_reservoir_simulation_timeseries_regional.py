@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from webviz_subsurface.plugins._reservoir_simulation_timeseries_regional import (
+    RegionVectorBlocks,
+)
+
+
+def test_region_vector_blocks_aggregate() -> None:
+    rng = np.random.default_rng(seed=0)
+    nrows = 40
+    smry = pd.DataFrame(
+        {
+            # Interleaved ensembles, so the rows of each ensemble are not contiguous
+            "ENSEMBLE": ["iter-0", "iter-1", "iter-1", "pred"] * (nrows // 4),
+            "REAL": np.repeat(np.arange(nrows // 4), 4),
+            "DATE": pd.to_datetime(["2000", "2001"] * (nrows // 2)),
+            **{f"ROIP:{region}": rng.random(nrows) * 1e6 for region in range(1, 6)},
+            "ROIP_ZON:1": rng.random(nrows),
+        }
+    )
+    smry.loc[rng.random(nrows) < 0.3, "ROIP:2"] = np.nan
+    smry.loc[::4, "ROIP:4"] = np.nan
+    groups = {"A": ["ROIP:1", "ROIP:2"], "B": ["ROIP:2", "ROIP:4", "ROIP:5"]}
+    region_vectors = RegionVectorBlocks(smry)
+
+    for ensembles in [["iter-0", "pred"], ["iter-1"], ["iter-0", "iter-1", "pred"]]:
+        aggregated = region_vectors.aggregate(ensembles, "ROIP", "FIPNUM", groups)
+
+        # As the previous sum of DataFrame columns per group
+        ens_df = smry.loc[smry["ENSEMBLE"].isin(ensembles)]
+        pd.testing.assert_frame_equal(
+            aggregated[["ENSEMBLE", "REAL", "DATE"]],
+            ens_df[["ENSEMBLE", "REAL", "DATE"]],
+        )
+        for group, vectors in groups.items():
+            assert np.allclose(
+                aggregated[f"AGG_ROIP_filtered_on_{group}"],
+                ens_df[vectors].sum(axis=1),
+                rtol=1e-6,
+            )
+
+    with pytest.raises(KeyError):
+        region_vectors.aggregate(["iter-0"], "ROIP", "FIPNUM", {"A": ["ROIP:6"]})
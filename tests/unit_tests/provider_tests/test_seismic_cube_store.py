@@ -0,0 +1,91 @@
+from typing import Optional
+from pathlib import Path
+
+import numpy as np
+import pytest
+import xtgeo
+
+from webviz_subsurface._providers import SeismicCubeStore
+from webviz_subsurface._providers.bricked_array import BrickedArray
+
+
+def _write_synthetic_cube(file_path: Path) -> xtgeo.Cube:
+    rng = np.random.default_rng(seed=0)
+    cube = xtgeo.Cube(
+        ncol=12,
+        nrow=8,
+        nlay=20,
+        xinc=12.5,
+        yinc=12.5,
+        zinc=4.0,
+        xori=1000.0,
+        yori=2000.0,
+        zori=1500.0,
+        rotation=30.0,
+        ilines=np.arange(100, 112),
+        xlines=np.arange(200, 216, 2),
+        values=rng.normal(size=(12, 8, 20)).astype(np.float32),
+    )
+    cube.to_file(file_path)
+    return xtgeo.cube_from_file(file_path)
+
+
+@pytest.mark.parametrize("brick_size", [None, 4])
+def test_open_converted_cube(tmp_path: Path, brick_size: Optional[int]) -> None:
+    expected = _write_synthetic_cube(tmp_path / "seismic.segy")
+
+    SeismicCubeStore(tmp_path / "storage", True, brick_size).open_cube(
+        tmp_path / "seismic.segy"
+    )
+    # A fresh instance must open the converted cube without parsing the SEG-Y
+    cube = SeismicCubeStore(tmp_path / "storage", False, brick_size).open_cube(
+        tmp_path / "seismic.segy"
+    )
+    assert isinstance(cube.values, BrickedArray if brick_size else np.memmap)
+    assert np.array_equal(cube.ilines, expected.ilines)
+    assert np.array_equal(cube.xlines, expected.xlines)
+    assert np.array_equal(cube.zslices, expected.zslices)
+    assert np.isclose(cube.value_max, expected.values.max())
+
+    assert np.array_equal(cube.get_iline(103), expected.values[3, :, :].T)
+    assert np.array_equal(cube.get_xline(204), expected.values[:, 2, :].T)
+    assert np.array_equal(cube.get_zslice(1520), expected.values[:, :, 5].T)
+
+    fence = np.array([[1020.0, 2030.0, 0, 0], [1080.0, 2060.0, 0, 67.1]])
+    assert np.allclose(
+        cube.to_xtgeo().get_randomline(fence)[4],
+        expected.get_randomline(fence)[4],
+        equal_nan=True,
+    )
+
+    rng = np.random.default_rng(seed=1)
+    for surface in [
+        xtgeo.RegularSurface(
+            ncol=30, nrow=25, xori=950.0, yori=1980.0, xinc=5.0, yinc=5.0, rotation=10.0
+        ),
+        xtgeo.surface_from_cube(expected, 0.0),
+    ]:
+        surface.values = rng.uniform(1490.0, 1590.0, surface.dimensions)
+        surface.values[3:6, 3:6] = np.ma.masked
+        sliced = surface.copy()
+        sliced.slice_cube(expected)
+        assert np.ma.allequal(cube.slice_surface(surface).values, sliced.values)
+        assert np.array_equal(
+            cube.slice_surface(surface).values.mask, sliced.values.mask
+        )
+
+
+def test_bricked_array_indexing(tmp_path: Path) -> None:
+    rng = np.random.default_rng(seed=0)
+    shape = (13, 9, 21)
+    values = rng.random(shape).astype(np.float32)
+    offsets = BrickedArray.write(tmp_path / "bricks.bin", values, 4)
+    bricked = BrickedArray(tmp_path / "bricks.bin", offsets, shape, 4, 3)
+
+    assert np.array_equal(np.asarray(bricked), values)
+    assert np.array_equal(bricked[2:11:3, ::-1, -5], values[2:11:3, ::-1, -5])
+    i = rng.integers(0, 13, 50)
+    j = rng.integers(0, 9, 50)
+    assert np.array_equal(bricked.get_traces(i, j, 3, 18), values[i, j, 3:18])
+    k = rng.integers(0, 21, 50)
+    assert np.array_equal(bricked.get_points(i, j, k), values[i, j, k])
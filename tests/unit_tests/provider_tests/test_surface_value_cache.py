@@ -0,0 +1,65 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import xtgeo
+
+from webviz_subsurface._providers import SurfaceValueCache
+
+
+def _write_synthetic_surface(file_path: Path, offset: float) -> xtgeo.RegularSurface:
+    values = np.arange(20, dtype=np.float64).reshape(4, 5) + offset
+    values = np.ma.masked_where(values == offset, values)
+    surface = xtgeo.RegularSurface(
+        ncol=4, nrow=5, xinc=25.0, yinc=25.0, xori=1000.0, yori=2000.0, values=values
+    )
+    surface.to_file(file_path)
+    return surface
+
+
+def test_load_surface_roundtrip(tmp_path: Path) -> None:
+    surface_dir = tmp_path / "surfaces"
+    surface_dir.mkdir()
+    surface = _write_synthetic_surface(surface_dir / "top--depth.gri", 1700.0)
+
+    for compress in [False, True]:
+        storage_dir = tmp_path / f"storage_{compress}"
+        cache = SurfaceValueCache(storage_dir, True, compress=compress)
+        parsed = cache.load_surface(surface_dir / "top--depth.gri")
+
+        # A fresh instance must be able to read back what the first one stored
+        cached = SurfaceValueCache(storage_dir, False).load_surface(
+            surface_dir / "top--depth.gri"
+        )
+        for surf in [parsed, cached]:
+            assert (surf.ncol, surf.nrow) == (surface.ncol, surface.nrow)
+            assert (surf.xori, surf.yori) == (surface.xori, surface.yori)
+            assert np.array_equal(surf.values.mask, surface.values.mask)
+            assert np.allclose(surf.values.compressed(), surface.values.compressed())
+
+
+def test_geometry_is_stored_once(tmp_path: Path) -> None:
+    storage_dir = tmp_path / "storage"
+    cache = SurfaceValueCache(storage_dir, True)
+    for real in range(3):
+        _write_synthetic_surface(tmp_path / f"real{real}.gri", 1700.0 + real)
+        cache.load_surface(tmp_path / f"real{real}.gri")
+
+    storage_files = list(Path(storage_dir / SurfaceValueCache.__module__).iterdir())
+    assert len([fn for fn in storage_files if fn.name.startswith("geometry__")]) == 1
+    assert len([fn for fn in storage_files if fn.name.startswith("values__")]) == 3
+
+
+def test_modified_file_is_reloaded(tmp_path: Path) -> None:
+    storage_dir = tmp_path / "storage"
+    surface_fn = tmp_path / "top.gri"
+    cache = SurfaceValueCache(storage_dir, True)
+
+    _write_synthetic_surface(surface_fn, 1700.0)
+    assert cache.load_surface(surface_fn).values.max() == 1719.0
+
+    _write_synthetic_surface(surface_fn, 1800.0)
+    # Make sure the modification time differs even on coarse-grained filesystems
+    stat = surface_fn.stat()
+    os.utime(surface_fn, ns=(stat.st_atime_ns, stat.st_mtime_ns + int(1e9)))
+    assert cache.load_surface(surface_fn).values.max() == 1819.0
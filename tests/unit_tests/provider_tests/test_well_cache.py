@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xtgeo
+
+from webviz_subsurface._providers import WellCache
+
+
+def _make_synthetic_well() -> xtgeo.Well:
+    npoints = 10
+    dframe = pd.DataFrame(
+        {
+            "X_UTME": np.linspace(1000.0, 1100.0, npoints),
+            "Y_UTMN": np.linspace(2000.0, 2050.0, npoints),
+            "Z_TVDSS": np.linspace(1500.0, 1800.0, npoints),
+            "Zonelog": np.array([1, 1, 1, 2, 2, 2, 3, 3, np.nan, 3]),
+        }
+    )
+    return xtgeo.Well(
+        rkb=25.0,
+        xpos=1000.0,
+        ypos=2000.0,
+        wname="OP_1",
+        df=dframe,
+        zonelogname="Zonelog",
+        wlogtypes={"Zonelog": "DISC"},
+        wlogrecords={"Zonelog": {1: "Upper", 2: "Middle", 3: "Lower"}},
+    )
+
+
+def test_store_and_load_well(tmp_path: Path) -> None:
+    well_fn = tmp_path / "OP_1.w"
+    well = _make_synthetic_well()
+    well.to_file(well_fn)
+    options = {"zonelog": "Zonelog", "tvdmin": None}
+
+    cache = WellCache(tmp_path / "storage", True)
+    assert cache.load_well(well_fn, options) is None
+    cache.store_well(well_fn, options, well)
+
+    cached = WellCache(tmp_path / "storage", False).load_well(well_fn, options)
+    assert cached is not None
+    assert cached.name == "OP_1"
+    assert cached.zonelogname == "Zonelog"
+    assert cached.get_logrecord("Zonelog") == {1: "Upper", 2: "Middle", 3: "Lower"}
+    pd.testing.assert_frame_equal(cached.dataframe, well.dataframe)
+
+    # Other processing options must not hit the stored entry
+    assert cache.load_well(well_fn, {**options, "tvdmin": 1600.0}) is None
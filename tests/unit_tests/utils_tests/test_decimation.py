@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from webviz_subsurface._utils.decimation import (
+    crop_lines,
+    crop_section,
+    decimate_lines,
+    decimate_section,
+)
+
+
+@pytest.mark.parametrize("method", ["stride", "maxabs", "rms"])
+def test_decimate_section_shape(method: str) -> None:
+    values = np.random.default_rng(seed=0).normal(size=(1500, 2000))
+    xaxis = np.arange(2000) + 100
+    yaxis = np.arange(1500) * 4.0
+    reduced, xreduced, yreduced = decimate_section(
+        values, xaxis, yaxis, max_shape=(400, 600), method=method
+    )
+    assert reduced.shape[0] <= 400 and reduced.shape[1] <= 600
+    assert reduced.shape == (len(yreduced), len(xreduced))
+    assert xreduced[0] == 100 and yreduced[0] == 0.0
+    assert not np.isnan(reduced).any()
+
+
+def test_decimate_section_maxabs_keeps_extremes() -> None:
+    values = np.zeros((10, 10))
+    values[3, 7] = -5.0
+    values[8, 1] = 2.0
+    reduced, _, _ = decimate_section(
+        values, np.arange(10), np.arange(10), max_shape=(2, 2), method="maxabs"
+    )
+    assert np.array_equal(reduced, [[0.0, -5.0], [2.0, 0.0]])
+
+
+def test_small_section_is_not_decimated() -> None:
+    values = np.ones((20, 30))
+    reduced, _, _ = decimate_section(values, np.arange(30), np.arange(20), (400, 600))
+    assert reduced is values
+
+
+def test_crop_section() -> None:
+    values = np.arange(100).reshape(10, 10)
+    cropped, xaxis, yaxis = crop_section(
+        values, np.arange(10) * 10, np.arange(10), xrange=[35, 55], yrange=[6.5, 2]
+    )
+    # One sample outside the range is kept on each side
+    assert np.array_equal(xaxis, [30, 40, 50, 60])
+    assert np.array_equal(yaxis, [1, 2, 3, 4, 5, 6, 7])
+    assert np.array_equal(cropped, values[1:8, 3:7])
+
+
+def test_decimate_lines_keeps_extremes() -> None:
+    values = np.random.default_rng(seed=0).random(3000)
+    values[[10, 1500, 2999]] = [5.0, -5.0, 7.0]
+    groups = np.repeat([0, 1, 2], [1000, 1990, 10])
+    keep = decimate_lines(groups, values, max_points=100)
+
+    counts = np.bincount(groups[keep])
+    assert counts.max() <= 102
+    # Short lines are kept as is
+    assert counts[2] == 10
+    assert np.array_equal(values[keep][[0, -1]], values[[0, -1]])
+    assert {5.0, -5.0, 7.0} <= set(values[keep])
+
+
+def test_crop_lines() -> None:
+    groups = np.repeat([0, 1], 10)
+    xvalues = np.tile(np.arange(10), 2)
+    keep = crop_lines(groups, xvalues, [3.5, 5])
+    assert np.array_equal(keep, [3, 4, 5, 6, 13, 14, 15, 16])
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+import xtgeo
+
+from webviz_subsurface._providers.seismic_cube_store import SeismicCube
+from webviz_subsurface._utils.fence_sampling import SurfaceFenceSampler
+
+
+@pytest.mark.parametrize("rotation", [0, 30, 110])
+@pytest.mark.parametrize("yflip", [1, -1])
+@pytest.mark.parametrize("sampling", ["bilinear", "nearest"])
+def test_sampler_matches_xtgeo_randomline(
+    rotation: float, yflip: int, sampling: str
+) -> None:
+    rng = np.random.default_rng(seed=0)
+    surfaces = []
+    for _ in range(3):
+        values = rng.normal(size=(20, 30))
+        surfaces.append(
+            xtgeo.RegularSurface(
+                ncol=20,
+                nrow=30,
+                xinc=10,
+                yinc=15,
+                xori=500,
+                yori=800,
+                rotation=rotation,
+                yflip=yflip,
+                values=np.ma.masked_where(rng.random((20, 30)) < 0.05, values),
+            )
+        )
+
+    npoints = 400
+    fence_spec = np.column_stack(
+        [
+            rng.uniform(200, 900, npoints),
+            rng.uniform(400, 1400, npoints),
+            np.zeros(npoints),
+            np.arange(npoints, dtype=np.float64),
+        ]
+    )
+    sampler = SurfaceFenceSampler(surfaces[0], fence_spec, sampling)
+    batch = sampler.sample(np.ma.stack([surf.values for surf in surfaces]))
+    assert batch.shape == (3, npoints)
+
+    for surf, fence_values in zip(surfaces, batch):
+        expected = surf.get_randomline(fence_spec, sampling=sampling)[:, 1]
+        assert np.allclose(fence_values, expected, equal_nan=True)
+        assert np.allclose(sampler.get_randomline(surf)[:, 1], expected, equal_nan=True)
+
+
+@pytest.mark.parametrize("rotation", [0, 30])
+@pytest.mark.parametrize("sampling", ["nearest", "trilinear"])
+@pytest.mark.parametrize("zrange", [(None, None, None), (1490.0, 1560.0, 1.3)])
+def test_cube_sampler_matches_xtgeo_randomline(
+    rotation: float, sampling: str, zrange: tuple
+) -> None:
+    rng = np.random.default_rng(seed=0)
+    cube = xtgeo.Cube(
+        ncol=15,
+        nrow=10,
+        nlay=20,
+        xinc=10,
+        yinc=15,
+        zinc=4,
+        xori=500,
+        yori=800,
+        zori=1500,
+        rotation=rotation,
+        values=rng.normal(size=(15, 10, 20)).astype(np.float32),
+    )
+    npoints = 200
+    fence_spec = np.column_stack(
+        [
+            rng.uniform(400, 700, npoints),
+            rng.uniform(700, 1000, npoints),
+            np.zeros(npoints),
+            np.arange(npoints, dtype=np.float64),
+        ]
+    )
+    zmin, zmax, zincrement = zrange
+    expected = cube.get_randomline(
+        fence_spec, zmin=zmin, zmax=zmax, zincrement=zincrement, sampling=sampling
+    )
+    result = SeismicCube.from_xtgeo(cube).get_randomline(
+        fence_spec, zmin=zmin, zmax=zmax, zincrement=zincrement, sampling=sampling
+    )
+    assert np.allclose(result[:4], expected[:4])
+    assert np.allclose(result[4], expected[4], atol=1e-4, equal_nan=True)
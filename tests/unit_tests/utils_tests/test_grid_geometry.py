@@ -0,0 +1,117 @@
+from typing import Tuple
+
+import numpy as np
+import pytest
+import xtgeo
+
+from webviz_subsurface._utils.grid_geometry import GridGeometry, sample_cells
+
+
+def make_grid_and_property(
+    pillar_offset: float = 0.0,
+) -> Tuple[xtgeo.Grid, xtgeo.GridProperty]:
+    grid = xtgeo.create_box_grid(
+        (20, 15, 10),
+        origin=(1000, 2000, 1500),
+        increment=(50, 40, 5),
+        rotation=25,
+    )
+    if pillar_offset:
+        # Slant the pillars by moving their base, by varying amounts along
+        # the grid columns
+        # pylint: disable=protected-access
+        coords = grid._coordsv.copy()
+        coords[:, :, 3] += (
+            pillar_offset * np.linspace(0.5, 1.5, coords.shape[0])[:, np.newaxis]
+        )
+        coords[:, :, 4] += pillar_offset / 3
+        grid._coordsv = coords
+    actnum = grid.get_actnum()
+    actnum.values[5:8, 5:9, 3:6] = 0
+    grid.set_actnum(actnum)
+    rng = np.random.default_rng(seed=0)
+    prop = xtgeo.GridProperty(grid, values=rng.random((20, 15, 10)), name="poro")
+    prop.values = np.ma.masked_where(actnum.values == 0, prop.values)
+    return grid, prop
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+def test_randomline_matches_xtgeo() -> None:
+    grid, prop = make_grid_and_property()
+    fence = xtgeo.Polygons(
+        [[900, 1900, 0], [1800, 2700, 0], [1200, 2900, 0]]
+    ).get_fence(distance=10, nextend=3, asnumpy=True)
+
+    # Depths are sampled between layer boundaries, where ties may be broken
+    # differently
+    expected = grid.get_randomline(fence, prop, zmin=1490.25, zmax=1560, zincrement=0.5)
+    result = GridGeometry(grid).get_randomline(
+        fence, prop.values, zmin=1490.25, zmax=1560, zincrement=0.5
+    )
+    assert result[:4] == pytest.approx(expected[:4])
+    assert result[4].shape == expected[4].shape
+
+    # xtgeo may miss points close to the grid boundary, otherwise the sections
+    # should be identical
+    defined = np.isfinite(expected[4])
+    assert defined.any()
+    np.testing.assert_array_equal(result[4][defined], expected[4][defined])
+    assert np.isfinite(result[4]).sum() - defined.sum() < 0.01 * defined.size
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+@pytest.mark.parametrize("pillar_offset", [5.0, 20.0, 100.0])
+def test_randomline_matches_xtgeo_slanted_pillars(pillar_offset: float) -> None:
+    grid, prop = make_grid_and_property(pillar_offset)
+    fence = xtgeo.Polygons(
+        [[900, 1900, 0], [1800, 2700, 0], [1200, 2900, 0]]
+    ).get_fence(distance=10, nextend=3, asnumpy=True)
+
+    expected = grid.get_randomline(fence, prop, zmin=1490.25, zmax=1560, zincrement=0.5)
+    result = GridGeometry(grid).get_randomline(
+        fence, prop.values, zmin=1490.25, zmax=1560, zincrement=0.5
+    )
+    assert result[4].shape == expected[4].shape
+
+    # Cells are found on the pillars at the depth of each sample. Differences
+    # from xtgeo are limited to samples within centimeters of the column
+    # faces, where the cell shapes are approximated differently.
+    defined = np.isfinite(expected[4])
+    assert defined.any()
+    assert (result[4][defined] != expected[4][defined]).sum() < 0.006 * defined.sum()
+    assert np.isfinite(result[4]).sum() - defined.sum() < 0.03 * defined.size
+
+
+@pytest.mark.parametrize("pillar_offset", [0.0, 100.0])
+def test_locate_cells(pillar_offset: float) -> None:
+    grid, _ = make_grid_and_property(pillar_offset)
+    geometry = GridGeometry(grid)
+    centers = grid.get_xyz(asmasked=False)
+    x, y, z = [np.ravel(prop.values) for prop in centers]
+
+    np.testing.assert_array_equal(geometry.locate_cells(x, y, z), np.arange(len(x)))
+    # Above, below and beside the grid
+    assert list(geometry.locate_cells(x[:1], y[:1], np.array([1400.0]))) == [-1]
+    assert list(geometry.locate_cells(x[:1], y[:1], np.array([1600.0]))) == [-1]
+    assert list(
+        geometry.locate_cells(np.array([0.0]), np.array([0.0]), np.array([1520.0]))
+    ) == [-1]
+
+
+@pytest.mark.parametrize("pillar_offset", [0.0, 20.0])
+def test_surface_slice_matches_xtgeo(pillar_offset: float) -> None:
+    grid, prop = make_grid_and_property(pillar_offset)
+    surface = xtgeo.RegularSurface(
+        ncol=80, nrow=70, xori=700, yori=1900, xinc=20, yinc=20, values=1512.3
+    )
+    surface.values = surface.values + np.linspace(0, 30, 70)[np.newaxis, :]
+    xcoords, ycoords = surface.get_xy_values(asmasked=False)
+    cells = GridGeometry(grid).locate_cells(
+        xcoords, ycoords, np.ma.filled(surface.values, np.nan).ravel()
+    )
+    result = sample_cells(prop.values, cells).reshape(surface.values.shape)
+
+    surface.slice_grid3d(grid, prop)
+    expected = np.ma.filled(surface.values, np.nan)
+    assert np.isfinite(expected).any()
+    np.testing.assert_array_equal(result, expected)
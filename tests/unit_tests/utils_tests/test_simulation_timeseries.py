@@ -1,3 +1,5 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 import webviz_subsurface._utils.simulation_timeseries as simulation_timeseries
@@ -49,3 +51,103 @@ def test_date_to_interval_conversion(
             )
             == res
         )
+
+
+def test_calc_series_statistics() -> None:
+    rng = np.random.default_rng(seed=0)
+    dates = pd.date_range("2000-01-01", periods=4, freq="MS")
+    df = pd.DataFrame(
+        {
+            "ENSEMBLE": np.repeat(["iter-1", "iter-0"], 20),
+            "REAL": np.tile(np.repeat(np.arange(5), 4), 2),
+            "DATE": np.tile(dates, 10),
+            "FOPT": rng.random(40),
+            "FGPT": rng.random(40),
+        }
+    )
+    df.loc[df["REAL"] == 0, "FGPT"] = np.nan
+    df.loc[df["DATE"] == dates[0], "FOPT"] = np.nan
+
+    stat_df = simulation_timeseries.calc_series_statistics(df, ["FOPT", "FGPT"])
+
+    assert list(stat_df[("", "ENSEMBLE")]) == ["iter-0"] * 4 + ["iter-1"] * 4
+    assert list(stat_df[("", "DATE")]) == list(dates) * 2
+    assert list(stat_df["FOPT"].columns) == [
+        "mean",
+        "min",
+        "max",
+        "high_p10",
+        "low_p90",
+        "p50",
+    ]
+    for (ensemble, date), group in df.groupby(["ENSEMBLE", "DATE"]):
+        row = stat_df[
+            (stat_df[("", "ENSEMBLE")] == ensemble) & (stat_df[("", "DATE")] == date)
+        ].iloc[0]
+        for vector in ["FOPT", "FGPT"]:
+            values = group[vector].dropna()
+            if values.empty:
+                assert row[(vector, "mean")] != row[(vector, "mean")]
+                continue
+            assert row[(vector, "mean")] == pytest.approx(values.mean())
+            assert row[(vector, "min")] == values.min()
+            assert row[(vector, "max")] == values.max()
+            # p10 and p90 are inverted due to oil industry convention
+            assert row[(vector, "high_p10")] == pytest.approx(values.quantile(0.9))
+            assert row[(vector, "low_p90")] == pytest.approx(values.quantile(0.1))
+            assert row[(vector, "p50")] == pytest.approx(values.median())
+
+
+def test_create_realizations_trace() -> None:
+    df = pd.DataFrame(
+        {
+            "REAL": [1, 0, 1, 0, 2],
+            "DATE": pd.to_datetime(
+                ["2000-01-01", "2000-01-01", "2001-01-01", "2001-01-01", "2000-01-01"]
+            ),
+            "FOPT": [10.0, 0.0, 11.0, 1.0, 20.0],
+        }
+    )
+    trace = simulation_timeseries.create_realizations_trace(
+        df, "FOPT", name="iter-0", color="red", line_shape="linear"
+    )
+    assert trace["type"] == "scatter"
+    assert list(trace["y"]) == [0.0, 1.0, None, 10.0, 11.0, None, 20.0]
+    assert list(trace["customdata"]) == [0, 0, None, 1, 1, None, 2]
+    first, second = pd.to_datetime(["2000-01-01", "2001-01-01"])
+    assert list(trace["x"]) == [first, second, None, first, second, None, first]
+
+    many = pd.DataFrame(
+        {
+            "REAL": np.repeat(np.arange(100), 101),
+            "DATE": np.tile(np.arange(101), 100),
+            "FOPT": np.zeros(10100),
+        }
+    )
+    assert (
+        simulation_timeseries.create_realizations_trace(
+            many, "FOPT", name="iter-0", color="red", line_shape="vh"
+        )["type"]
+        == "scattergl"
+    )
+
+
+def test_create_vector_selector_data() -> None:
+    data = simulation_timeseries.create_vector_selector_data(
+        [
+            ("FOPT", "Field oil production total"),
+            ("WOPR:OP_2", "Well oil production rate"),
+            ("WOPR:OP_1", "Other description"),
+            ("WOPR:OP_2", "Duplicate"),
+            ("WWCTL:__1:OP_1", "Completion water cut"),
+        ]
+    )
+    assert data == [
+        {"name": "FOPT", "description": "Field oil production total", "children": []},
+        {
+            "name": "WOPR",
+            "description": "Well oil production rate",
+            "children": [{"name": "OP_2"}, {"name": "OP_1"}],
+        },
+        {"name": "WWCTL", "description": "Completion water cut", "children": []},
+    ]
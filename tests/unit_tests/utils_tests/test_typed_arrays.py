@@ -0,0 +1,62 @@
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from webviz_subsurface._utils import typed_arrays
+from webviz_subsurface._utils.typed_arrays import (
+    decode_array,
+    encode_array,
+    encode_figure,
+)
+
+
+@pytest.fixture(autouse=True)
+def typed_arrays_supported(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The encoding is tested regardless of the installed Dash and Plotly.js
+    monkeypatch.setattr(typed_arrays, "TYPED_ARRAYS_SUPPORTED", True)
+
+
+def test_encode_array_roundtrip() -> None:
+    values = np.random.default_rng(seed=0).random(500)
+    encoded = encode_array(values)
+    assert encoded["dtype"] == "f8"
+    assert np.array_equal(decode_array(encoded), values)
+
+    # Lossless float32 and None as line breaks
+    values = np.full(500, None, dtype=object)
+    values[::2] = np.arange(250) * 0.5
+    encoded = encode_array(values)
+    assert encoded["dtype"] == "f4"
+    decoded = decode_array(encoded)
+    assert np.isnan(decoded[1::2]).all()
+    assert np.array_equal(decoded[::2], np.arange(250) * 0.5)
+
+
+def test_encode_array_keeps_short_and_non_numeric_arrays() -> None:
+    assert encode_array([1.0, None, 2.0]) == [1.0, None, 2.0]
+    categories = np.array(["1", "2"] * 100, dtype=object)
+    assert encode_array(categories) is categories
+
+
+def test_encode_figure_dates() -> None:
+    dates = pd.date_range("2000-01-01", periods=200).to_pydatetime()
+    figure: Dict[str, Any] = {
+        "data": [{"x": dates, "y": np.arange(200), "xaxis": "x3"}],
+        "layout": {"xaxis3": {"anchor": "y3"}},
+    }
+    encoded = encode_figure(figure)
+    assert encoded["layout"]["xaxis3"] == {"type": "date", "anchor": "y3"}
+    assert encoded["data"][0]["y"]["dtype"] == "i4"
+    assert decode_array(encoded["data"][0]["x"])[0] == 946684800000.0
+    # The input figure is not modified
+    assert figure["layout"]["xaxis3"] == {"anchor": "y3"}
+
+
+def test_encode_unsupported_by_plotlyjs(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(typed_arrays, "TYPED_ARRAYS_SUPPORTED", False)
+    values = np.arange(500)
+    assert encode_array(values) is values
+    figure: Dict[str, Any] = {"data": [{"x": values}]}
+    assert encode_figure(figure) is figure
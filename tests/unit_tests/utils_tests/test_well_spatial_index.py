@@ -0,0 +1,57 @@
+import numpy as np
+
+from webviz_subsurface._utils.well_spatial_index import (
+    WellSpatialIndex,
+    resample_polyline,
+)
+
+
+def _make_index() -> WellSpatialIndex:
+    return WellSpatialIndex(
+        {
+            # Vertical well at a single map position
+            "VERTICAL": np.array([[500.0, 500.0], [500.0, 500.0]]),
+            # Deviated well going east with few, long segments
+            "EAST": np.array([[0.0, 1000.0], [1000.0, 1000.0], [2000.0, 1100.0]]),
+            # Well going north, with an undefined sample
+            "NORTH": np.array([[1500.0, 0.0], [np.nan, np.nan], [1500.0, 2000.0]]),
+        },
+        spacing=10.0,
+    )
+
+
+def test_resample_polyline() -> None:
+    resampled = resample_polyline(np.array([[0.0, 0.0], [0.0, 95.0]]), spacing=10.0)
+    assert np.allclose(resampled[[0, -1]], [[0.0, 0.0], [0.0, 95.0]])
+    assert np.diff(resampled[:, 1]).max() <= 10.0
+
+
+def test_nearest_well() -> None:
+    index = _make_index()
+    assert index.nearest_well(510.0, 490.0) == "VERTICAL"
+    assert index.nearest_well(500.0, 1040.0) == "EAST"
+    assert index.nearest_well(1480.0, 500.0) == "NORTH"
+    assert index.nearest_well(200.0, 200.0, max_distance=100.0) is None
+
+
+def test_wells_within_radius() -> None:
+    index = _make_index()
+    assert index.wells_within_radius(1450.0, 1000.0, radius=100.0) == [
+        "EAST",
+        "NORTH",
+    ]
+    assert index.wells_within_radius(1510.0, 1000.0, radius=100.0) == [
+        "NORTH",
+        "EAST",
+    ]
+    assert not index.wells_within_radius(200.0, 200.0, radius=100.0)
+
+
+def test_wells_crossing_polyline() -> None:
+    index = _make_index()
+    assert index.wells_crossing_polyline(
+        np.array([[1000.0, 500.0], [1000.0, 1500.0], [2000.0, 1500.0]])
+    ) == ["EAST", "NORTH"]
+    assert index.wells_crossing_polyline(
+        np.array([[2000.0, 800.0], [1000.0, 800.0], [300.0, 300.0]]), tolerance=50.0
+    ) == ["NORTH", "VERTICAL"]
@@ -0,0 +1,38 @@
+import numpy as np
+
+from webviz_subsurface._utils.zonelog import (
+    get_zone_segments,
+    get_zone_top_indices,
+    get_zone_transitions,
+)
+
+ZONEVALS = np.array([np.nan, np.nan, 1, 1, 2, 2, 2, 1, np.nan, 3, 3])
+
+
+def test_zone_transitions() -> None:
+    assert list(get_zone_transitions(ZONEVALS)) == [1, 3, 6, 7, 8]
+
+
+def test_zone_top_indices() -> None:
+    # Downwards from 1 to 2 at index 4, upwards from 2 to 1 at index 6
+    assert list(get_zone_top_indices(ZONEVALS)) == [4, 6]
+    assert len(get_zone_top_indices(np.array([]))) == 0
+
+
+def test_zone_segments() -> None:
+    hvals = np.arange(len(ZONEVALS), dtype=float)
+    segments = get_zone_segments(ZONEVALS, hvals, hvals * 10)
+
+    np.testing.assert_array_equal(
+        [zone for zone, _, _ in segments], [np.nan, 1, 2, 1, np.nan, 3]
+    )
+    # Each segment ends at the first sample of the next segment
+    assert [list(hseg) for _, hseg, _ in segments] == [
+        [0, 1, 2],
+        [2, 3, 4],
+        [4, 5, 6, 7],
+        [7, 8],
+        [8, 9],
+        [9, 10],
+    ]
+    np.testing.assert_array_equal(segments[2][2], [40, 50, 60, 70])
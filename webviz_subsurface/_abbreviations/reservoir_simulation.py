@@ -1,4 +1,5 @@
 from typing import Tuple, Optional, cast
+from functools import lru_cache
 import json
 import pathlib
 import warnings
@@ -37,9 +38,11 @@ def simulation_vector_base(vector: str) -> str:
     return vector.split(":", 1)[0].split("_", 1)[0][:5] if ":" in vector else vector
 
 
+@lru_cache(maxsize=None)
 def simulation_vector_description(vector: str) -> str:
     """Returns a more human friendly description of the simulation vector if possible,
-    otherwise returns the input as is.
+    otherwise returns the input as is. Descriptions are cached, as they are looked up
+    for every vector when building vector selectors.
     """
     if vector.startswith("AVG_"):
         prefix = "Average "
@@ -15,6 +15,40 @@ window.dash_clientside = Object.assign({}, window.dash_clientside, {
           in pixels
      */
       return document.documentElement.clientHeight
+    },
+    get_element_sizes: function (...args) {
+      /*
+          Can be used in a dash callback to get the [width, height] in pixels
+          of elements. The element ids and the previously stored sizes must be
+          given as the two last arguments, any other arguments are triggers.
+     */
+      const ids = args[args.length - 2];
+      const previous = args[args.length - 1];
+      const sizes = Object.fromEntries(
+        ids.map((id) => {
+          const element = document.getElementById(id);
+          return [
+            id,
+            element ? [element.clientWidth, element.clientHeight] : null,
+          ];
+        })
+      );
+      if (JSON.stringify(sizes) === JSON.stringify(previous)) {
+        return window.dash_clientside.no_update;
+      }
+      return sizes;
+    },
+    get_click_when_not_drawing: function (click_position, map_id) {
+      /*
+          Can be used in a dash callback to pass on the click position of a
+          LeafletMap, unless a draw tool of the map is active, i.e. the click
+          adds a point to a drawing
+     */
+      const map = document.getElementById(map_id);
+      if (map && map.querySelector(".leaflet-draw-toolbar-button-enabled")) {
+        return window.dash_clientside.no_update;
+      }
+      return click_position;
     }
   },
 });
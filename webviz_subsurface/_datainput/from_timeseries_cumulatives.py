@@ -1,9 +1,23 @@
-from typing import List, Union
+from typing import List, Optional, Tuple, Union
+from functools import lru_cache
 
 import pandas as pd
 import numpy as np
 
-# pylint: disable=dangerous-default-value
+# Supported time indices, in order of increasing interval length
+TIME_INDICES = ["daily", "weekly", "monthly", "quarterly", "yearly"]
+
+# Time index of the prefixes of frequencies inferred by pandas
+_INFERRED_TIME_INDICES = {
+    "D": "daily",
+    "W": "weekly",
+    "MS": "monthly",
+    "QS": "quarterly",
+    "AS": "yearly",
+    "YS": "yearly",
+}
+
+
 def calc_from_cumulatives(
     data: pd.DataFrame,
     column_keys: Union[List[str], str],
@@ -16,10 +30,11 @@ def calc_from_cumulatives(
     that you want to make the calculation for
 
     Assumes that the data is already sampled to a time interval `time_index_input`.
-    `time_index` can currently be `daily`, `monthly` or `yearly`.
+    `time_index` can be `daily`, `weekly`, `monthly`, `quarterly` or `yearly`, with weeks
+    starting on Mondays and calendar quarters.
 
-    Interpolation is not performed, and the time interval `time_index` therefore has to be shorter
-    or equal to `time_index_input` (e.g. `time_index` = `yearly` is compatible with
+    Interpolation is not performed, and the time interval `time_index` therefore has to be
+    longer than or equal to `time_index_input` (e.g. `time_index` = `yearly` is compatible with
     `time_index_input` = `monthly`, but the opposite is invalid).
 
     `column_keys` define vectors to take calculate for of.
@@ -34,122 +49,151 @@ def calc_from_cumulatives(
     opposite to rates in e.g. the Eclipse simulator's summary format, but similar to fmu-ensemble's
     get_volumetric_rates(). E.g. for a monthly interval, the values stored at 2010-01-01 would be
     the average rate and production for January 2010.
+
+    The calculation works on arrays with all vectors at once, where each realization is a
+    consecutive block of rows. The frequency of the input dates is only inferred once for each
+    set of unique dates.
     """
-    data = data.copy()
     if isinstance(column_keys, str):
         column_keys = [column_keys]
 
-    # Converting the DATE axis to datetime to allow for timedeltas
-    data.loc[:, ["DATE"]] = pd.to_datetime(data["DATE"])
-    _verify_time_index(data, time_index, time_index_input)
-    # Creating a column of unique values per ensemble-realization combination. A non-zero
-    # diff of this column will then mean that it is a diff between different realizations.
-    # Could alternatively loop over ensembles and realizations, but this is quicker for
-    # larger datasets.
-    data["ensrealuid"] = (
-        data["ENSEMBLE"].astype("category").cat.codes * data["REAL"].nunique()
-        + data["REAL"]
-    )
-
-    # Allows us to resample on DATE without merging ensembles and realizations.
-    data.set_index(["ENSEMBLE", "REAL", "DATE"], inplace=True)
-
-    # Resample on DATE frequency
-    data = _resample_time_index(
-        df=data, time_index=time_index, time_index_input=time_index_input
+    dates = pd.to_datetime(data["DATE"]).to_numpy(dtype="datetime64[ns]")
+    _verify_time_index(
+        _infer_time_index(tuple(np.sort(pd.unique(dates)).view(np.int64))),
+        time_index,
+        time_index_input,
     )
+    ensembles = data["ENSEMBLE"].to_numpy()
+    reals = data["REAL"].to_numpy()
+    values = data[column_keys].to_numpy(dtype=np.float64)
 
-    data.reset_index(level=["ENSEMBLE", "REAL"], inplace=True)
-
-    calc_cols = {vec: rename_vec_from_cum(vec, as_rate) for vec in column_keys}
-    listed_calc_cols = [calc_cols[col] for col in column_keys]
-
-    # Take diff of given column_keys + the ensemble-realization identifier.
-    # Preserve ENSEMBLE and REAL
-    diff_cum = pd.concat(
-        [
-            data[["ENSEMBLE", "REAL"]],
-            data[["ensrealuid"] + column_keys]
-            .diff()
-            .shift(-1)
-            .rename(
-                mapper=calc_cols,
-                axis=1,
-            ),
-        ],
-        axis=1,
-    )
-    diff_cum[listed_calc_cols] = diff_cum[listed_calc_cols].fillna(value=0)
+    if time_index != time_index_input:
+        dates, ensembles, reals, values = _resample_time_index(
+            dates, ensembles, reals, values, time_index
+        )
+    last_in_real = np.ones(len(dates), dtype=bool)
+    last_in_real[:-1] = (ensembles[1:] != ensembles[:-1]) | (reals[1:] != reals[:-1])
 
-    # Reset index (DATE becomes regular column)
-    diff_cum.reset_index(inplace=True)
+    # Interval values are stored at the start of the interval, i.e. the diff to the next
+    # date. Undefined values give zero, as does the last date of each realization.
+    diff_cum = np.zeros(values.shape)
+    diff_cum[:-1] = values[1:] - values[:-1]
+    diff_cum[np.isnan(diff_cum)] = 0
 
     # Convert interval cumulative to daily average rate if requested
     if as_rate:
-        days = diff_cum["DATE"].diff().shift(-1).dt.days.fillna(value=0)
-        for vec in column_keys:
-            with np.errstate(invalid="ignore"):
-                diff_cum.loc[:, calc_cols[vec]] = (
-                    diff_cum[calc_cols[vec]].values / days.values
-                )
+        days = np.zeros(len(dates))
+        days[:-1] = np.diff(dates) // np.timedelta64(1, "D")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            diff_cum = diff_cum / days[:, np.newaxis]
+    diff_cum[last_in_real] = 0
+
+    return pd.DataFrame(
+        {
+            "DATE": dates,
+            "ENSEMBLE": ensembles,
+            "REAL": reals,
+            **{
+                rename_vec_from_cum(vec, as_rate): diff_cum[:, idx]
+                for idx, vec in enumerate(column_keys)
+            },
+        }
+    )
 
-    # Set last value of each real to 0 (as we don't loop over the realizations)
-    diff_cum.loc[diff_cum["ensrealuid"] != 0, listed_calc_cols] = 0
-    diff_cum.drop("ensrealuid", axis=1, inplace=True)
 
-    return diff_cum
+@lru_cache(maxsize=32)
+def _infer_time_index(unique_dates: Tuple[int, ...]) -> Optional[str]:
+    """Returns the time index of sorted unique dates given as nanoseconds since epoch,
+    or the frequency inferred by pandas if it is not a supported time index"""
+    inferred_frequency = pd.infer_freq(pd.DatetimeIndex(np.array(unique_dates)))
+    if inferred_frequency is None:
+        return None
+    return _INFERRED_TIME_INDICES.get(
+        inferred_frequency.split("-")[0], inferred_frequency
+    )
 
 
 def _verify_time_index(
-    df: pd.DataFrame, time_index: str, time_index_input: str
+    inferred_time_index: Optional[str], time_index: str, time_index_input: str
 ) -> None:
-    freqs = {"D": "daily", "MS": "monthly", "AS-JAN": "yearly"}
-    valid_time_indices = {
-        "daily": ["daily", "monthly", "yearly"],
-        "monthly": ["monthly", "yearly"],
-        "yearly": ["yearly"],
-    }
-    inferred_frequency = pd.infer_freq(sorted(df["DATE"].unique()))
-    if not freqs.get(inferred_frequency) == time_index_input:
+    if not inferred_time_index == time_index_input:
         raise ValueError(
             "The DataFrame most likely contains data points which are not sampled on "
             f"frequency time_index_input={time_index_input}. The inferred frequency from the "
-            f"unique DATE values was {inferred_frequency}."
+            f"unique DATE values was {inferred_time_index}."
         )
-    if not time_index in valid_time_indices[time_index_input]:
+    if time_index not in TIME_INDICES or TIME_INDICES.index(
+        time_index
+    ) < TIME_INDICES.index(time_index_input):
         raise ValueError(
             f"The time_index {time_index} has higher frequency than time_index_input "
             f"{time_index_input}. Valid time_index options are "
-            f"{valid_time_indices[time_index_input]}."
+            f"{TIME_INDICES[TIME_INDICES.index(time_index_input):]}."
         )
 
 
+def _interval_start(dates: np.ndarray, time_index: str) -> np.ndarray:
+    """Returns the first date of the interval of length `time_index` containing each date"""
+    if time_index == "daily":
+        return dates.astype("datetime64[D]").astype("datetime64[ns]")
+    if time_index == "weekly":
+        days = dates.astype("datetime64[D]").astype(np.int64)
+        # 1970-01-01 was a Thursday
+        return (days - (days + 3) % 7).astype("datetime64[D]").astype("datetime64[ns]")
+    if time_index == "monthly":
+        return dates.astype("datetime64[M]").astype("datetime64[ns]")
+    if time_index == "quarterly":
+        months = dates.astype("datetime64[M]").astype(np.int64)
+        return (months - months % 3).astype("datetime64[M]").astype("datetime64[ns]")
+    if time_index == "yearly":
+        return dates.astype("datetime64[Y]").astype("datetime64[ns]")
+    raise ValueError(
+        f"Unknown time_index {time_index}. Valid options are {TIME_INDICES}."
+    )
+
+
 def _resample_time_index(
-    df: pd.DataFrame, time_index: str, time_index_input: str
-) -> pd.DataFrame:
-    if time_index == time_index_input:
-        return df
-    if time_index == "yearly" and time_index_input in ["daily", "monthly"]:
-        return df.groupby(
-            [
-                pd.Grouper(level="ENSEMBLE"),
-                pd.Grouper(level="REAL"),
-                pd.Grouper(level="DATE", freq="YS"),
-            ]
-        ).first()
-    if time_index == "monthly" and time_index_input == "daily":
-        return df.groupby(
+    dates: np.ndarray,
+    ensembles: np.ndarray,
+    reals: np.ndarray,
+    values: np.ndarray,
+    time_index: str,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Resamples to the start of each interval of length `time_index`, with the first defined
+    value in the interval for each realization, sorted by ensemble, realization and date"""
+    ensemble_codes = pd.factorize(ensembles, sort=True)[0]
+    order = np.lexsort((dates, reals, ensemble_codes))
+    dates = _interval_start(dates[order], time_index)
+    ensembles = ensembles[order]
+    reals = reals[order]
+    values = values[order]
+    ensemble_codes = ensemble_codes[order]
+
+    starts = np.flatnonzero(
+        np.concatenate(
             [
-                pd.Grouper(level="ENSEMBLE"),
-                pd.Grouper(level="REAL"),
-                pd.Grouper(level="DATE", freq="MS"),
+                [True],
+                (dates[1:] != dates[:-1])
+                | (reals[1:] != reals[:-1])
+                | (ensemble_codes[1:] != ensemble_codes[:-1]),
             ]
-        ).first()
-    raise ValueError(
-        f"Cannot combine `time_index`={time_index} and `time_index_input`={time_index_input}. "
-        "Ensure that `time_index_input` has a higher than or equal frequency to `time_index`. "
-        "Valid options are `daily`, `monthly` and `yearly` (dependent on input data)."
+        )
+    )
+    if len(starts) == 0:
+        return dates, ensembles, reals, values
+
+    # Row of the first defined value of each column in each interval
+    rows = np.where(
+        np.isnan(values), len(values), np.arange(len(values))[:, np.newaxis]
+    )
+    first = np.minimum.reduceat(rows, starts, axis=0)
+    stops = np.append(starts[1:], len(values))[:, np.newaxis]
+    resampled = np.where(
+        first < stops,
+        np.take_along_axis(values, np.minimum(first, len(values) - 1), axis=0),
+        np.nan,
     )
+    return dates[starts], ensembles[starts], reals[starts], resampled
 
 
 def rename_vec_from_cum(vector: str, as_rate: bool) -> str:
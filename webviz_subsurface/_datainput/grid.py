@@ -1,16 +1,48 @@
-from typing import Optional
+from functools import lru_cache
 
+import numpy as np
 import xtgeo
-from webviz_config.common_cache import CACHE
 
+from .._utils.grid_geometry import GridGeometry
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
+
+@lru_cache(maxsize=4)
 def load_grid(gridpath: str) -> xtgeo.Grid:
     return xtgeo.grid_from_file(gridpath)
 
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def load_grid_parameter(
-    grid: Optional[xtgeo.Grid], gridparameterpath: str
-) -> xtgeo.GridProperty:
-    return xtgeo.gridproperty_from_file(gridparameterpath, grid=grid)
+@lru_cache(maxsize=4)
+def load_grid_geometry(gridpath: str) -> GridGeometry:
+    """Returns the cached cell geometry and spatial index of a grid. This is kept
+    in process memory, as it is expensive to build and to serialize."""
+    return GridGeometry(load_grid(gridpath))
+
+
+@lru_cache(maxsize=16)
+def load_grid_parameter_values(gridpath: str, gridparameterpath: str) -> np.ndarray:
+    """Returns the values of a grid parameter with shape (ncol, nrow, nlay),
+    with inactive cells as NaN. The grid is needed for parameters in formats
+    without dimensions, e.g. GRDECL and INIT."""
+    return np.ma.filled(
+        np.ma.asarray(
+            xtgeo.gridproperty_from_file(
+                gridparameterpath, grid=load_grid(gridpath)
+            ).values,
+            dtype=np.float64,
+        ),
+        np.nan,
+    )
+
+
+@lru_cache(maxsize=16)
+def load_surface_grid_cells(gridpath: str, surfacepath: str) -> np.ndarray:
+    """Returns the flat index of the grid cell at each node of a surface, with
+    the shape of the surface values and -1 for nodes outside the grid. Slicing
+    any parameter of the grid along the surface is then a single lookup, see
+    `sample_cells`."""
+    surface = xtgeo.surface_from_file(surfacepath)
+    xcoords, ycoords = surface.get_xy_values(asmasked=False)
+    cells = load_grid_geometry(gridpath).locate_cells(
+        xcoords, ycoords, np.ma.filled(surface.values, np.nan).ravel()
+    )
+    return cells.astype(np.int32).reshape(surface.values.shape)
@@ -1,26 +1,33 @@
 import numpy as np
-import xtgeo
 from webviz_config.common_cache import CACHE
 
+from .._providers.seismic_cube_store import SeismicCube, load_seismic_cube_from_file
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def load_cube_data(cube_path: str) -> xtgeo.Cube:
-    return xtgeo.Cube(cube_path)
 
+def load_cube(cube_path: str) -> SeismicCube:
+    """Returns a memory-mapped seismic cube, converting the SEG-Y file on first use"""
+    return load_seismic_cube_from_file(cube_path)
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def get_xline(cube: xtgeo.Cube, xline: int) -> np.ndarray:
-    idx = np.where(cube.xlines == xline)
-    return cube.values[:, idx, :][:, 0, 0].T
 
+def get_xline(cube_path: str, xline: int) -> np.ndarray:
+    return _get_cube_slice(str(cube_path), "xline", int(xline))
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
-def get_iline(cube: xtgeo.Cube, iline: int) -> np.ndarray:
-    idx = np.where(cube.ilines == iline)
-    return cube.values[idx, :, :][0, 0, :].T
+
+def get_iline(cube_path: str, iline: int) -> np.ndarray:
+    return _get_cube_slice(str(cube_path), "iline", int(iline))
+
+
+def get_zslice(cube_path: str, zslice: float) -> np.ndarray:
+    return _get_cube_slice(str(cube_path), "zslice", float(zslice))
 
 
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
-def get_zslice(cube: xtgeo.Cube, zslice: float) -> np.ndarray:
-    idx = np.where(cube.zslices == zslice)
-    return cube.values[:, :, idx][:, :, 0, 0].T
+def _get_cube_slice(cube_path: str, axis: str, index: float) -> np.ndarray:
+    """Slices are cached by cube path, axis and line/slice value, so navigating
+    back and forth in a cube does not reread the values"""
+    cube = load_cube(cube_path)
+    if axis == "iline":
+        return cube.get_iline(int(index))
+    if axis == "xline":
+        return cube.get_xline(int(index))
+    return cube.get_zslice(index)
@@ -2,10 +2,11 @@ import numpy as np
 from xtgeo import RegularSurface
 from webviz_config.common_cache import CACHE
 
+from .._providers.surface_value_cache import load_surface_from_file
+
 
-@CACHE.memoize(timeout=CACHE.TIMEOUT)
 def load_surface(surface_path: str) -> RegularSurface:
-    return RegularSurface(surface_path)
+    return load_surface_from_file(surface_path)
 
 
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 
 from numpy import ma
 import numpy as np
@@ -6,7 +6,10 @@ import pandas as pd
 import xtgeo
 from plotly.subplots import make_subplots
 
+from .._providers.seismic_cube_store import SeismicCube
 from .._utils.colors import hex_to_rgba
+from .._utils.fence_sampling import SurfaceFenceSampler, surface_geometry_key
+from .._utils.zonelog import get_zone_segments
 
 
 class XSectionFigure:
@@ -18,7 +21,7 @@ class XSectionFigure:
         well (Well): XTGeo well object.
         surfaces (list): List of XTGeo RegularSurface objects
         surfacenames (list): List of surface names (str) for legend
-        cube (Cube): A XTGeo Cube instance
+        cube (Cube): A XTGeo Cube or SeismicCube instance
         grid (Grid): A XTGeo Grid instance
         gridproperty (GridProperty): A XTGeo GridProperty instance
 
@@ -36,7 +39,7 @@ class XSectionFigure:
         zonelogshift: int = 0,
         surfacenames: Optional[List[str]] = None,
         surfacecolors: Optional[List[str]] = None,
-        cube: Optional[xtgeo.Cube] = None,
+        cube: Optional[Union[xtgeo.Cube, SeismicCube]] = None,
         grid: Optional[xtgeo.Grid] = None,
         gridproperty: Optional[xtgeo.GridProperty] = None,
         zunit: str = "",
@@ -84,6 +87,7 @@ class XSectionFigure:
         self._zonelogshift = zonelogshift
 
         self._fence = None
+        self._surface_fence_samplers: Dict[Tuple, SurfaceFenceSampler] = {}
 
     @property
     def data(self) -> Any:
@@ -138,6 +142,14 @@ class XSectionFigure:
                 raise ValueError("Input well is None")  # should be more flexible
         return self._fence
 
+    def _get_fence(self) -> np.ndarray:
+        """Returns the fence specification, which is undefined if the well is
+        too short to make a fence"""
+        fence = self.fence
+        if fence is None:
+            raise ValueError("Cannot make a fence from the input well")
+        return fence
+
     def plot_well(
         self,
         zonelogname: Optional[str] = "ZONELOG",
@@ -202,31 +214,27 @@ class XSectionFigure:
 
         if zonelogname not in df.columns:
             return
-        zonevals = df[zonelogname].values
         zomin = (
             zomin if zomin >= int(df[zonelogname].min()) else int(df[zonelogname].min())
         )
         zomax = int(df[zonelogname].max())
 
-        # To prevent gaps in the zonelog it is necessary to duplicate each zone transition
-        zone_transitions = np.where(zonevals[:-1] != zonevals[1:])
-        for transition in zone_transitions:
-            try:
-                zvals = np.insert(zvals, transition, zvals[transition + 1])
-                hvals = np.insert(hvals, transition, hvals[transition + 1])
-                zonevals = np.insert(zonevals, transition, zonevals[transition])
-            except IndexError:
-                pass
+        # Segments of each zone are extended to the next zone to prevent gaps,
+        # and separated by NaN to break the line between segments
+        zone_points: Dict[float, List[np.ndarray]] = {}
+        for zone, hseg, zseg in get_zone_segments(df[zonelogname].values, hvals, zvals):
+            zone_points.setdefault(zone, []).append(
+                np.column_stack([hseg, zseg]).astype(np.float64)
+            )
+            zone_points[zone].append(np.full((1, 2), np.nan))
 
         for i, zone in enumerate(range(zomin, zomax + 1)):
-            zvals_copy = ma.masked_where(zonevals != zone, zvals)
-            hvals_copy = ma.masked_where(zonevals != zone, hvals)
+            points = np.vstack(zone_points.get(zone, [np.empty((0, 2))]))
             color = self._surfacecolors[i % len(self._surfacecolors)]
             self._figure.add_trace(
-                {  # pylint: disable=no-member
-                    "x": hvals_copy.compressed(),
-                    # pylint: disable=no-member
-                    "y": zvals_copy.compressed(),
+                {
+                    "x": points[:-1, 0],
+                    "y": points[:-1, 1],
                     "line": {"width": 10, "color": color},
                     "fillcolor": color,
                     "marker": {"opacity": 0.5},
@@ -307,7 +315,7 @@ class XSectionFigure:
     # pylint: disable=too-many-locals, unused-argument
     def plot_cube(
         self,
-        cube: xtgeo.Cube = None,
+        cube: Optional[Union[xtgeo.Cube, SeismicCube]] = None,
         vmin: Optional[float] = None,
         vmax: Optional[float] = None,
         alpha: float = 0.7,
@@ -338,7 +346,7 @@ class XSectionFigure:
         zinc = self._cube.zinc / 2.0
 
         zvalsv = self._cube.get_randomline(
-            self.fence,
+            self._get_fence(),
             zmin=self._zmin,
             zmax=self._zmax,
             zincrement=zinc,
@@ -440,16 +448,15 @@ class XSectionFigure:
         # specified here
 
         if surfaces and surfacenames and len(surfaces) == len(surfacenames):
-            for i, surface in enumerate(surfaces):
-
-                hfence1 = surface.get_randomline(self.fence).copy()
+            fence_values = self._get_surface_fence_values(surfaces)
+            for i, surface_values in enumerate(fence_values):
                 self._figure.add_trace(
                     {
                         "type": "scatter",
                         "mode": "lines",
                         "fill": "tonexty" if i != 0 and fill else None,
-                        "y": hfence1[:, 1],
-                        "x": hfence1[:, 0],
+                        "y": surface_values,
+                        "x": self._get_fence()[:, 3],
                         "name": surfacenames[i],
                         # "marker": {"color": s_color},
                     },
@@ -457,6 +464,28 @@ class XSectionFigure:
                     1,
                 )
 
+    def _get_surface_fence_values(
+        self, surfaces: List[xtgeo.RegularSurface]
+    ) -> np.ndarray:
+        """Returns values along the fence for a list of surfaces, with shape
+        (len(surfaces), len(fence)). The fence interpolation is computed once per
+        distinct surface geometry and reused for all surfaces in the figure."""
+        fence = self._get_fence()
+        fence_values = np.full((len(surfaces), len(fence)), np.nan)
+        groups: Dict[Tuple, List[int]] = {}
+        for idx, surface in enumerate(surfaces):
+            groups.setdefault(surface_geometry_key(surface), []).append(idx)
+
+        for geometry_key, indices in groups.items():
+            sampler = self._surface_fence_samplers.get(geometry_key)
+            if sampler is None:
+                sampler = SurfaceFenceSampler(surfaces[indices[0]], fence)
+                self._surface_fence_samplers[geometry_key] = sampler
+            fence_values[indices] = sampler.sample(
+                np.ma.stack([surfaces[idx].values for idx in indices])
+            )
+        return fence_values
+
     def plot_statistical_surface(
         self,
         statistical_surfaces: Dict[str, xtgeo.RegularSurface],
@@ -479,11 +508,16 @@ class XSectionFigure:
         line_color = hex_to_rgba(color, 1)
 
         # Extract surface values along well fence
-        x_values = statistical_surfaces["mean"].get_randomline(self.fence).copy()[:, 0]
-        stat = {
-            key: statistical_surfaces[key].get_randomline(self.fence).copy()[:, 1]
-            for key in ["maximum", "minimum", "p90", "p10", "mean", "stddev"]
-        }
+        x_values = self._get_fence()[:, 3]
+        stat_keys = ["maximum", "minimum", "p90", "p10", "mean", "stddev"]
+        stat = dict(
+            zip(
+                stat_keys,
+                self._get_surface_fence_values(
+                    [statistical_surfaces[key] for key in stat_keys]
+                ),
+            )
+        )
 
         # Maximum trace (contains hoverinfo)
         self._figure.add_trace(
@@ -10,6 +10,12 @@ import xtgeo
 from webviz_config.webviz_store import webvizstore
 from webviz_config.common_cache import CACHE
 
+from webviz_subsurface._providers.surface_value_cache import load_surface_from_file
+from webviz_subsurface._utils.fence_sampling import (
+    SurfaceFenceSampler,
+    surface_geometry_key,
+)
+
 
 class SurfaceSetModel:
     """Class to load and calculate statistical surfaces from an FMU Ensemble"""
@@ -88,7 +94,38 @@ class SurfaceSetModel:
                 f"Multiple surfaces found for name: {name}, attribute: {attribute}, date: {date}, "
                 f"realization: {realization}. Returning first surface"
             )
-        return xtgeo.surface_from_file(get_stored_surface_path(df.iloc[0]["path"]))
+        return load_surface_from_file(get_stored_surface_path(df.iloc[0]["path"]))
+
+    # pylint: disable=too-many-arguments
+    def get_realization_fence_values(
+        self,
+        name: str,
+        attribute: str,
+        realizations: List[int],
+        fence_spec: np.ndarray,
+        date: Optional[str] = None,
+        sampling: Optional[str] = "bilinear",
+    ) -> np.ndarray:
+        """Returns values along a fence for a set of realization surfaces, as an
+        array with shape (len(realizations), len(fence_spec)). The fence interpolation
+        is computed once per surface geometry and applied to all realizations sharing
+        that geometry. Missing realizations are returned as NaN."""
+        fence_values = np.full((len(realizations), len(fence_spec)), np.nan)
+        df = self._filter_surface_table(
+            name=name, attribute=attribute, date=date, realizations=realizations
+        )
+        paths = df.drop_duplicates("REAL").set_index("REAL")["path"]
+        surfaces = {
+            idx: load_surface_from_file(get_stored_surface_path(paths[real]))
+            for idx, real in enumerate(realizations)
+            if real in paths.index
+        }
+        for rows, stack in _stack_by_geometry(surfaces):
+            sampler = SurfaceFenceSampler(stack[0], fence_spec, sampling)
+            fence_values[rows] = sampler.sample(
+                np.ma.stack([surface.values for surface in stack])
+            )
+        return fence_values
 
     def _filter_surface_table(
         self,
@@ -184,7 +221,7 @@ class SurfaceSetModel:
 
     @property
     def first_surface_geometry(self) -> Dict:
-        surface = xtgeo.surface_from_file(
+        surface = load_surface_from_file(
             get_stored_surface_path(self._surface_table.iloc[0]["path"])
         )
         return {
@@ -201,6 +238,18 @@ class SurfaceSetModel:
         }
 
 
+def _stack_by_geometry(
+    surfaces: Dict[int, xtgeo.RegularSurface]
+) -> List[Tuple[List[int], List[xtgeo.RegularSurface]]]:
+    """Groups surfaces, keyed by row, into stacks of surfaces sharing a geometry"""
+    stacks: Dict[Tuple, Tuple[List[int], List[xtgeo.RegularSurface]]] = {}
+    for row, surface in surfaces.items():
+        rows, stack = stacks.setdefault(surface_geometry_key(surface), ([], []))
+        rows.append(row)
+        stack.append(surface)
+    return list(stacks.values())
+
+
 @webvizstore
 def get_stored_surface_path(runpath: Path) -> Path:
     """Returns path of a stored surface"""
@@ -212,7 +261,9 @@ def save_statistical_surface_no_store(
 ) -> io.BytesIO:
     """Wrapper function to store a calculated surface as BytesIO"""
 
-    surfaces = xtgeo.Surfaces([get_stored_surface_path(fn) for fn in fns])
+    surfaces = xtgeo.Surfaces(
+        [load_surface_from_file(get_stored_surface_path(fn)) for fn in fns]
+    )
     if len(surfaces.surfaces) == 0:
         surface = xtgeo.RegularSurface()
     elif calculation in ["Mean", "StdDev", "Min", "Max", "P10", "P90"]:
@@ -230,7 +281,7 @@ def save_statistical_surface_no_store(
 @webvizstore
 def save_statistical_surface(fns: List[str], calculation: str) -> io.BytesIO:
     """Wrapper function to store a calculated surface as BytesIO"""
-    surfaces = xtgeo.Surfaces(fns)
+    surfaces = xtgeo.Surfaces([load_surface_from_file(fn) for fn in fns])
     if len(surfaces.surfaces) == 0:
         surface = xtgeo.RegularSurface()
     elif calculation in ["Mean", "StdDev", "Min", "Max", "P10", "P90"]:
@@ -1,16 +1,33 @@
-from typing import List, Optional, Dict, Union
+from typing import Any, List, Optional, Dict, Union, Tuple
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import logging
+import threading
 import warnings
 
 import numpy as np
 import xtgeo
-from webviz_config.common_cache import CACHE
 
+from webviz_subsurface._providers.well_cache import WellCache
 from webviz_subsurface._utils.webvizstore_functions import get_path
+from webviz_subsurface._utils.well_spatial_index import WellSpatialIndex
+
+LOGGER = logging.getLogger(__name__)
+
+# Wells are loaded in worker processes when at least this many are not cached
+PARALLEL_LOADING_MIN_WELLS = 20
 
 
 class WellSetModel:
-    """Class to load and store Xtgeo Wells"""
+    """Class to load and store Xtgeo Wells
+
+    Fences are kept in memory once computed. Provide `precompute_fences` as a list
+    of (distance, nextend) pairs to compute fences for all wells in a background
+    thread at startup.
+
+    Map queries for wells near a point or crossing a polyline are answered from a
+    spatial index over the well trajectories, built on first use."""
 
     def __init__(
         self,
@@ -20,6 +37,7 @@ class WellSetModel:
         tvdmin: float = None,
         tvdmax: float = None,
         downsample_interval: int = None,
+        precompute_fences: Optional[List[Tuple[float, float]]] = None,
     ):
         self._wellfiles = wellfiles
         self._zonelog = zonelog
@@ -28,38 +46,71 @@ class WellSetModel:
         self._tvdmax = tvdmax
         self._downsample = downsample_interval
         self._wells = self._load_wells()
+        self._fences: Dict[Tuple[str, float, int, float], np.ndarray] = {}
+        self._fence_lock = threading.Lock()
+        self._spatial_index: Optional[WellSpatialIndex] = None
+        self._spatial_index_lock = threading.Lock()
+        if precompute_fences:
+            threading.Thread(
+                target=self._precompute_fences, args=(precompute_fences,), daemon=True
+            ).start()
 
     def _load_wells(self) -> Dict[str, xtgeo.Well]:
         """Load all wells, performing optional truncation and
-        coarsening"""
+        coarsening. Processed wells are read from the well cache if available,
+        and remaining wells are loaded in parallel"""
+        options = self._processing_options
+        try:
+            well_cache: Optional[WellCache] = WellCache.instance()
+        except RuntimeError:
+            well_cache = None
 
-        wells: List[xtgeo.Well] = []
-        for wellpath in self._wellfiles:
-            try:
-                well = load_well(
-                    get_path(wellpath), zonelogname=self._zonelog, mdlogname=self._mdlog
+        wellpaths = [get_path(wellpath) for wellpath in self._wellfiles]
+        wells: Dict[int, xtgeo.Well] = {}
+        if well_cache is not None:
+            for idx, wellpath in enumerate(wellpaths):
+                well = well_cache.load_well(wellpath, options)
+                if well is not None:
+                    wells[idx] = well
+        missing = [idx for idx in range(len(wellpaths)) if idx not in wells]
+        missing_paths = [wellpaths[idx] for idx in missing]
+
+        if len(missing) >= PARALLEL_LOADING_MIN_WELLS:
+            with ProcessPoolExecutor() as executor:
+                loaded = dict(
+                    zip(
+                        missing,
+                        executor.map(
+                            _load_and_process_well_or_none,
+                            missing_paths,
+                            repeat(options),
+                        ),
+                    )
                 )
-            except ValueError:
-                warnings.warn(f"Cannot load invalid well: {str(wellpath)}")
+        else:
+            loaded = {
+                idx: _load_and_process_well_or_none(wellpath, options)
+                for idx, wellpath in zip(missing, missing_paths)
+            }
+
+        for idx, well in loaded.items():
+            if well is None:
+                warnings.warn(f"Cannot load invalid well: {str(self._wellfiles[idx])}")
                 continue
-            if self._tvdmin is not None:
-                well.dataframe = well.dataframe[
-                    well.dataframe["Z_TVDSS"] >= self._tvdmin
-                ]
-                well.dataframe.reset_index(drop=True, inplace=True)
-            if self._tvdmax is not None:
-                well.dataframe = well.dataframe[
-                    well.dataframe["Z_TVDSS"] <= self._tvdmax
-                ]
-                well.dataframe.reset_index(drop=True, inplace=True)
-            if self._downsample is not None:
-                well.downsample(interval=self._downsample)
-            if self._mdlog is None:
-                well.geometrics()
-            # Create a relative XYLENGTH vector (0.0 where well starts)
-            well.create_relative_hlen()
-            wells.append(well)
-        return {well.name: well for well in wells}
+            if well_cache is not None:
+                well_cache.store_well(wellpaths[idx], options, well)
+            wells[idx] = well
+        return {wells[idx].name: wells[idx] for idx in sorted(wells)}
+
+    @property
+    def _processing_options(self) -> Dict[str, Any]:
+        return {
+            "zonelog": self._zonelog,
+            "mdlog": self._mdlog,
+            "tvdmin": self._tvdmin,
+            "tvdmax": self._tvdmax,
+            "downsample_interval": self._downsample,
+        }
 
     @property
     def wells(self) -> Dict[str, xtgeo.Well]:
@@ -75,13 +126,45 @@ class WellSetModel:
         """Returns list of well names"""
         return list(self._wells.keys())
 
-    @CACHE.memoize(timeout=CACHE.TIMEOUT)
     def get_fence(
         self,
         well_name: str,
         distance: float = 20,
         atleast: int = 5,
-        nextend: int = 2,
+        nextend: float = 2,
+    ) -> np.ndarray:
+        """Returns a fence specification from a well. Fences are computed once
+        per set of arguments and kept in memory"""
+        key = (well_name, float(distance), int(atleast), float(nextend))
+        fence = self._fences.get(key)
+        if fence is None:
+            # The fence is created outside the lock, so requests for other fences
+            # are not blocked. If the same fence is requested concurrently, it may
+            # be created twice, and the first one stored is kept.
+            fence = self._create_fence(well_name, distance, atleast, nextend)
+            with self._fence_lock:
+                fence = self._fences.setdefault(key, fence)
+        return fence
+
+    def _precompute_fences(self, fence_settings: List[Tuple[float, float]]) -> None:
+        for distance, nextend in fence_settings:
+            for well_name in self.well_names:
+                try:
+                    self.get_fence(well_name, distance=distance, nextend=nextend)
+                except Exception:  # pylint: disable=broad-except
+                    # Fences for invalid wells are left to be computed on request,
+                    # so one well does not stop the precomputation for the others
+                    LOGGER.warning(
+                        f"Could not precompute fence for well {well_name}",
+                        exc_info=True,
+                    )
+
+    def _create_fence(
+        self,
+        well_name: str,
+        distance: float,
+        atleast: int,
+        nextend: float,
     ) -> np.ndarray:
         """Creates a fence specification from a well"""
         if not self._is_vertical(well_name):
@@ -97,6 +180,41 @@ class WellSetModel:
             distance=distance, atleast=atleast, nextend=nextend, asnumpy=True
         )
 
+    @property
+    def spatial_index(self) -> WellSpatialIndex:
+        """Returns a spatial index over the map view of all well trajectories"""
+        if self._spatial_index is None:
+            with self._spatial_index_lock:
+                if self._spatial_index is None:
+                    self._spatial_index = WellSpatialIndex(
+                        {
+                            name: well.dataframe[["X_UTME", "Y_UTMN"]].values
+                            for name, well in self.wells.items()
+                        }
+                    )
+        return self._spatial_index
+
+    def get_nearest_well(
+        self, x: float, y: float, max_distance: float = np.inf
+    ) -> Optional[str]:
+        """Returns the name of the well closest to a map position, or None if
+        no well is within max_distance"""
+        return self.spatial_index.nearest_well(x, y, max_distance=max_distance)
+
+    def get_wells_within_radius(self, x: float, y: float, radius: float) -> List[str]:
+        """Returns names of wells passing within radius of a map position,
+        closest first"""
+        return self.spatial_index.wells_within_radius(x, y, radius)
+
+    def get_wells_crossing_polyline(
+        self, polyline: List[List[float]], tolerance: float = 0.0
+    ) -> List[str]:
+        """Returns names of wells crossing a polyline of [x, y] coordinates,
+        in order along the polyline"""
+        return self.spatial_index.wells_crossing_polyline(
+            np.asarray(polyline, dtype=np.float64)[:, :2], tolerance=tolerance
+        )
+
     def _is_vertical(self, well_name: str) -> bool:
         return (
             self.wells[well_name].dataframe["X_UTME"].nunique() == 1
@@ -108,6 +226,42 @@ class WellSetModel:
         return self._tvdmin is not None
 
 
+# pylint: disable=too-many-arguments
+def load_and_process_well(
+    wellpath: Path,
+    zonelog: Optional[str] = None,
+    mdlog: Optional[str] = None,
+    tvdmin: Optional[float] = None,
+    tvdmax: Optional[float] = None,
+    downsample_interval: Optional[int] = None,
+) -> xtgeo.Well:
+    """Load a well, performing optional truncation and coarsening.
+    Defined at module level to allow loading in worker processes."""
+    well = load_well(wellpath, zonelogname=zonelog, mdlogname=mdlog)
+    if tvdmin is not None:
+        well.dataframe = well.dataframe[well.dataframe["Z_TVDSS"] >= tvdmin]
+        well.dataframe.reset_index(drop=True, inplace=True)
+    if tvdmax is not None:
+        well.dataframe = well.dataframe[well.dataframe["Z_TVDSS"] <= tvdmax]
+        well.dataframe.reset_index(drop=True, inplace=True)
+    if downsample_interval is not None:
+        well.downsample(interval=downsample_interval)
+    if mdlog is None:
+        well.geometrics()
+    # Create a relative XYLENGTH vector (0.0 where well starts)
+    well.create_relative_hlen()
+    return well
+
+
+def _load_and_process_well_or_none(
+    wellpath: Path, options: Dict[str, Any]
+) -> Optional[xtgeo.Well]:
+    try:
+        return load_and_process_well(wellpath, **options)
+    except ValueError:
+        return None
+
+
 def load_well(
     wfile: Union[str, Path],
     zonelogname: Optional[str] = None,
@@ -1,3 +1,6 @@
 from .ensemble_table_provider import EnsembleTableProvider
 from .ensemble_table_provider import EnsembleTableProviderSet
 from .ensemble_table_provider_factory import EnsembleTableProviderFactory
+from .surface_value_cache import SurfaceValueCache
+from .well_cache import WellCache
+from .seismic_cube_store import SeismicCubeStore
@@ -0,0 +1,214 @@
+from typing import Any, List, Optional, Tuple, Union
+from collections import OrderedDict
+from pathlib import Path
+import os
+import tempfile
+import threading
+import zlib
+
+import numpy as np
+
+
+class BrickedArray:
+    """Read-only 3D float32 array stored as zlib-compressed cubic bricks in a file.
+
+    In a trace-ordered layout, a slice along the last axis touches every trace in
+    the volume. With bricks, slices along any of the three axes read a similar
+    number of bricks. Decompressed bricks are kept in a small LRU cache shared by
+    all readers of the array.
+    """
+
+    def __init__(
+        self,
+        data_path: Path,
+        offsets: np.ndarray,
+        shape: Tuple[int, int, int],
+        brick_size: int,
+        cache_size: int = 256,
+    ) -> None:
+        self._data = np.memmap(data_path, dtype=np.uint8, mode="r")
+        self._offsets = offsets
+        self._shape = tuple(shape)
+        self._brick_size = brick_size
+        self._nbricks = tuple(-(-dim // brick_size) for dim in self._shape)
+        self._cache: "OrderedDict[Tuple[int, int, int], np.ndarray]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._shape
+
+    @property
+    def ndim(self) -> int:
+        return 3
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.float32)
+
+    def __array__(self, dtype: Optional[Any] = None) -> np.ndarray:
+        values = self[:, :, :]
+        return values if dtype is None else values.astype(dtype)
+
+    def __getitem__(self, key: Union[int, slice, Tuple]) -> np.ndarray:
+        """Supports basic indexing with integers and slices"""
+        ranges, squeeze = self._key_to_ranges(key)
+        out_shape = [len(rng) for axis, rng in enumerate(ranges) if axis not in squeeze]
+        if any(len(rng) == 0 for rng in ranges):
+            return np.empty(out_shape, dtype=np.float32)
+
+        # Read the bounding box of the requested indices, and pick the requested
+        # indices from it, as strides and reversed slices are allowed
+        starts = [min(rng) for rng in ranges]
+        box = self._read_box(starts, [max(rng) + 1 for rng in ranges])
+        values = box[
+            np.ix_(*[np.asarray(rng) - start for rng, start in zip(ranges, starts)])
+        ]
+        return values.reshape(out_shape)
+
+    def _key_to_ranges(
+        self, key: Union[int, slice, Tuple]
+    ) -> Tuple[List[range], List[int]]:
+        """Returns the range of indices along each axis for a basic index, and
+        the axes indexed by an integer"""
+        key = key if isinstance(key, tuple) else (key,)
+        key = key + (slice(None),) * (3 - len(key))
+
+        ranges: List[range] = []
+        squeeze = []
+        for axis, (item, dim) in enumerate(zip(key, self._shape)):
+            if isinstance(item, slice):
+                ranges.append(range(*item.indices(dim)))
+            else:
+                index = int(item) + dim if int(item) < 0 else int(item)
+                if not 0 <= index < dim:
+                    raise IndexError(f"Index {item} is out of bounds for axis {axis}")
+                ranges.append(range(index, index + 1))
+                squeeze.append(axis)
+        return ranges, squeeze
+
+    def _read_box(self, starts: List[int], stops: List[int]) -> np.ndarray:
+        """Returns the values from starts to stops along each axis, read brick
+        by brick"""
+        box = np.empty([stop - start for start, stop in zip(starts, stops)], np.float32)
+        size = self._brick_size
+        for brick_key in np.ndindex(
+            *[-(-stop // size) - start // size for start, stop in zip(starts, stops)]
+        ):
+            brick_key = tuple(
+                start // size + idx for start, idx in zip(starts, brick_key)
+            )
+            src, dst = _brick_overlap(brick_key, starts, stops, size)
+            box[dst] = self._get_brick(*brick_key)[src]
+        return box
+
+    def get_traces(
+        self, i: np.ndarray, j: np.ndarray, kstart: int, kstop: int
+    ) -> np.ndarray:
+        """Returns the values of the traces at the given (i, j) indices, for
+        layers kstart to kstop, with shape (ntraces, kstop - kstart)"""
+        size = self._brick_size
+        traces = np.empty((len(i), kstop - kstart), dtype=np.float32)
+        brick_columns = (i // size) * self._nbricks[1] + j // size
+        for brick_column in np.unique(brick_columns):
+            in_column = brick_columns == brick_column
+            traces[in_column] = self._get_brick_column_traces(
+                divmod(int(brick_column), self._nbricks[1]),
+                i[in_column] % size,
+                j[in_column] % size,
+                (kstart, kstop),
+            )
+        return traces
+
+    def get_points(self, i: np.ndarray, j: np.ndarray, k: np.ndarray) -> np.ndarray:
+        """Returns the values at the given (i, j, k) indices, decompressing each
+        brick that is hit once"""
+        size = self._brick_size
+        points = np.empty(len(i), dtype=np.float32)
+        bricks = np.ravel_multi_index((i // size, j // size, k // size), self._nbricks)
+        for flat_index in np.unique(bricks):
+            in_brick = bricks == flat_index
+            brick_key = np.unravel_index(int(flat_index), self._nbricks)
+            points[in_brick] = self._get_brick(*(int(idx) for idx in brick_key))[
+                i[in_brick] % size, j[in_brick] % size, k[in_brick] % size
+            ]
+        return points
+
+    def _get_brick_column_traces(
+        self,
+        brick_ij: Tuple[int, int],
+        i: np.ndarray,
+        j: np.ndarray,
+        krange: Tuple[int, int],
+    ) -> np.ndarray:
+        """Returns the traces at (i, j) indices within a column of bricks, for
+        layers krange = (kstart, kstop)"""
+        kstart, kstop = krange
+        size = self._brick_size
+        traces = np.empty((len(i), kstop - kstart), dtype=np.float32)
+        for bk in range(kstart // size, -(-kstop // size)):
+            lower = max(kstart, bk * size)
+            upper = min(kstop, (bk + 1) * size)
+            traces[:, lower - kstart : upper - kstart] = self._get_brick(*brick_ij, bk)[
+                i, j, lower - bk * size : upper - bk * size
+            ]
+        return traces
+
+    def _get_brick(self, bi: int, bj: int, bk: int) -> np.ndarray:
+        brick_key = (bi, bj, bk)
+        with self._lock:
+            brick = self._cache.get(brick_key)
+            if brick is not None:
+                self._cache.move_to_end(brick_key)
+                return brick
+
+        flat_index = np.ravel_multi_index(brick_key, self._nbricks)
+        start, stop = self._offsets[flat_index], self._offsets[flat_index + 1]
+        size = self._brick_size
+        brick = np.frombuffer(
+            zlib.decompress(self._data[start:stop].tobytes()), dtype=np.float32
+        ).reshape(size, size, size)
+
+        with self._lock:
+            self._cache[brick_key] = brick
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return brick
+
+    @staticmethod
+    def write(data_path: Path, values: np.ndarray, brick_size: int) -> np.ndarray:
+        """Writes values as compressed bricks, and returns the byte offsets of
+        the bricks in the file. Bricks on the upper edges are padded with NaN."""
+        nbricks = tuple(-(-dim // brick_size) for dim in values.shape)
+        offsets = np.zeros(int(np.prod(nbricks)) + 1, dtype=np.int64)
+        with tempfile.NamedTemporaryFile(dir=data_path.parent, delete=False) as file:
+            for flat_index, (bi, bj, bk) in enumerate(np.ndindex(*nbricks)):
+                brick = np.full((brick_size,) * 3, np.nan, dtype=np.float32)
+                block = values[
+                    bi * brick_size : (bi + 1) * brick_size,
+                    bj * brick_size : (bj + 1) * brick_size,
+                    bk * brick_size : (bk + 1) * brick_size,
+                ]
+                brick[: block.shape[0], : block.shape[1], : block.shape[2]] = block
+                compressed = zlib.compress(brick.tobytes(), 1)
+                file.write(compressed)
+                offsets[flat_index + 1] = offsets[flat_index] + len(compressed)
+            tmp_name = file.name
+        os.replace(tmp_name, data_path)
+        return offsets
+
+
+def _brick_overlap(
+    brick_key: Tuple[int, ...], starts: List[int], stops: List[int], size: int
+) -> Tuple[Tuple[slice, ...], Tuple[slice, ...]]:
+    """Returns the slices of a brick, and of the box from starts to stops,
+    where the two overlap"""
+    src = []
+    dst = []
+    for brick_idx, start, stop in zip(brick_key, starts, stops):
+        lower = max(start, brick_idx * size)
+        upper = min(stop, (brick_idx + 1) * size)
+        src.append(slice(lower - brick_idx * size, upper - brick_idx * size))
+        dst.append(slice(lower - start, upper - start))
+    return tuple(src), tuple(dst)
@@ -0,0 +1,42 @@
+from typing import Union
+from pathlib import Path
+import os
+import hashlib
+import tempfile
+
+import numpy as np
+
+
+def make_hash_string(string_to_hash: str) -> str:
+    # There is no security risk here and chances of collision should be very slim
+    return hashlib.md5(string_to_hash.encode()).hexdigest()  # nosec
+
+
+def make_file_storage_key(file_path: Union[str, Path], *extra_keys: str) -> str:
+    """Returns a storage key identifying the current version of a file.
+    The key is based on the resolved path together with the modification time and
+    size of the file, so that any change to the source file invalidates the key.
+    """
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    return make_hash_string(
+        "__".join([str(path), str(stat.st_mtime_ns), str(stat.st_size), *extra_keys])
+    )
+
+
+def write_file_atomic(file_path: Path, data: bytes) -> None:
+    """Write to a temporary file and move it in place, so that concurrent
+    readers (e.g. multiple workers) never see a partially written file"""
+    with tempfile.NamedTemporaryFile(dir=file_path.parent, delete=False) as file:
+        file.write(data)
+        tmp_name = file.name
+    os.replace(tmp_name, file_path)
+
+
+def write_array_atomic(file_path: Path, array: np.ndarray) -> None:
+    """Write a numpy array in .npy format, atomically as `write_file_atomic`.
+    The array is streamed to file, so no additional in-memory copy is made."""
+    with tempfile.NamedTemporaryFile(dir=file_path.parent, delete=False) as file:
+        np.save(file, array)
+        tmp_name = file.name
+    os.replace(tmp_name, file_path)
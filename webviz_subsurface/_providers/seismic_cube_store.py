@@ -0,0 +1,393 @@
+from typing import Dict, Optional, Tuple, Union
+from pathlib import Path
+import os
+import json
+import logging
+import threading
+
+import numpy as np
+import xtgeo
+
+from webviz_config.webviz_factory_registry import WEBVIZ_FACTORY_REGISTRY
+from webviz_config.webviz_factory import WebvizFactory
+from webviz_config.webviz_instance_info import WebvizRunMode
+
+from .._utils.fence_sampling import get_cube_fence_sampler
+from .bricked_array import BrickedArray
+from .file_cache_utils import (
+    make_file_storage_key,
+    write_array_atomic,
+    write_file_atomic,
+)
+
+
+LOGGER = logging.getLogger(__name__)
+
+CUBE_GEOMETRY_ATTRIBUTES = {
+    "ncol": int,
+    "nrow": int,
+    "nlay": int,
+    "xori": float,
+    "yori": float,
+    "zori": float,
+    "xinc": float,
+    "yinc": float,
+    "zinc": float,
+    "yflip": int,
+    "zflip": int,
+    "rotation": float,
+}
+
+
+class SeismicCube:
+    """Read access to a seismic cube, with values as a (possibly memory-mapped)
+    array of shape (ninlines, ncrosslines, nsamples), or by a `BrickedArray`.
+
+    Inline, crossline and z-slice extraction only reads the part of the value
+    array that is needed, so resident memory is bounded by the slices viewed.
+    """
+
+    def __init__(
+        self,
+        geometry: Dict[str, Union[int, float]],
+        ilines: np.ndarray,
+        xlines: np.ndarray,
+        zslices: np.ndarray,
+        values: Union[np.ndarray, BrickedArray],
+        value_min: float,
+        value_max: float,
+    ) -> None:
+        self._geometry = geometry
+        self._ilines = ilines
+        self._xlines = xlines
+        self._zslices = zslices
+        self._values = values
+        self._value_min = value_min
+        self._value_max = value_max
+
+        # Lookup from inline, crossline and z values to array indices
+        self._iline_index = {int(iline): idx for idx, iline in enumerate(ilines)}
+        self._xline_index = {int(xline): idx for idx, xline in enumerate(xlines)}
+        self._zslice_index = {float(zslice): idx for idx, zslice in enumerate(zslices)}
+
+    @property
+    def geometry(self) -> Dict[str, Union[int, float]]:
+        return self._geometry
+
+    @property
+    def ilines(self) -> np.ndarray:
+        return self._ilines
+
+    @property
+    def xlines(self) -> np.ndarray:
+        return self._xlines
+
+    @property
+    def zslices(self) -> np.ndarray:
+        return self._zslices
+
+    @property
+    def zinc(self) -> float:
+        return self._geometry["zinc"]
+
+    @property
+    def values(self) -> Union[np.ndarray, BrickedArray]:
+        return self._values
+
+    @property
+    def value_min(self) -> float:
+        return self._value_min
+
+    @property
+    def value_max(self) -> float:
+        return self._value_max
+
+    def get_iline(self, iline: int) -> np.ndarray:
+        """Returns the values of an inline, with shape (nsamples, ncrosslines)"""
+        idx = self._iline_index[int(iline)]
+        return np.array(self._values[idx, :, :].T)
+
+    def get_xline(self, xline: int) -> np.ndarray:
+        """Returns the values of a crossline, with shape (nsamples, ninlines)"""
+        idx = self._xline_index[int(xline)]
+        return np.array(self._values[:, idx, :].T)
+
+    def get_zslice(self, zslice: float) -> np.ndarray:
+        """Returns the values of a time/depth slice, with shape
+        (ncrosslines, ninlines)"""
+        idx = self._zslice_index[float(zslice)]
+        return np.array(self._values[:, :, idx].T)
+
+    def get_traces(
+        self, i: np.ndarray, j: np.ndarray, kstart: int, kstop: int
+    ) -> np.ndarray:
+        """Returns the values of the traces at the given (i, j) array indices,
+        for layers kstart to kstop, with shape (ntraces, kstop - kstart)"""
+        if isinstance(self._values, BrickedArray):
+            return self._values.get_traces(i, j, kstart, kstop)
+        return np.asarray(self._values[i, j, kstart:kstop])
+
+    def get_points(self, i: np.ndarray, j: np.ndarray, k: np.ndarray) -> np.ndarray:
+        """Returns the values at the given (i, j, k) array indices"""
+        if isinstance(self._values, BrickedArray):
+            return self._values.get_points(i, j, k)
+        return np.asarray(self._values[i, j, k])
+
+    def get_randomline(
+        self,
+        fencespec: np.ndarray,
+        zmin: Optional[float] = None,
+        zmax: Optional[float] = None,
+        zincrement: Optional[float] = None,
+        sampling: str = "nearest",
+    ) -> Tuple[float, float, float, float, np.ndarray]:
+        """Returns a random line along a fence, as `xtgeo.Cube.get_randomline`.
+        Only the traces along the fence are read."""
+        sampler = get_cube_fence_sampler(self._geometry, fencespec, sampling)
+        return sampler.get_randomline(self.get_traces, zmin, zmax, zincrement)
+
+    def slice_surface(self, surface: xtgeo.RegularSurface) -> xtgeo.RegularSurface:
+        """Returns a copy of the surface with the cube values at the surface
+        depths, as `RegularSurface.slice_cube` with nearest sampling. Only one
+        value is read for each trace the surface passes through.
+
+        As in xtgeo, the surface is resampled to the cube geometry, the nearest
+        sample is read at each trace, and the result is resampled back to the
+        surface geometry.
+        """
+        geometry = self._geometry
+        cube_surface = xtgeo.RegularSurface(
+            **{
+                attr: geometry[attr]
+                for attr in (
+                    "ncol",
+                    "nrow",
+                    "xori",
+                    "yori",
+                    "xinc",
+                    "yinc",
+                    "yflip",
+                    "rotation",
+                )
+            },
+            values=0.0,
+        )
+        same_geometry = surface.compare_topology(cube_surface, strict=False)
+        if same_geometry:
+            cube_surface.values = surface.values.copy()
+        else:
+            cube_surface.resample(surface)
+
+        depths = np.ma.filled(cube_surface.values.astype(np.float64), np.nan).ravel()
+        # As in xtgeo, depths up to one sample outside the cube get the value
+        # of the nearest edge sample
+        kpos = (depths - geometry["zori"]) / geometry["zinc"]
+        defined = np.flatnonzero((kpos >= -1) & (kpos <= geometry["nlay"]))
+        knode = np.clip(np.floor(kpos[defined] + 0.5), 0, geometry["nlay"] - 1)
+        sampled = np.full(depths.shape, np.nan)
+        sampled[defined] = self.get_points(
+            defined // geometry["nrow"],
+            defined % geometry["nrow"],
+            knode.astype(np.int64),
+        )
+        cube_surface.values = np.ma.masked_invalid(
+            sampled.reshape(cube_surface.dimensions)
+        )
+        result = surface.copy()
+        if same_geometry:
+            result.values = cube_surface.values
+        else:
+            result.resample(cube_surface, mask=True)
+        return result
+
+    def to_xtgeo(self) -> xtgeo.Cube:
+        """Returns an xtgeo Cube sharing the values of this cube"""
+        return xtgeo.Cube(
+            **self._geometry,
+            ilines=self._ilines,
+            xlines=self._xlines,
+            values=np.asarray(self._values),
+        )
+
+    @classmethod
+    def from_xtgeo(cls, cube: xtgeo.Cube) -> "SeismicCube":
+        return cls(
+            geometry={
+                attr: dtype(getattr(cube, attr))
+                for attr, dtype in CUBE_GEOMETRY_ATTRIBUTES.items()
+            },
+            ilines=np.asarray(cube.ilines),
+            xlines=np.asarray(cube.xlines),
+            zslices=np.asarray(cube.zslices),
+            values=cube.values,
+            value_min=float(np.nanmin(cube.values)),
+            value_max=float(np.nanmax(cube.values)),
+        )
+
+
+class SeismicCubeStore(WebvizFactory):
+    """Converts SEG-Y cubes once to native arrays in the webviz storage folder,
+    and opens converted cubes as memory-mapped `SeismicCube` instances.
+
+    The converted values are stored as a .npy file in inline, crossline,
+    sample order, with the inline, crossline and sample axes stored separately
+    together with the cube geometry and value range. Opening a converted cube does
+    not read any values, so it is instantaneous regardless of the cube size.
+
+    Optionally, the values can be stored as compressed bricks of `brick_size`
+    samples along each axis. This makes time/depth slices as fast as inlines
+    and crosslines, at the cost of decompressing bricks on read.
+    `brick_cache_size` is the number of decompressed bricks kept in memory per cube.
+    """
+
+    def __init__(
+        self,
+        root_storage_folder: Path,
+        allow_storage_writes: bool,
+        brick_size: Optional[int] = None,
+        brick_cache_size: int = 256,
+    ) -> None:
+        self._storage_dir = Path(root_storage_folder) / __name__
+        self._allow_storage_writes = allow_storage_writes
+        self._brick_size = brick_size
+        self._brick_cache_size = brick_cache_size
+        self._cubes: Dict[str, SeismicCube] = {}
+        self._lock = threading.Lock()
+
+        LOGGER.info(f"SeismicCubeStore init: storage_dir={self._storage_dir}")
+
+        if self._allow_storage_writes:
+            os.makedirs(self._storage_dir, exist_ok=True)
+
+    @staticmethod
+    def instance() -> "SeismicCubeStore":
+        factory = WEBVIZ_FACTORY_REGISTRY.get_factory(SeismicCubeStore)
+
+        if not factory:
+            app_instance_info = WEBVIZ_FACTORY_REGISTRY.app_instance_info
+            storage_folder = app_instance_info.storage_folder
+            allow_writes = app_instance_info.run_mode != WebvizRunMode.PORTABLE
+            brick_size = None
+            brick_cache_size = 256
+
+            my_settings = WEBVIZ_FACTORY_REGISTRY.all_factory_settings.get(
+                "SeismicCubeStore"
+            )
+            if my_settings:
+                LOGGER.info(f"Parsing settings for SeismicCubeStore: {my_settings}")
+                brick_size = my_settings.get("brick_size", brick_size)
+                brick_cache_size = int(
+                    my_settings.get("brick_cache_size", brick_cache_size)
+                )
+
+            factory = SeismicCubeStore(
+                storage_folder, allow_writes, brick_size, brick_cache_size
+            )
+            WEBVIZ_FACTORY_REGISTRY.set_factory(SeismicCubeStore, factory)
+
+        return factory
+
+    def open_cube(self, cube_path: Union[str, Path]) -> SeismicCube:
+        """Returns a cube instance for a SEG-Y file, converting it to the native
+        storage format if it has not been converted before"""
+        storage_key = (
+            make_file_storage_key(cube_path, f"bricks{self._brick_size}")
+            if self._brick_size
+            else make_file_storage_key(cube_path)
+        )
+        cube = self._cubes.get(storage_key)
+        if cube is None:
+            with self._lock:
+                cube = self._cubes.get(storage_key)
+                if cube is None:
+                    cube = self._load_from_backing_store(storage_key)
+                    if cube is None:
+                        cube = self._convert(cube_path, storage_key)
+                    self._cubes[storage_key] = cube
+        return cube
+
+    def _convert(self, cube_path: Union[str, Path], storage_key: str) -> SeismicCube:
+        LOGGER.info(f"Converting SEG-Y cube: {cube_path}")
+        cube = SeismicCube.from_xtgeo(xtgeo.cube_from_file(cube_path))
+        if not self._allow_storage_writes:
+            return cube
+
+        if self._brick_size:
+            write_array_atomic(
+                self._storage_dir / f"offsets__{storage_key}.npy",
+                BrickedArray.write(
+                    self._storage_dir / f"bricks__{storage_key}.bin",
+                    np.asarray(cube.values),
+                    self._brick_size,
+                ),
+            )
+        else:
+            write_array_atomic(
+                self._storage_dir / f"values__{storage_key}.npy",
+                np.ascontiguousarray(cube.values, dtype=np.float32),
+            )
+        write_array_atomic(
+            self._storage_dir / f"ilines__{storage_key}.npy", cube.ilines
+        )
+        write_array_atomic(
+            self._storage_dir / f"xlines__{storage_key}.npy", cube.xlines
+        )
+        write_array_atomic(
+            self._storage_dir / f"zslices__{storage_key}.npy", cube.zslices
+        )
+        # The metadata file is written last, as it marks the entry as complete
+        write_file_atomic(
+            self._storage_dir / f"cube__{storage_key}.json",
+            json.dumps(
+                {
+                    "geometry": cube.geometry,
+                    "brick_size": self._brick_size,
+                    "value_min": cube.value_min,
+                    "value_max": cube.value_max,
+                }
+            ).encode(),
+        )
+        # Serve the converted cube from the memory-mapped file, so the parsed
+        # values can be released
+        return self._load_from_backing_store(storage_key) or cube
+
+    def _load_from_backing_store(self, storage_key: str) -> Optional[SeismicCube]:
+        try:
+            with open(self._storage_dir / f"cube__{storage_key}.json", "r") as file:
+                metadata = json.load(file)
+            geometry = metadata["geometry"]
+            values: Union[np.ndarray, BrickedArray]
+            if metadata.get("brick_size"):
+                values = BrickedArray(
+                    self._storage_dir / f"bricks__{storage_key}.bin",
+                    offsets=np.load(self._storage_dir / f"offsets__{storage_key}.npy"),
+                    shape=(geometry["ncol"], geometry["nrow"], geometry["nlay"]),
+                    brick_size=metadata["brick_size"],
+                    cache_size=self._brick_cache_size,
+                )
+            else:
+                values = np.load(
+                    self._storage_dir / f"values__{storage_key}.npy", mmap_mode="r"
+                )
+            return SeismicCube(
+                geometry=geometry,
+                ilines=np.load(self._storage_dir / f"ilines__{storage_key}.npy"),
+                xlines=np.load(self._storage_dir / f"xlines__{storage_key}.npy"),
+                zslices=np.load(self._storage_dir / f"zslices__{storage_key}.npy"),
+                values=values,
+                value_min=metadata["value_min"],
+                value_max=metadata["value_max"],
+            )
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+
+def load_seismic_cube_from_file(cube_path: Union[str, Path]) -> SeismicCube:
+    """Opens a seismic cube through the seismic cube store. Falls back to parsing
+    the file directly if the webviz factory registry is not available, e.g. when
+    running outside of a webviz application."""
+    try:
+        store = SeismicCubeStore.instance()
+    except RuntimeError:
+        return SeismicCube.from_xtgeo(xtgeo.cube_from_file(cube_path))
+    return store.open_cube(cube_path)
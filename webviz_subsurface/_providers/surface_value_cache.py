@@ -0,0 +1,156 @@
+from typing import Dict, Optional, Union
+from pathlib import Path
+import os
+import io
+import json
+import logging
+
+import numpy as np
+import xtgeo
+
+from webviz_config.webviz_factory_registry import WEBVIZ_FACTORY_REGISTRY
+from webviz_config.webviz_factory import WebvizFactory
+from webviz_config.webviz_instance_info import WebvizRunMode
+
+from .file_cache_utils import make_hash_string, make_file_storage_key, write_file_atomic
+
+
+LOGGER = logging.getLogger(__name__)
+
+GEOMETRY_ATTRIBUTES = {
+    "ncol": int,
+    "nrow": int,
+    "xori": float,
+    "yori": float,
+    "xinc": float,
+    "yinc": float,
+    "yflip": int,
+    "rotation": float,
+}
+
+
+class SurfaceValueCache(WebvizFactory):
+    """Persistent cache of parsed surface files, stored in the webviz storage folder.
+
+    Surface geometries are stored once per distinct grid definition, while the
+    values of each surface file are stored as float32 arrays (optionally compressed),
+    keyed by source path and modification time. Since all realizations of a horizon
+    typically share geometry, this avoids both reparsing of irap files and storage
+    of duplicated geometry information.
+    """
+
+    def __init__(
+        self,
+        root_storage_folder: Path,
+        allow_storage_writes: bool,
+        compress: bool = False,
+    ) -> None:
+
+        self._storage_dir = Path(root_storage_folder) / __name__
+        self._allow_storage_writes = allow_storage_writes
+        self._compress = compress
+        self._geometries: Dict[str, Dict[str, Union[int, float]]] = {}
+
+        LOGGER.info(f"SurfaceValueCache init: storage_dir={self._storage_dir}")
+
+        if self._allow_storage_writes:
+            os.makedirs(self._storage_dir, exist_ok=True)
+
+    @staticmethod
+    def instance() -> "SurfaceValueCache":
+        factory = WEBVIZ_FACTORY_REGISTRY.get_factory(SurfaceValueCache)
+
+        if not factory:
+            app_instance_info = WEBVIZ_FACTORY_REGISTRY.app_instance_info
+            storage_folder = app_instance_info.storage_folder
+            allow_writes = app_instance_info.run_mode != WebvizRunMode.PORTABLE
+            compress = False
+
+            my_settings = WEBVIZ_FACTORY_REGISTRY.all_factory_settings.get(
+                "SurfaceValueCache"
+            )
+            if my_settings:
+                LOGGER.info(f"Parsing settings for SurfaceValueCache: {my_settings}")
+                compress = bool(my_settings.get("compress", compress))
+
+            factory = SurfaceValueCache(storage_folder, allow_writes, compress)
+            WEBVIZ_FACTORY_REGISTRY.set_factory(SurfaceValueCache, factory)
+
+        return factory
+
+    def load_surface(self, surface_path: Union[str, Path]) -> xtgeo.RegularSurface:
+        """Returns a surface instance, read from the cache if the source file
+        has been cached before, else parsed from file and added to the cache"""
+        storage_key = make_file_storage_key(surface_path)
+
+        surface = self._load_from_backing_store(storage_key)
+        if surface is not None:
+            return surface
+
+        surface = xtgeo.surface_from_file(surface_path)
+        if self._allow_storage_writes:
+            self._write_to_backing_store(storage_key, surface)
+        return surface
+
+    def _load_from_backing_store(
+        self, storage_key: str
+    ) -> Optional[xtgeo.RegularSurface]:
+        try:
+            with np.load(self._storage_dir / f"values__{storage_key}.npz") as data:
+                values = data["values"]
+                geometry_key = str(data["geometry_key"])
+        except (FileNotFoundError, KeyError, ValueError):
+            return None
+
+        geometry = self._load_geometry(geometry_key)
+        if geometry is None:
+            return None
+        return xtgeo.RegularSurface(
+            **geometry,
+            values=np.ma.masked_invalid(values.astype(np.float64)),
+        )
+
+    def _load_geometry(
+        self, geometry_key: str
+    ) -> Optional[Dict[str, Union[int, float]]]:
+        if geometry_key not in self._geometries:
+            try:
+                with open(
+                    self._storage_dir / f"geometry__{geometry_key}.json", "r"
+                ) as file:
+                    self._geometries[geometry_key] = json.load(file)
+            except FileNotFoundError:
+                return None
+        return self._geometries[geometry_key]
+
+    def _write_to_backing_store(
+        self, storage_key: str, surface: xtgeo.RegularSurface
+    ) -> None:
+        geometry = {
+            attr: dtype(getattr(surface, attr))
+            for attr, dtype in GEOMETRY_ATTRIBUTES.items()
+        }
+        geometry_key = make_hash_string(json.dumps(geometry, sort_keys=True))
+        geometry_fn = self._storage_dir / f"geometry__{geometry_key}.json"
+        if geometry_key not in self._geometries and not geometry_fn.exists():
+            write_file_atomic(geometry_fn, json.dumps(geometry).encode())
+        self._geometries[geometry_key] = geometry
+
+        values = np.ma.filled(surface.values.astype(np.float32), np.nan)
+        buffer = io.BytesIO()
+        savez = np.savez_compressed if self._compress else np.savez
+        savez(buffer, values=values, geometry_key=np.array(geometry_key))
+        write_file_atomic(
+            self._storage_dir / f"values__{storage_key}.npz", buffer.getvalue()
+        )
+
+
+def load_surface_from_file(surface_path: Union[str, Path]) -> xtgeo.RegularSurface:
+    """Loads a surface through the persistent surface cache. Falls back to parsing
+    the file directly if the webviz factory registry is not available, e.g. when
+    running outside of a webviz application."""
+    try:
+        cache = SurfaceValueCache.instance()
+    except RuntimeError:
+        return xtgeo.surface_from_file(surface_path)
+    return cache.load_surface(surface_path)
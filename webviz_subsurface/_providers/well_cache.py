@@ -0,0 +1,134 @@
+from typing import Any, Dict, Optional, Union
+from pathlib import Path
+import os
+import json
+import logging
+
+import pyarrow as pa
+from pyarrow import feather
+import xtgeo
+
+from webviz_config.webviz_factory_registry import WEBVIZ_FACTORY_REGISTRY
+from webviz_config.webviz_factory import WebvizFactory
+from webviz_config.webviz_instance_info import WebvizRunMode
+
+from .file_cache_utils import make_file_storage_key, write_file_atomic
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class WellCache(WebvizFactory):
+    """Persistent cache of loaded and post-processed wells, stored in the webviz
+    storage folder.
+
+    The well dataframe is stored in Arrow IPC (feather) format, and the well
+    metadata (name, position, log types and records) as json. Entries are keyed
+    by the source path, its modification time and the processing options used
+    (e.g. truncation and downsampling), so a changed file or changed options
+    will give a cache miss.
+    """
+
+    def __init__(self, root_storage_folder: Path, allow_storage_writes: bool) -> None:
+        self._storage_dir = Path(root_storage_folder) / __name__
+        self._allow_storage_writes = allow_storage_writes
+
+        LOGGER.info(f"WellCache init: storage_dir={self._storage_dir}")
+
+        if self._allow_storage_writes:
+            os.makedirs(self._storage_dir, exist_ok=True)
+
+    @staticmethod
+    def instance() -> "WellCache":
+        factory = WEBVIZ_FACTORY_REGISTRY.get_factory(WellCache)
+
+        if not factory:
+            app_instance_info = WEBVIZ_FACTORY_REGISTRY.app_instance_info
+            storage_folder = app_instance_info.storage_folder
+            allow_writes = app_instance_info.run_mode != WebvizRunMode.PORTABLE
+
+            factory = WellCache(storage_folder, allow_writes)
+            WEBVIZ_FACTORY_REGISTRY.set_factory(WellCache, factory)
+
+        return factory
+
+    def load_well(
+        self, well_path: Union[str, Path], processing_options: Dict[str, Any]
+    ) -> Optional[xtgeo.Well]:
+        """Returns the cached well for the given source file and processing options,
+        or None if it has not been cached"""
+        storage_key = self._make_storage_key(well_path, processing_options)
+        try:
+            with open(self._storage_dir / f"well__{storage_key}.json", "r") as file:
+                metadata = json.load(file)
+            dframe = feather.read_feather(
+                self._storage_dir / f"well__{storage_key}.arrow"
+            )
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+
+        return xtgeo.Well(
+            rkb=metadata["rkb"],
+            xpos=metadata["xpos"],
+            ypos=metadata["ypos"],
+            wname=metadata["name"],
+            df=dframe,
+            mdlogname=metadata["mdlogname"],
+            zonelogname=metadata["zonelogname"],
+            wlogtypes=metadata["logtypes"],
+            wlogrecords={
+                logname: {int(code): name for code, name in record}
+                if metadata["logtypes"][logname] == "DISC"
+                else record
+                for logname, record in metadata["logrecords"].items()
+            },
+        )
+
+    def store_well(
+        self,
+        well_path: Union[str, Path],
+        processing_options: Dict[str, Any],
+        well: xtgeo.Well,
+    ) -> None:
+        """Stores a processed well, if writing to the storage folder is allowed"""
+        if not self._allow_storage_writes:
+            return
+
+        storage_key = self._make_storage_key(well_path, processing_options)
+        logtypes = {logname: well.get_logtype(logname) for logname in well.lognames}
+        metadata = {
+            "name": well.name,
+            "rkb": well.rkb,
+            "xpos": well.xpos,
+            "ypos": well.ypos,
+            "mdlogname": well.mdlogname,
+            "zonelogname": well.zonelogname,
+            "logtypes": logtypes,
+            # Store discrete log records as lists, as json keys must be strings
+            "logrecords": {
+                logname: list(well.get_logrecord(logname).items())
+                if logtypes[logname] == "DISC"
+                else well.get_logrecord(logname)
+                for logname in well.lognames
+            },
+        }
+
+        sink = pa.BufferOutputStream()
+        feather.write_feather(well.dataframe.reset_index(drop=True), sink)
+        write_file_atomic(
+            self._storage_dir / f"well__{storage_key}.arrow",
+            sink.getvalue().to_pybytes(),
+        )
+        # The metadata file is written last, as it marks the entry as complete
+        write_file_atomic(
+            self._storage_dir / f"well__{storage_key}.json",
+            json.dumps(metadata).encode(),
+        )
+
+    @staticmethod
+    def _make_storage_key(
+        well_path: Union[str, Path], processing_options: Dict[str, Any]
+    ) -> str:
+        return make_file_storage_key(
+            well_path, json.dumps(processing_options, sort_keys=True)
+        )
@@ -0,0 +1,147 @@
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def decimate_section(
+    values: np.ndarray,
+    xaxis: np.ndarray,
+    yaxis: np.ndarray,
+    max_shape: Tuple[int, int],
+    method: str = "stride",
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Reduces a 2D section with shape (len(yaxis), len(xaxis)) to at most
+    max_shape = (rows, columns) samples, e.g. the pixel size of the plot.
+
+    Methods:
+    * `stride`: Keep every n'th sample.
+    * `maxabs`: Keep the sample with largest absolute value in each block,
+      preserving the sign. Suited for seismic amplitudes, where striding can
+      remove the strongest reflectors.
+    * `rms`: Root-mean-square of each block.
+
+    The axes are returned as the coordinates of the first sample in each block.
+    """
+    nrows, ncols = values.shape
+    row_factor = max(1, -(-nrows // max(1, max_shape[0])))
+    col_factor = max(1, -(-ncols // max(1, max_shape[1])))
+    if row_factor == 1 and col_factor == 1:
+        return values, xaxis, yaxis
+
+    xaxis = np.asarray(xaxis)[::col_factor]
+    yaxis = np.asarray(yaxis)[::row_factor]
+    if method == "stride":
+        return values[::row_factor, ::col_factor], xaxis, yaxis
+
+    # Pad with NaN to whole blocks, and collect the samples of each block
+    # along the last axis
+    padded = np.full(
+        (len(yaxis) * row_factor, len(xaxis) * col_factor), np.nan, dtype=np.float64
+    )
+    padded[:nrows, :ncols] = values
+    blocks = (
+        padded.reshape(len(yaxis), row_factor, len(xaxis), col_factor)
+        .transpose(0, 2, 1, 3)
+        .reshape(len(yaxis), len(xaxis), row_factor * col_factor)
+    )
+    if method == "maxabs":
+        largest = np.argmax(np.nan_to_num(np.abs(blocks), nan=-1.0), axis=-1)
+        return (
+            np.take_along_axis(blocks, largest[..., np.newaxis], axis=-1)[..., 0],
+            xaxis,
+            yaxis,
+        )
+    if method == "rms":
+        count = np.isfinite(blocks).sum(axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (
+                np.sqrt(np.nansum(np.square(blocks), axis=-1) / count),
+                xaxis,
+                yaxis,
+            )
+    raise ValueError(f"Unknown decimation method: {method}")
+
+
+def crop_section(
+    values: np.ndarray,
+    xaxis: np.ndarray,
+    yaxis: np.ndarray,
+    xrange: Optional[Sequence[float]] = None,
+    yrange: Optional[Sequence[float]] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Crops a 2D section with shape (len(yaxis), len(xaxis)) to the given axis
+    ranges, keeping one sample outside the ranges on each side"""
+    xaxis = np.asarray(xaxis)
+    yaxis = np.asarray(yaxis)
+    xslice = _range_to_slice(xaxis, xrange)
+    yslice = _range_to_slice(yaxis, yrange)
+    return values[yslice, xslice], xaxis[xslice], yaxis[yslice]
+
+
+def _range_to_slice(axis: np.ndarray, axis_range: Optional[Sequence[float]]) -> slice:
+    if axis_range is None:
+        return slice(None)
+    inside = np.flatnonzero((axis >= min(axis_range)) & (axis <= max(axis_range)))
+    if len(inside) == 0:
+        return slice(0, 0)
+    return slice(max(inside[0] - 1, 0), inside[-1] + 2)
+
+
+def decimate_lines(
+    groups: np.ndarray, values: np.ndarray, max_points: int
+) -> np.ndarray:
+    """Returns the indices of the samples to keep when reducing several lines,
+    e.g. realizations, to at most about max_points samples each. The lines are
+    concatenated in one array, with `groups` labelling the line of each sample.
+    The samples of each line must be contiguous and ordered along the x axis.
+
+    Lines with more than max_points samples are split into max_points / 2
+    buckets of consecutive samples, and the smallest and largest value of each
+    bucket is kept, together with the first and last sample of the line. Unlike
+    striding, this preserves the peaks and steps of the lines.
+    """
+    groups = np.asarray(groups)
+    values = np.asarray(values, dtype=np.float64)
+    nsamples = len(groups)
+    if nsamples == 0:
+        return np.arange(0)
+
+    starts = np.flatnonzero(np.concatenate([[True], groups[1:] != groups[:-1]]))
+    counts = np.diff(np.append(starts, nsamples))
+    line = np.repeat(np.arange(len(starts)), counts)
+    position = np.arange(nsamples) - starts[line]
+    nbuckets = max(1, max_points // 2)
+    # Each sample is its own bucket in lines that are short enough already
+    bucket = np.where(
+        counts[line] > max_points, position * nbuckets // counts[line], position
+    )
+
+    # Sort by bucket and value, so that the first and last sample of each
+    # bucket are the smallest and largest values
+    bucket_key = line * (int(bucket.max()) + 1) + bucket
+    order = np.lexsort((values, bucket_key))
+    bucket_key = bucket_key[order]
+    edges = bucket_key[1:] != bucket_key[:-1]
+    keep = np.zeros(nsamples, dtype=bool)
+    keep[
+        order[np.concatenate([[True], edges]) | np.concatenate([edges, [True]])]
+    ] = True
+    keep[starts] = True
+    keep[starts + counts - 1] = True
+    return np.flatnonzero(keep)
+
+
+def crop_lines(
+    groups: np.ndarray, xvalues: np.ndarray, xrange: Sequence[Any]
+) -> np.ndarray:
+    """Returns the indices of the samples of several concatenated lines (as in
+    `decimate_lines`) within the given x range, keeping one sample outside the
+    range on each side of each line"""
+    groups = np.asarray(groups)
+    xvalues = np.asarray(xvalues)
+    inside = (xvalues >= min(xrange)) & (xvalues <= max(xrange))
+    same_line = groups[1:] == groups[:-1]
+    keep = inside.copy()
+    keep[:-1] |= inside[1:] & same_line
+    keep[1:] |= inside[:-1] & same_line
+    return np.flatnonzero(keep)
@@ -0,0 +1,308 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+from functools import lru_cache
+
+import numpy as np
+import xtgeo
+
+
+def surface_geometry_key(surface: xtgeo.RegularSurface) -> Tuple:
+    """Returns a hashable key identifying the geometry of a surface"""
+    return (
+        surface.ncol,
+        surface.nrow,
+        surface.xori,
+        surface.yori,
+        surface.xinc,
+        surface.yinc,
+        surface.yflip,
+        surface.rotation,
+    )
+
+
+def node_positions(
+    geometry: Dict[str, Any], x: np.ndarray, y: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the fractional (i, j) node indices of map coordinates in a
+    rotated regular grid, e.g. a surface or a cube, given by the geometry
+    attributes xori, yori, xinc, yinc, yflip and rotation (degrees)"""
+    angle = np.radians(geometry["rotation"])
+    xrel = np.asarray(x, dtype=np.float64) - geometry["xori"]
+    yrel = np.asarray(y, dtype=np.float64) - geometry["yori"]
+    ipos = (xrel * np.cos(angle) + yrel * np.sin(angle)) / geometry["xinc"]
+    jpos = (
+        (-xrel * np.sin(angle) + yrel * np.cos(angle))
+        * geometry["yflip"]
+        / geometry["yinc"]
+    )
+    return ipos, jpos
+
+
+class SurfaceFenceSampler:
+    """Samples surfaces along a fence, equivalent to `RegularSurface.get_randomline`.
+
+    The node indices and interpolation weights for the fence points are computed
+    once for a surface geometry, and can then be applied to any number of surfaces
+    sharing that geometry in one vectorized operation, e.g. a stack of all
+    realizations of a horizon.
+    """
+
+    def __init__(
+        self,
+        geometry: xtgeo.RegularSurface,
+        fence_spec: np.ndarray,
+        sampling: Optional[str] = "bilinear",
+    ) -> None:
+        self._ncol = geometry.ncol
+        self._nrow = geometry.nrow
+        self._hlen = np.asarray(fence_spec[:, 3], dtype=np.float64)
+
+        ipos, jpos = node_positions(
+            {
+                attr: getattr(geometry, attr)
+                for attr in ("xori", "yori", "xinc", "yinc", "yflip", "rotation")
+            },
+            fence_spec[:, 0],
+            fence_spec[:, 1],
+        )
+
+        self._valid = (
+            (ipos >= 0)
+            & (ipos <= self._ncol - 1)
+            & (jpos >= 0)
+            & (jpos <= self._nrow - 1)
+        )
+
+        # Lower left node of the cell containing each point. Points on the last
+        # row/column are assigned to the previous cell with a unit weight.
+        inode = np.clip(np.floor(ipos), 0, max(self._ncol - 2, 0)).astype(np.int64)
+        jnode = np.clip(np.floor(jpos), 0, max(self._nrow - 2, 0)).astype(np.int64)
+        ifrac = np.clip(ipos - inode, 0, 1)
+        jfrac = np.clip(jpos - jnode, 0, 1)
+        inext = np.minimum(inode + 1, self._ncol - 1)
+        jnext = np.minimum(jnode + 1, self._nrow - 1)
+
+        self._indices = np.stack(
+            [
+                inode * self._nrow + jnode,
+                inext * self._nrow + jnode,
+                inode * self._nrow + jnext,
+                inext * self._nrow + jnext,
+            ],
+            axis=1,
+        )
+        self._weights = np.stack(
+            [
+                (1 - ifrac) * (1 - jfrac),
+                ifrac * (1 - jfrac),
+                (1 - ifrac) * jfrac,
+                ifrac * jfrac,
+            ],
+            axis=1,
+        )
+        if sampling == "nearest":
+            # Snap to the corner with the largest weight. All four corners are
+            # still used to detect undefined values, as done in xtgeo.
+            nearest = np.argmax(self._weights, axis=1)
+            self._weights = np.zeros_like(self._weights)
+            self._weights[np.arange(len(nearest)), nearest] = 1.0
+
+    @property
+    def hlen(self) -> np.ndarray:
+        """Horizontal length along the fence for each sampled point"""
+        return self._hlen
+
+    def sample(self, values: np.ndarray) -> np.ndarray:
+        """Returns values along the fence for a single surface value array with
+        shape (ncol, nrow), or for a stack of surfaces with shape (n, ncol, nrow).
+        The result has shape (npoints) or (n, npoints) respectively. Points outside
+        the surface or next to undefined nodes are returned as NaN.
+        """
+        stack = np.ma.filled(np.ma.asarray(values, dtype=np.float64), np.nan)
+        single = stack.ndim == 2
+        stack = stack.reshape(-1, self._ncol * self._nrow)
+
+        # Gather corner values for all points and surfaces at once. Undefined
+        # corners propagate as NaN through the weighted sum.
+        sampled = np.einsum("rpk,pk->rp", stack[:, self._indices], self._weights)
+        sampled[:, ~self._valid] = np.nan
+        return sampled[0] if single else sampled
+
+    def get_randomline(self, surface: xtgeo.RegularSurface) -> np.ndarray:
+        """Returns an array of (hlen, value) pairs, as `RegularSurface.get_randomline`"""
+        return np.vstack([self._hlen, self.sample(surface.values)]).T
+
+
+class CubeFenceSampler:
+    """Samples a seismic cube along a fence, equivalent to `Cube.get_randomline`.
+
+    The trace indices and horizontal interpolation weights for the fence points
+    are computed once per cube geometry, fence and sampling (see
+    `get_cube_fence_sampler`). Sampling then reads the needed traces once, over
+    the requested z-range only, and interpolates all samples in one operation.
+    """
+
+    def __init__(
+        self,
+        geometry: Dict[str, Any],
+        fence_spec: np.ndarray,
+        sampling: str = "nearest",
+    ) -> None:
+        self._geometry = geometry
+        self._trilinear = sampling == "trilinear"
+        self._hlen = np.asarray(fence_spec[:, 3], dtype=np.float64)
+        ipos, jpos = node_positions(geometry, fence_spec[:, 0], fence_spec[:, 1])
+        ivalid, inode, inext, ifrac = _interpolation_nodes(
+            ipos, geometry["ncol"], self._trilinear
+        )
+        jvalid, jnode, jnext, jfrac = _interpolation_nodes(
+            jpos, geometry["nrow"], self._trilinear
+        )
+        self._valid = ivalid & jvalid
+
+        if self._trilinear:
+            self._trace_i = np.stack([inode, inext, inode, inext], axis=1)
+            self._trace_j = np.stack([jnode, jnode, jnext, jnext], axis=1)
+            self._weights = np.stack(
+                [
+                    (1 - ifrac) * (1 - jfrac),
+                    ifrac * (1 - jfrac),
+                    (1 - ifrac) * jfrac,
+                    ifrac * jfrac,
+                ],
+                axis=1,
+            )
+        else:
+            self._trace_i = inode[:, np.newaxis]
+            self._trace_j = jnode[:, np.newaxis]
+            self._weights = np.ones((len(ipos), 1))
+
+    @property
+    def hlen(self) -> np.ndarray:
+        """Horizontal length along the fence for each sampled point"""
+        return self._hlen
+
+    def get_randomline(
+        self,
+        read_traces: Callable[[np.ndarray, np.ndarray, int, int], np.ndarray],
+        zmin: Optional[float] = None,
+        zmax: Optional[float] = None,
+        zincrement: Optional[float] = None,
+    ) -> Tuple[float, float, float, float, np.ndarray]:
+        """Returns (hmin, hmax, zmin, zmax, values) as `Cube.get_randomline`, where
+        values has shape (nsamples, npoints).
+
+        `read_traces(i, j, kstart, kstop)` must return the cube values of the
+        traces at the given (i, j) indices for layers kstart to kstop, with shape
+        (ntraces, kstop - kstart).
+        """
+        zmin, zmax, nzsam = self._z_range(zmin, zmax, zincrement)
+
+        # Samples are evenly distributed between zmin and zmax, as in xtgeo
+        kvalid, knode, knext, kfrac = _interpolation_nodes(
+            (np.linspace(zmin, zmax, nzsam) - self._geometry["zori"])
+            / self._geometry["zinc"],
+            self._geometry["nlay"],
+            self._trilinear,
+        )
+
+        values = np.full((nzsam, len(self._hlen)), np.nan)
+        if not kvalid.any() or not self._valid.any():
+            return (self._hlen[0], self._hlen[-1], zmin, zmax, values)
+
+        # Interpolate horizontally for all needed layers, then vertically
+        kstart = int(knode[kvalid].min())
+        horizontal = self._read_horizontal(
+            read_traces, kstart, int(knext[kvalid].max()) + 1
+        )
+        sampled = (1 - kfrac[kvalid]) * horizontal[:, knode[kvalid] - kstart] + kfrac[
+            kvalid
+        ] * horizontal[:, knext[kvalid] - kstart]
+        values[np.ix_(kvalid, self._valid)] = sampled.T
+        return (self._hlen[0], self._hlen[-1], zmin, zmax, values)
+
+    def _z_range(
+        self,
+        zmin: Optional[float],
+        zmax: Optional[float],
+        zincrement: Optional[float],
+    ) -> Tuple[float, float, int]:
+        """Returns the sampled z-range limited to the cube, and the number of
+        samples, with the defaults of `Cube.get_randomline`"""
+        zori = self._geometry["zori"]
+        zinc = self._geometry["zinc"]
+        zcubemax = zori + (self._geometry["nlay"] - 1) * zinc
+        zmin = zori if zmin is None or zmin < zori else zmin
+        zmax = zcubemax if zmax is None or zmax > zcubemax else zmax
+        zincrement = zinc / 2.0 if zincrement is None else zincrement
+        return zmin, zmax, int((zmax - zmin) / zincrement) + 1
+
+    def _read_horizontal(
+        self,
+        read_traces: Callable[[np.ndarray, np.ndarray, int, int], np.ndarray],
+        kstart: int,
+        kstop: int,
+    ) -> np.ndarray:
+        """Reads each distinct trace of the defined fence points once, and returns
+        the horizontally interpolated values for layers kstart to kstop, with shape
+        (npoints, kstop - kstart)"""
+        nrow = self._geometry["nrow"]
+        trace_i = self._trace_i[self._valid]
+        trace_j = self._trace_j[self._valid]
+        traces, inverse = np.unique(trace_i * nrow + trace_j, return_inverse=True)
+        trace_values = read_traces(traces // nrow, traces % nrow, kstart, kstop)
+        return np.einsum(
+            "pc,pck->pk",
+            self._weights[self._valid],
+            trace_values[inverse.reshape(trace_i.shape)],
+        )
+
+
+def _interpolation_nodes(
+    pos: np.ndarray, size: int, trilinear: bool
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Returns (valid, node, next node, fraction) for fractional positions along
+    a cube axis with `size` nodes"""
+    if trilinear:
+        return _linear_nodes(pos, size)
+    return _nearest_nodes(pos, size)
+
+
+def _linear_nodes(
+    pos: np.ndarray, size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Linear interpolation between the two nodes around each position. As in
+    xtgeo, positions on the upper edge of the axis are undefined"""
+    valid = (pos >= 0) & (pos < size - 1)
+    node = np.clip(np.floor(pos), 0, max(size - 2, 0)).astype(np.int64)
+    return valid, node, np.minimum(node + 1, size - 1), np.clip(pos - node, 0, 1)
+
+
+def _nearest_nodes(
+    pos: np.ndarray, size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """The nearest node to each position"""
+    valid = (pos >= 0) & (pos <= size - 1)
+    node = np.clip(np.floor(pos + 0.5), 0, size - 1).astype(np.int64)
+    return valid, node, node, np.zeros(pos.shape)
+
+
+def get_cube_fence_sampler(
+    geometry: Dict[str, Any], fence_spec: np.ndarray, sampling: str = "nearest"
+) -> CubeFenceSampler:
+    """Returns a cube fence sampler, reusing a previously created sampler for
+    the same cube geometry, fence and sampling"""
+    fence = np.ascontiguousarray(fence_spec, dtype=np.float64)
+    return _get_cube_fence_sampler(
+        tuple(sorted(geometry.items())), fence.tobytes(), fence.shape, sampling
+    )
+
+
+@lru_cache(maxsize=32)
+def _get_cube_fence_sampler(
+    geometry_items: Tuple, fence_bytes: bytes, fence_shape: Tuple, sampling: str
+) -> CubeFenceSampler:
+    return CubeFenceSampler(
+        dict(geometry_items),
+        np.frombuffer(fence_bytes, dtype=np.float64).reshape(fence_shape),
+        sampling,
+    )
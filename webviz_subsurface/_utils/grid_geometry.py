@@ -0,0 +1,305 @@
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+import xtgeo
+
+# Upper limit on the number of (point, depth) combinations, or (point, layer)
+# depths, handled at once, to limit the size of temporary arrays
+CHUNK_SIZE = 500000
+
+
+class GridGeometry:
+    """Cached cell geometry of a corner point grid, with a column-wise spatial
+    index for locating points in the grid.
+
+    The cell corners are extracted once, and the map view extent of each column
+    is registered in a regular 2D bucket grid. Locating a point then only visits
+    the few columns registered in its bucket. The footprint of a column at the
+    depth of the point is found on the four (straight) pillars of the column,
+    followed by a search through the layers of the column containing the point.
+    As the geometry is independent of grid properties, any number of properties
+    can be sampled without reloading or re-indexing the grid.
+    """
+
+    def __init__(self, grid: xtgeo.Grid) -> None:
+        self._shape = (grid.ncol, grid.nrow, grid.nlay)
+        corners = np.stack(
+            [np.ma.getdata(prop.values) for prop in grid.get_xyz_corners()], axis=-1
+        ).reshape(grid.ncol, grid.nrow, grid.nlay, 8, 3)
+
+        # Depth of the four top and four base corners of each cell,
+        # in the corner order sw, se, nw, ne
+        self._zcorners = np.ascontiguousarray(corners[..., 2], dtype=np.float32)
+        self._zmin = float(np.nanmin(self._zcorners[..., :4]))
+        self._zmax = float(np.nanmax(self._zcorners[..., 4:]))
+
+        # The pillars of each column, from the top corners of the first layer
+        # to the base corners of the last layer
+        self._pillar_top = corners[:, :, 0, :4, :].reshape(-1, 4, 3).astype(np.float64)
+        self._pillar_base = (
+            corners[:, :, -1, 4:, :].reshape(-1, 4, 3).astype(np.float64)
+        )
+        self._index = _BucketIndex(
+            np.concatenate(
+                [self._pillar_top[..., :2], self._pillar_base[..., :2]], axis=1
+            )
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self._shape
+
+    @property
+    def zmin(self) -> float:
+        return self._zmin
+
+    @property
+    def zmax(self) -> float:
+        return self._zmax
+
+    def _footprints(self, columns: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """Returns the map view corners of the given columns at depths z, found
+        on the pillars of the columns, with shape (len(columns), 4, 2)"""
+        top = self._pillar_top[columns]
+        base = self._pillar_base[columns]
+        height = base[..., 2] - top[..., 2]
+        fraction = np.divide(
+            z[:, np.newaxis] - top[..., 2],
+            height,
+            out=np.zeros(height.shape),
+            where=height != 0,
+        )
+        return top[..., :2] + fraction[..., np.newaxis] * (base[..., :2] - top[..., :2])
+
+    def _locate_columns(
+        self, x: np.ndarray, y: np.ndarray, z: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the flat index of the column containing each point at each
+        depth in z, with shape (npoints, nsamples) and -1 if outside the grid,
+        and the bilinear coordinates (u, v) of the point within the footprint of
+        the column at that depth, with shape (npoints, nsamples, 2)"""
+        columns = np.full(z.shape, -1, dtype=np.int64)
+        uv = np.zeros(z.shape + (2,))
+        xy = np.stack([x, y], axis=1)
+        pair_point, pair_column = self._index.candidates(x, y)
+        with np.errstate(invalid="ignore"):
+            # No cells are found outside the depth range of the grid
+            in_range = (z >= self._zmin) & (z <= self._zmax)
+        for chunk in _chunks(len(pair_point), max(1, CHUNK_SIZE // z.shape[1])):
+            pair, sample = np.nonzero(in_range[pair_point[chunk]])
+            self._locate_in_columns(
+                (columns, uv),
+                (pair_point[chunk][pair], sample),
+                pair_column[chunk][pair],
+                xy,
+                z,
+            )
+        return columns, uv
+
+    def _locate_in_columns(
+        self,
+        located: Tuple[np.ndarray, np.ndarray],
+        index: Tuple[np.ndarray, np.ndarray],
+        candidates: np.ndarray,
+        xy: np.ndarray,
+        z: np.ndarray,
+    ) -> None:
+        """Tests if the points at index = (point, sample) are within the
+        candidate columns, and stores the first column containing each point in
+        located = (columns, uv) as returned by `_locate_columns`, unless a
+        column was found earlier, e.g. for points on shared edges"""
+        columns, uv = located
+        hit_uv = _invert_bilinear(self._footprints(candidates, z[index]), xy[index[0]])
+        eps = 1e-9
+        hit = ((hit_uv >= -eps) & (hit_uv <= 1 + eps)).all(axis=1)
+        flat, first = np.unique(
+            np.ravel_multi_index((index[0][hit], index[1][hit]), z.shape),
+            return_index=True,
+        )
+        new = columns.flat[flat] < 0
+        columns.flat[flat[new]] = candidates[hit][first[new]]
+        uv.reshape(-1, 2)[flat[new]] = np.clip(hit_uv[hit][first[new]], 0, 1)
+
+    def _locate_layers(
+        self, columns: np.ndarray, uv: np.ndarray, z: np.ndarray
+    ) -> np.ndarray:
+        """Returns the flat cell index of points at uv = (u, v) within the given
+        columns at depths z, with -1 for points above, below or between the
+        layers of the column"""
+        u, v = uv.T
+        weights = np.stack([(1 - u) * (1 - v), u * (1 - v), (1 - u) * v, u * v], axis=1)
+        zcorners = self._zcorners.reshape(-1, self._shape[2], 8)[columns]
+        ztop = np.einsum("plc,pc->pl", zcorners[..., :4], weights)
+        zbase = np.einsum("plc,pc->pl", zcorners[..., 4:], weights)
+
+        # Undefined depths propagate downwards, and are never passed
+        layers = np.sum(
+            np.maximum.accumulate(zbase, axis=1) <= z[:, np.newaxis], axis=1
+        )
+        inside = (layers < self._shape[2]) & (
+            ztop[np.arange(len(z)), np.minimum(layers, self._shape[2] - 1)] <= z
+        )
+        return np.where(inside, columns * self._shape[2] + layers, -1)
+
+    def locate_cells(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """Returns the flat cell index (in C order of (ncol, nrow, nlay)) of the
+        cell containing each point, with -1 for points outside the grid. z may
+        have shape (npoints) or (npoints, nsamples) for several depths per point.
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        z = np.asarray(z, dtype=np.float64)
+        single = z.ndim == 1
+        z = z.reshape(len(x), -1)
+
+        cells = np.full(z.shape, -1, dtype=np.int64)
+        columns, uv = self._locate_columns(x, y, z)
+        found = np.flatnonzero(columns >= 0)
+        for chunk in _chunks(len(found), max(1, CHUNK_SIZE // self._shape[2])):
+            idx = found[chunk]
+            cells.flat[idx] = self._locate_layers(
+                columns.flat[idx], uv.reshape(-1, 2)[idx], z.flat[idx]
+            )
+        return cells[:, 0] if single else cells
+
+    def get_randomline(
+        self,
+        fencespec: np.ndarray,
+        values: np.ndarray,
+        zmin: Optional[float] = None,
+        zmax: Optional[float] = None,
+        zincrement: float = 1.0,
+    ) -> Tuple[float, float, float, float, np.ndarray]:
+        """Returns (hmin, hmax, zmin, zmax, section) for a grid property along a
+        fence, as `xtgeo.Grid.get_randomline`. `values` are the property values,
+        with shape (ncol, nrow, nlay), and section has shape (nsamples, npoints).
+        """
+        zmin = self._zmin if zmin is None else zmin
+        zmax = self._zmax if zmax is None else zmax
+        nzsam = int((zmax - zmin) / float(zincrement)) + 1
+        zsamples = zmin + np.arange(nzsam) * zincrement
+
+        cells = self.locate_cells(
+            fencespec[:, 0],
+            fencespec[:, 1],
+            np.broadcast_to(zsamples, (len(fencespec), nzsam)),
+        )
+        section = sample_cells(values, cells)
+        return (fencespec[0, 3], fencespec[-1, 3], zmin, zmax, section.T)
+
+
+class _BucketIndex:
+    """Regular 2D bucket grid over the map view bounding boxes of grid columns,
+    given by the map view points of each column with shape (ncolumns, n, 2).
+    Each column is registered in all buckets overlapped by its bounding box,
+    stored as the column indices sorted by bucket, and the offset of the first
+    column for each bucket."""
+
+    def __init__(self, column_points: np.ndarray) -> None:
+        with np.errstate(invalid="ignore"):
+            lower = np.nanmin(column_points, axis=1)
+            upper = np.nanmax(column_points, axis=1)
+        self._lower = lower
+        self._upper = upper
+        columns = np.flatnonzero(np.isfinite(lower).all(axis=1))
+        lower = lower[columns]
+        upper = upper[columns]
+
+        self._origin = lower.min(axis=0) if len(columns) else np.zeros(2)
+        self._bucket_size = (
+            max(float(np.median((upper - lower).max(axis=1))), 1e-6)
+            if len(columns)
+            else 1.0
+        )
+        bucket_lower = ((lower - self._origin) // self._bucket_size).astype(np.int64)
+        bucket_upper = ((upper - self._origin) // self._bucket_size).astype(np.int64)
+        self._nbuckets = (
+            bucket_upper.max(axis=0) + 1 if len(columns) else np.ones(2, np.int64)
+        )
+
+        column, bucket = self._expand_boxes(bucket_lower, bucket_upper)
+        order = np.argsort(bucket, kind="stable")
+        self._bucket_columns = columns[column[order]]
+        self._bucket_offsets = np.searchsorted(
+            bucket[order], np.arange(self._nbuckets.prod() + 1)
+        )
+
+    def _expand_boxes(
+        self, bucket_lower: np.ndarray, bucket_upper: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (column, bucket) pairs for all buckets within the bucket
+        range of each column"""
+        nx, ny = (bucket_upper - bucket_lower + 1).T
+        count = nx * ny
+        column = np.repeat(np.arange(len(count)), count)
+        local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        bucket_x = bucket_lower[column, 0] + local // ny[column]
+        bucket_y = bucket_lower[column, 1] + local % ny[column]
+        return column, bucket_x * self._nbuckets[1] + bucket_y
+
+    def candidates(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (point, column) index pairs of the columns with a bounding
+        box containing each point, sorted by point"""
+        points = np.stack([x, y], axis=1).astype(np.float64)
+        with np.errstate(invalid="ignore"):
+            bucket_xy = (points - self._origin) // self._bucket_size
+        inside = (
+            np.isfinite(bucket_xy).all(axis=1)
+            & (bucket_xy >= 0).all(axis=1)
+            & (bucket_xy < self._nbuckets).all(axis=1)
+        )
+        bucket = bucket_xy[inside, 0].astype(np.int64) * self._nbuckets[1] + bucket_xy[
+            inside, 1
+        ].astype(np.int64)
+        start = self._bucket_offsets[bucket]
+        count = self._bucket_offsets[bucket + 1] - start
+        pair_column = self._bucket_columns[
+            np.repeat(start - np.cumsum(count) + count, count) + np.arange(count.sum())
+        ]
+        pair_point = np.repeat(np.flatnonzero(inside), count)
+        in_box = (
+            (self._lower[pair_column] <= points[pair_point])
+            & (points[pair_point] <= self._upper[pair_column])
+        ).all(axis=1)
+        return pair_point[in_box], pair_column[in_box]
+
+
+def _invert_bilinear(quad: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Returns the bilinear coordinates (u, v) of target points with shape
+    (n, 2) within quadrilaterals with corners sw, se, nw, ne and shape (n, 4, 2),
+    found with Newton iterations from the centre of the quadrilaterals"""
+    a = quad[:, 0]
+    b = quad[:, 1] - quad[:, 0]
+    c = quad[:, 2] - quad[:, 0]
+    d = quad[:, 0] - quad[:, 1] - quad[:, 2] + quad[:, 3]
+    u = np.full(len(target), 0.5)
+    v = np.full(len(target), 0.5)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(6):
+            residual = target - (
+                a + b * u[:, None] + c * v[:, None] + d * (u * v)[:, None]
+            )
+            du_dir = b + d * v[:, None]
+            dv_dir = c + d * u[:, None]
+            det = du_dir[:, 0] * dv_dir[:, 1] - du_dir[:, 1] * dv_dir[:, 0]
+            u = (
+                u
+                + (residual[:, 0] * dv_dir[:, 1] - residual[:, 1] * dv_dir[:, 0]) / det
+            )
+            v = (
+                v
+                + (du_dir[:, 0] * residual[:, 1] - du_dir[:, 1] * residual[:, 0]) / det
+            )
+    return np.stack([u, v], axis=1)
+
+
+def _chunks(size: int, chunk_size: int) -> Iterator[slice]:
+    for start in range(0, size, chunk_size):
+        yield slice(start, min(start + chunk_size, size))
+
+
+def sample_cells(values: np.ndarray, cells: np.ndarray) -> np.ndarray:
+    """Returns grid property values for flat cell indices from
+    `GridGeometry.locate_cells`, with NaN for undefined values and indices -1"""
+    values = np.ma.filled(np.ma.asarray(values, dtype=np.float64), np.nan).ravel()
+    return np.where(cells >= 0, values[np.maximum(cells, 0)], np.nan)
@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 import sys
 import warnings
 from pathlib import Path
@@ -9,6 +9,10 @@ import yaml
 from webviz_config.utils import terminal_colors
 
 from .._utils.colors import hex_to_rgba
+from .._utils.decimation import crop_lines, decimate_lines
+
+# Number of points above which WebGL is used to render realization traces
+SCATTERGL_POINT_LIMIT = 10000
 
 
 def set_simulation_line_shape_fallback(line_shape_fallback: str) -> str:
@@ -49,40 +53,73 @@ def get_simulation_line_shape(
     return line_shape_fallback
 
 
+def group_values_to_dense(
+    df: pd.DataFrame, groupby: List[str], columns: List[str]
+) -> Tuple[pd.Index, np.ndarray]:
+    """Returns the sorted keys of the groups of a dataframe, and the values of
+    the given columns arranged in a dense array with shape
+    (groups, largest group size, columns), padded with NaN. Rows with undefined
+    keys are left out. Statistics over e.g. the realizations of each
+    (ensemble, date) group are then vectorized NumPy reductions along axis 1.
+    """
+    grouped = df[groupby + columns].groupby(groupby, sort=True)
+    group_ids = grouped.ngroup().to_numpy()
+    positions = grouped.cumcount().to_numpy()
+    keys = grouped.size().index
+    in_group = group_ids >= 0
+
+    dense = np.full(
+        (
+            len(keys),
+            positions[in_group].max() + 1 if in_group.any() else 0,
+            len(columns),
+        ),
+        np.nan,
+    )
+    dense[group_ids[in_group], positions[in_group]] = df[columns].to_numpy(
+        dtype=np.float64
+    )[in_group]
+    return keys, dense
+
+
 def calc_series_statistics(
     df: pd.DataFrame, vectors: list, refaxis: str = "DATE"
 ) -> pd.DataFrame:
     """Calculate statistics for given vectors over the ensembles
     refaxis is used if another column than DATE should be used to groupby.
+
+    The values are arranged in a dense array with shape
+    (ensembles x refaxis values, realizations, vectors), padded with NaN, so that
+    all statistics are computed with a few vectorized NumPy reductions.
     """
-    # Invert p10 and p90 due to oil industry convention.
-    def p10(x: List[float]) -> List[float]:
-        return np.nanpercentile(x, q=90)
-
-    def p90(x: List[float]) -> List[float]:
-        return np.nanpercentile(x, q=10)
-
-    def p50(x: List[float]) -> List[float]:
-        return np.nanpercentile(x, q=50)
-
-    # Calculate statistics, ignoring NaNs.
-    stat_df = (
-        df[["ENSEMBLE", refaxis] + vectors]
-        .groupby(["ENSEMBLE", refaxis])
-        .agg([np.nanmean, np.nanmin, np.nanmax, p10, p90, p50])
-        .reset_index(level=["ENSEMBLE", refaxis], col_level=1)
-    )
-    # Rename nanmin, nanmax and nanmean to min, max and mean.
-    col_stat_label_map = {
-        "nanmin": "min",
-        "nanmax": "max",
-        "nanmean": "mean",
-        "p10": "high_p10",
-        "p90": "low_p90",
-        "p50": "p50",
-    }
-    stat_df.rename(columns=col_stat_label_map, level=1, inplace=True)
+    keys, dense = group_values_to_dense(df, ["ENSEMBLE", refaxis], vectors)
 
+    # Calculate statistics, ignoring NaNs. All-NaN groups give NaN without warnings.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        percentiles = np.nanpercentile(dense, q=[10, 50, 90], axis=1)
+        statistics = {
+            "mean": np.nanmean(dense, axis=1),
+            "min": np.nanmin(dense, axis=1),
+            "max": np.nanmax(dense, axis=1),
+            # Invert p10 and p90 due to oil industry convention.
+            "high_p10": percentiles[2],
+            "low_p90": percentiles[0],
+            "p50": percentiles[1],
+        }
+
+    stat_df = pd.DataFrame(
+        {
+            ("", "ENSEMBLE"): keys.get_level_values("ENSEMBLE"),
+            ("", refaxis): keys.get_level_values(refaxis),
+            **{
+                (vector, stat): values[:, idx]
+                for idx, vector in enumerate(vectors)
+                for stat, values in statistics.items()
+            },
+        }
+    )
+    stat_df.columns = pd.MultiIndex.from_tuples(stat_df.columns)
     return stat_df
 
 
@@ -269,6 +306,106 @@ def add_statistics_traces(
     return traces
 
 
+def create_realizations_trace(
+    dframe: pd.DataFrame,
+    vector: str,
+    name: str,
+    color: str,
+    line_shape: str,
+    hovertemplate: str = "(%{x}, %{y})<br>",
+    showlegend: bool = True,
+    refaxis: str = "DATE",
+) -> Dict[str, Any]:
+    """Renders all realizations in a dataframe as a single line trace.
+
+    The realizations are concatenated with None between them to break the line,
+    and the realization of each point is given as customdata, e.g. to be shown
+    with `%{customdata}` in the hovertemplate. This gives one trace per ensemble
+    instead of one per realization. WebGL is used for traces with many points,
+    unless the line shape is not supported by WebGL.
+    """
+    dframe = dframe.sort_values("REAL", kind="stable")
+    reals = dframe["REAL"].to_numpy()
+
+    # Shift the points of each realization by the separators before it
+    real_no = np.concatenate([[0], np.cumsum(reals[1:] != reals[:-1])])
+    positions = np.arange(len(reals)) + real_no
+    size = len(reals) + (real_no[-1] if len(reals) else 0)
+
+    def with_separators(values: np.ndarray) -> np.ndarray:
+        array = np.full(size, None, dtype=object)
+        array[positions] = values
+        return array
+
+    xvalues = dframe[refaxis].to_numpy()
+    if xvalues.dtype.kind == "M":
+        # Much faster than creating pd.Timestamp objects
+        xvalues = xvalues.astype("datetime64[us]")
+
+    return {
+        "type": "scattergl"
+        if len(reals) > SCATTERGL_POINT_LIMIT and line_shape != "spline"
+        else "scatter",
+        "line": {"shape": line_shape},
+        "x": with_separators(xvalues.astype(object)),
+        "y": with_separators(dframe[vector].to_numpy(dtype=object)),
+        "customdata": with_separators(reals),
+        "hovertemplate": hovertemplate,
+        "name": name,
+        "legendgroup": name,
+        "marker": {"color": color},
+        "showlegend": showlegend,
+    }
+
+
+def downsample_realizations(
+    dframe: pd.DataFrame,
+    vector: str,
+    max_points: int,
+    date_range: Optional[list] = None,
+    refaxis: str = "DATE",
+) -> pd.DataFrame:
+    """Reduces each realization in a dataframe to at most about max_points
+    samples, keeping the smallest and largest value within each bucket of
+    consecutive samples (see `decimate_lines`). If date_range is given, the
+    realizations are first cropped to that range, so that zooming in on the
+    plot gives back the samples of the full resolution data.
+    """
+    dframe = dframe.sort_values(["REAL", refaxis], kind="stable")
+    reals = dframe["REAL"].to_numpy()
+    if date_range is not None:
+        dframe = dframe.iloc[crop_lines(reals, dframe[refaxis].to_numpy(), date_range)]
+        reals = dframe["REAL"].to_numpy()
+    return dframe.iloc[decimate_lines(reals, dframe[vector].to_numpy(), max_points)]
+
+
+def create_vector_selector_data(vectors: Iterable[Tuple[str, str]]) -> List[dict]:
+    """Returns the data for a `wsc.VectorSelector` from (vector, description) pairs.
+    Vectors are grouped on the name before ":", e.g. WOPR for WOPR:OP_1, with the
+    part after ":" as a child node. The description of the first vector of a group is
+    used for the group, and groups and children are kept in input order.
+
+    Nodes are looked up in dicts, so that the data is built in linear time also
+    for many well, connection and region vectors.
+    """
+    nodes: Dict[str, dict] = {}
+    children: Dict[str, Dict[str, dict]] = {}
+    for vector, description in vectors:
+        split = vector.split(":")
+        if split[0] not in nodes:
+            nodes[split[0]] = {
+                "name": split[0],
+                "description": description,
+                "children": [],
+            }
+            children[split[0]] = {}
+        if len(split) == 2 and split[1] not in children[split[0]]:
+            child = {"name": split[1]}
+            children[split[0]][split[1]] = child
+            nodes[split[0]]["children"].append(child)
+    return list(nodes.values())
+
+
 def render_hovertemplate(vector: str, interval: Optional[str]) -> str:
     if vector.startswith(("AVG_", "INTVL_")) and interval is not None:
         if interval == "daily":
@@ -0,0 +1,160 @@
+import base64
+import datetime
+import re
+from typing import Any, Optional, Tuple
+
+import dash
+import numpy as np
+import pandas as pd
+from plotly.offline import get_plotlyjs_version
+
+# Arrays shorter than this are left as JSON lists, as the gain is negligible
+TYPED_ARRAY_MIN_SIZE = 100
+
+# Trace attributes that are encoded as typed arrays, when numeric
+TYPED_ARRAY_KEYS = ("x", "y", "z", "customdata")
+
+
+def _version(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", version)[:2])
+
+
+def _plotlyjs_supports_typed_arrays() -> bool:
+    """Typed arrays are decoded by Plotly.js 2.28 and later. Dash 2.17 and later
+    serve the Plotly.js of the plotly package, while earlier versions of Dash
+    bundle Plotly.js 2.25 or older."""
+    if _version(dash.__version__) < (2, 17):
+        return False
+    return _version(get_plotlyjs_version()) >= (2, 28)
+
+
+# Arrays are left as JSON lists when the Plotly.js served by Dash can not
+# decode typed arrays
+TYPED_ARRAYS_SUPPORTED = _plotlyjs_supports_typed_arrays()
+
+
+def encode_array(values: Any, min_size: int = TYPED_ARRAY_MIN_SIZE) -> Any:
+    """Returns a numeric array as a base64 encoded typed array, i.e. a dict
+    `{"dtype": ..., "bdata": ...}` as supported by Plotly.js, which is both
+    smaller and faster to serialize than a JSON list of numbers.
+
+    Dates are encoded as milliseconds since epoch, which Plotly interprets as
+    dates on axes of type `date`. Floats are stored as float32 when that is
+    lossless, e.g. for data read from Eclipse or roff files. None and NaN
+    values are stored as NaN, which Plotly treats as gaps. Values that are
+    not numeric, or shorter than min_size, are returned unchanged, as are all
+    values if typed arrays are not supported by the Plotly.js in use.
+    """
+    if not TYPED_ARRAYS_SUPPORTED or isinstance(values, dict) or values is None:
+        return values
+    array = _as_numeric_array(values)
+    if array is None or array.size < min_size or array.ndim > 2:
+        return values
+
+    if array.dtype.kind in "iu":
+        info = np.iinfo(np.int32)
+        in_range = array.size == 0 or (
+            array.min() >= info.min and array.max() <= info.max
+        )
+        array = array.astype("<i4" if in_range else "<f8")
+    else:
+        array = array.astype("<f8")
+        with np.errstate(over="ignore"):
+            single = array.astype("<f4")
+        if np.array_equal(single, array, equal_nan=True):
+            array = single
+
+    encoded = {
+        "dtype": array.dtype.str[1:],
+        "bdata": base64.b64encode(np.ascontiguousarray(array).tobytes()).decode(),
+    }
+    if array.ndim == 2:
+        encoded["shape"] = f"{array.shape[0]}, {array.shape[1]}"
+    return encoded
+
+
+def decode_array(values: Any) -> np.ndarray:
+    """Returns the values of a trace attribute as a float array, whether given
+    as a list (with None for undefined values) or a typed array"""
+    if isinstance(values, dict) and "bdata" in values:
+        array = np.frombuffer(
+            base64.b64decode(values["bdata"]), dtype=np.dtype(values["dtype"])
+        ).astype(np.float64)
+        if "shape" in values:
+            array = array.reshape([int(n) for n in values["shape"].split(",")])
+        return array
+    return np.array(values, dtype=np.float64)
+
+
+def encode_trace(trace: dict, min_size: int = TYPED_ARRAY_MIN_SIZE) -> dict:
+    """Returns a copy of a trace with its numeric arrays encoded as typed arrays
+    (see `encode_array`)"""
+    return {
+        key: encode_array(value, min_size) if key in TYPED_ARRAY_KEYS else value
+        for key, value in trace.items()
+    }
+
+
+def encode_figure(figure: dict, min_size: int = TYPED_ARRAY_MIN_SIZE) -> dict:
+    """Returns a copy of a figure dict with the numeric arrays of all traces
+    encoded as typed arrays (see `encode_array`). Axes showing encoded dates
+    are given type `date`, unless they already have a type."""
+    if not TYPED_ARRAYS_SUPPORTED:
+        return figure
+    layout = dict(figure.get("layout", {}))
+    data = []
+    for trace in figure.get("data", []):
+        for key in ("x", "y"):
+            if _is_date_array(trace.get(key)):
+                axis = trace.get(f"{key}axis", key).replace(key, f"{key}axis", 1)
+                layout[axis] = {"type": "date", **layout.get(axis, {})}
+        data.append(encode_trace(trace, min_size))
+    return {**figure, "data": data, "layout": layout}
+
+
+def _is_date_array(values: Any) -> bool:
+    if values is None or isinstance(values, (dict, str)):
+        return False
+    array = np.asarray(values)
+    if array.dtype.kind == "M":
+        return True
+    if array.dtype != object:
+        return False
+    first = _first_defined(array)
+    return isinstance(first, (datetime.date, np.datetime64))
+
+
+def _first_defined(array: np.ndarray) -> Optional[Any]:
+    for value in array.ravel():
+        if value is not None and not (isinstance(value, float) and np.isnan(value)):
+            return value
+    return None
+
+
+def _as_numeric_array(values: Any) -> Optional[np.ndarray]:
+    """Returns the values as a numeric array, with dates as milliseconds since
+    epoch, or None if the values are not numeric"""
+    array = np.asarray(values)
+    if array.dtype.kind in "iuf":
+        return array
+    if _is_date_array(array):
+        try:
+            dates = pd.DatetimeIndex(array.ravel())
+        except (ValueError, TypeError, OverflowError):
+            # E.g. dates outside the range of datetime64[ns]
+            return None
+        milliseconds = (
+            dates.to_numpy().astype("datetime64[ms]").astype(np.int64).astype(float)
+        )
+        milliseconds[dates.isna()] = np.nan
+        return milliseconds.reshape(array.shape)
+    # E.g. numbers with None as line breaks, but not numeric strings, as they
+    # may be categories
+    if array.dtype == object and isinstance(
+        _first_defined(array), (int, float, np.number)
+    ):
+        try:
+            return array.astype(np.float64)
+        except (ValueError, TypeError):
+            return None
+    return None
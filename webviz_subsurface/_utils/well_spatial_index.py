@@ -0,0 +1,91 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class WellSpatialIndex:
+    """Spatial index over the map view (x, y) of a set of well trajectories.
+
+    Trajectories are resampled to points with at most `spacing` distance between
+    them, and all points are stored in one KD-tree together with the index of
+    the well they belong to. This makes nearest-well, radius and polyline queries
+    independent of the number of wells and trajectory samples.
+    Distances are accurate to within `spacing`.
+    """
+
+    def __init__(self, trajectories: Dict[str, np.ndarray], spacing: float = 25.0):
+        self._spacing = spacing
+        self._well_names = list(trajectories.keys())
+
+        points = []
+        well_indices = []
+        for idx, xy in enumerate(trajectories.values()):
+            resampled = resample_polyline(xy, spacing)
+            points.append(resampled)
+            well_indices.append(np.full(len(resampled), idx, dtype=np.int64))
+        self._points = np.vstack(points) if points else np.empty((0, 2))
+        self._well_indices = (
+            np.concatenate(well_indices) if well_indices else np.empty(0, np.int64)
+        )
+        self._tree = cKDTree(self._points)
+
+    def nearest_well(
+        self, x: float, y: float, max_distance: float = np.inf
+    ) -> Optional[str]:
+        """Returns the well closest to a point, or None if no well is within
+        `max_distance`"""
+        if len(self._points) == 0:
+            return None
+        distance, point_idx = self._tree.query(
+            [x, y], distance_upper_bound=max_distance
+        )
+        if not np.isfinite(distance):
+            return None
+        return self._well_names[self._well_indices[point_idx]]
+
+    def wells_within_radius(self, x: float, y: float, radius: float) -> List[str]:
+        """Returns wells passing within `radius` of a point, closest first"""
+        point_indices = np.asarray(self._tree.query_ball_point([x, y], r=radius))
+        if len(point_indices) == 0:
+            return []
+        distances = np.hypot(*(self._points[point_indices] - [x, y]).T)
+        return self._unique_wells(point_indices[np.argsort(distances)])
+
+    def wells_crossing_polyline(
+        self, polyline: np.ndarray, tolerance: float = 0.0
+    ) -> List[str]:
+        """Returns wells crossing, or passing within `tolerance` of, a polyline
+        given as an array of (x, y) coordinates. Wells are ordered by where they
+        first meet the polyline."""
+        resampled = resample_polyline(
+            np.asarray(polyline, dtype=np.float64), self._spacing
+        )
+        neighbours = self._tree.query_ball_point(resampled, r=tolerance + self._spacing)
+        point_indices = np.array(
+            [idx for indices in neighbours for idx in indices], dtype=np.int64
+        )
+        return self._unique_wells(point_indices)
+
+    def _unique_wells(self, point_indices: np.ndarray) -> List[str]:
+        """Returns well names for the given points, without duplicates and in order
+        of first appearance"""
+        well_indices = self._well_indices[point_indices]
+        _, first = np.unique(well_indices, return_index=True)
+        return [self._well_names[well_indices[idx]] for idx in np.sort(first)]
+
+
+def resample_polyline(xy: np.ndarray, spacing: float) -> np.ndarray:
+    """Inserts points along a polyline so that no segment is longer than
+    `spacing`. Undefined points are dropped."""
+    xy = xy[np.isfinite(xy).all(axis=1)]
+    if len(xy) < 2:
+        return xy
+    seglen = np.hypot(*np.diff(xy, axis=0).T)
+    nsub = np.maximum(np.ceil(seglen / spacing), 1).astype(np.int64)
+    segment = np.repeat(np.arange(len(seglen)), nsub)
+    frac = (
+        np.arange(nsub.sum()) - np.repeat(np.cumsum(nsub) - nsub, nsub)
+    ) / np.repeat(nsub, nsub)
+    points = xy[segment] + frac[:, np.newaxis] * (xy[segment + 1] - xy[segment])
+    return np.vstack([points, xy[-1:]])
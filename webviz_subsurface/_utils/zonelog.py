@@ -0,0 +1,45 @@
+from typing import List, Tuple
+
+import numpy as np
+
+
+def get_zone_transitions(zonevals: np.ndarray) -> np.ndarray:
+    """Returns the indices of the last sample before each zone change in a zone
+    log. Consecutive undefined (NaN) samples are treated as one zone."""
+    zonevals = np.asarray(zonevals, dtype=np.float64)
+    same = (zonevals[:-1] == zonevals[1:]) | (
+        np.isnan(zonevals[:-1]) & np.isnan(zonevals[1:])
+    )
+    return np.flatnonzero(~same)
+
+
+def get_zone_top_indices(zonevals: np.ndarray) -> np.ndarray:
+    """Returns the indices of the samples marking zone tops in a zone log.
+
+    The current sample is used when moving upwards in stratigraphy, and the
+    next sample when moving downwards, i.e. the sample in the zone with the
+    larger zone number. Transitions to or from undefined samples are ignored.
+    """
+    diff = np.diff(np.asarray(zonevals, dtype=np.float64))
+    with np.errstate(invalid="ignore"):
+        upwards = diff < 0
+        downwards = diff > 0
+    return np.flatnonzero(upwards | np.concatenate([[False], downwards[:-1]]))
+
+
+def get_zone_segments(
+    zonevals: np.ndarray, hvals: np.ndarray, zvals: np.ndarray
+) -> List[Tuple[float, np.ndarray, np.ndarray]]:
+    """Splits a well trajectory into (zone, hvals, zvals) segments of constant
+    zone, with NaN as zone for undefined samples. Each segment is extended with
+    the first sample of the next segment, so that no gaps are left when the
+    segments are plotted."""
+    zonevals = np.asarray(zonevals, dtype=np.float64)
+    if len(zonevals) == 0:
+        return []
+    starts = np.concatenate([[0], get_zone_transitions(zonevals) + 1])
+    stops = np.append(starts[1:] + 1, len(zonevals))
+    return [
+        (zonevals[start], hvals[start:stop], zvals[start:stop])
+        for start, stop in zip(starts, stops)
+    ]
@@ -5,6 +5,8 @@ import plotly.graph_objects as go
 
 from webviz_config.common_cache import CACHE
 
+from webviz_subsurface._utils.zonelog import get_zone_segments
+
 
 class HuvXsection:
     def __init__(
@@ -314,7 +316,6 @@ class HuvXsection:
         return pd.DataFrame(data=data)
 
     @CACHE.memoize(timeout=CACHE.TIMEOUT)
-    # pylint: disable=too-many-locals
     def get_zonelog_data(self, well, well_df, zonelogname="Zonelog"):
         """Find zonelogs where well trajectory intersects surfaces and assigns color.
         Args:
@@ -335,82 +336,23 @@ class HuvXsection:
                 ):
                     self.surface_attributes[sfc_file]["zone_number"] = i
                     color_list[i] = self.surface_attributes[sfc_file]["color"]
-        well_tvd = well_df["Z_TVDSS"].values.copy()
-        well_rhlen = well_df["R_HLEN"].values.copy()
-        zonevals = well_df[zonelogname].values
         zoneplot = []
-        start = 0
-        zone_transitions = np.where(zonevals[:-1] != zonevals[1:])
-        for transition in zone_transitions:
-            try:
-                well_tvd = np.insert(well_tvd, transition, well_tvd[transition + 1])
-                well_rhlen = np.insert(
-                    well_rhlen, transition, well_rhlen[transition + 1]
-                )
-                zonevals = np.insert(zonevals, transition, zonevals[transition])
-            except IndexError:
-                pass
-        for i in range(1, len(zonevals)):
-            if (not np.isnan(zonevals[i])) and (np.isnan(zonevals[i - 1])):
-                end = i - 1
-                color = "rgb(211,211,211)"
-                zoneplot.append(
-                    {
-                        "x": well_rhlen[start:end],
-                        "y": well_tvd[start:end],
-                        "line": {"width": 4, "color": color},
-                        "name": f"Zone: {zonevals[i-1]}",
-                    }
-                )
-                start = end + 1
-            elif (np.isnan(zonevals[i])) and (not np.isnan(zonevals[i - 1])):
-                end = i - 1
-                color = color_list[int(zonevals[i - 1])]
-                zoneplot.append(
-                    {
-                        "x": well_rhlen[start:end],
-                        "y": well_tvd[start:end],
-                        "line": {"width": 4, "color": color},
-                        "name": f"Zone: {zonevals[i-1]}",
-                    }
-                )
-                start = end + 1
-            elif (
-                (zonevals[i] != zonevals[i - 1])
-                and (not np.isnan(zonevals[i]))
-                and (not np.isnan(zonevals[i - 1]))
-            ):
-                end = i - 1
-                color = color_list[int(zonevals[i - 1])]
-                zoneplot.append(
-                    {
-                        "x": well_rhlen[start:end],
-                        "y": well_tvd[start:end],
-                        "line": {"width": 4, "color": color},
-                        "name": f"Zone: {zonevals[i-1]}",
-                    }
-                )
-                start = end + 1
-        if not np.isnan(zonevals[-1]):
-            end = len(zonevals) - 1
-            color = color_list[int(zonevals[-1])]
-            zoneplot.append(
-                {
-                    "x": well_rhlen[start:end],
-                    "y": well_tvd[start:end],
-                    "line": {"width": 4, "color": color},
-                    "name": f"Zone: {zonevals[-2]}",
-                }
-            )
-        else:
-            color = "rgb(211,211,211)"
+        for zone, rhlen, tvd in get_zone_segments(
+            well_df[zonelogname].values,
+            well_df["R_HLEN"].values,
+            well_df["Z_TVDSS"].values,
+        ):
             zoneplot.append(
                 {
-                    "mode": "markers",
-                    "x": np.array([well_rhlen[-2], well_rhlen[-1]]),
-                    "y": np.array([well_tvd[-2], well_tvd[-1]]),
-                    "marker": {"size": 3, "color": color},
-                    "name": f"Zone: {zonevals[-1]}",
+                    "x": rhlen,
+                    "y": tvd,
+                    "line": {
+                        "width": 4,
+                        "color": "rgb(211,211,211)"
+                        if np.isnan(zone)
+                        else color_list[int(zone)],
+                    },
+                    "name": f"Zone: {zone}",
                 }
             )
         return zoneplot
@@ -1,6 +1,7 @@
 from typing import List, Dict, Optional, Iterable, Tuple
 
 from itertools import chain
+import numpy as np
 import pandas as pd
 from webviz_config.common_cache import CACHE
 
@@ -182,18 +183,30 @@ class SimulationTimeSeriesModel:
             if real_filter is not None
             else dataframe
         )
+        # Realizations are kept as separate traces, as they are colored
+        # individually by parameter value. The traces are split from arrays
+        # sorted by realization instead of grouping the dataframe.
+        sorted_df = dataframe.sort_values("REAL", kind="stable")
+        reals, starts = np.unique(sorted_df["REAL"].to_numpy(), return_index=True)
+        line_shape = self.get_line_shape(vector)
         traces = [
             {
-                "line": {"shape": self.get_line_shape(vector)},
-                "x": list(real_df["DATE"].astype(str)),
-                "y": list(real_df[vector]),
+                "line": {"shape": line_shape},
+                "x": xvals,
+                "y": yvals,
                 "name": ensemble,
                 "customdata": real,
                 "legendgroup": ensemble,
                 "marker": {"color": "red"},
                 "showlegend": real_idx == 0,
             }
-            for real_idx, (real, real_df) in enumerate(dataframe.groupby("REAL"))
+            for real_idx, (real, xvals, yvals) in enumerate(
+                zip(
+                    reals.tolist(),
+                    np.split(sorted_df["DATE"].astype(str).to_numpy(), starts[1:]),
+                    np.split(sorted_df[vector].to_numpy(), starts[1:]),
+                )
+            )
         ]
 
         hist_vecname = historical_vector(vector=vector, smry_meta=self._metadata)
@@ -10,7 +10,7 @@ import pandas as pd
 from plotly.subplots import make_subplots
 import dash
 from dash.exceptions import PreventUpdate
-from dash.dependencies import Input, Output, State
+from dash.dependencies import Input, Output, State, ClientsideFunction
 import dash_html_components as html
 import dash_core_components as dcc
 import webviz_core_components as wcc
@@ -33,16 +33,23 @@ from .._utils.simulation_timeseries import (
     calc_series_statistics,
     add_fanchart_traces,
     add_statistics_traces,
+    create_realizations_trace,
     render_hovertemplate,
     date_to_interval_conversion,
     check_and_format_observations,
+    downsample_realizations,
+    create_vector_selector_data,
 )
+from .._utils.typed_arrays import encode_figure
 from .._utils.unique_theming import unique_colors
 from .._datainput.from_timeseries_cumulatives import (
     calc_from_cumulatives,
     rename_vec_from_cum,
 )
 
+# Plot width in pixels used for downsampling until the actual width is known
+DEFAULT_GRAPH_WIDTH = 1000
+
 
 def _check_plugin_options(options: Optional[dict]) -> Optional[Tuple[str, str]]:
     if options:
@@ -116,6 +123,10 @@ observations/observations.yml).
 per DATE over all realizations in an ensemble, and the available dates should therefore not \
 differ between individual realizations of an ensemble.
 
+?> Individual realizations are downsampled to the width of the plot, keeping the smallest and \
+largest value within each group of consecutive dates. Zooming in on a date range fetches the \
+realizations again at the resolution of the zoomed range.
+
 **Using aggregated data**
 
 The `csvfile` must have columns `ENSEMBLE`, `REAL` and `DATE` in addition to the individual
@@ -177,6 +188,9 @@ folder, to avoid risk of not extracting the right data.
 
         if csvfile:
             self.smry = read_csv(csvfile)
+            # Parse dates once, so that filtering on dates per request is
+            # a numeric comparison
+            self.smry["DATE"] = pd.to_datetime(self.smry["DATE"])
             self.smry_meta = None
             # Check of time_index for data to use in resampling. Quite naive as it only checks for
             # unique values of the DATE column, and not per realization.
@@ -184,9 +198,7 @@ folder, to avoid risk of not extracting the right data.
             # Currently not necessary as we don't allow resampling for average rates and intervals
             # unless we have metadata, which csvfile input currently doesn't support.
             # See: https://github.com/equinor/webviz-subsurface/issues/402
-            self.time_index = pd.infer_freq(
-                sorted(pd.to_datetime(self.smry["DATE"]).unique())
-            )
+            self.time_index = pd.infer_freq(sorted(self.smry["DATE"].unique()))
         elif ensembles:
             self.emodel: EnsembleSetModel = (
                 caching_ensemble_set_model_factory.get_or_create_model(
@@ -217,12 +229,10 @@ folder, to avoid risk of not extracting the right data.
             and historical_vector(c, self.smry_meta, False) not in self.smry.columns
         ]
 
-        self.vector_data: list = []
+        vectors: List[Tuple[str, str]] = []
         for vec in self.smry_cols:
             split = vec.split(":")
-            self._add_vector(
-                self.vector_data, vec, simulation_vector_description(split[0])
-            )
+            vectors.append((vec, simulation_vector_description(split[0])))
 
             if (
                 self.smry_meta is not None
@@ -237,16 +247,19 @@ folder, to avoid risk of not extracting the right data.
                 avgrate_split = avgrate_vec.split(":")
                 interval_split = interval_vec.split(":")
 
-                self._add_vector(
-                    self.vector_data,
-                    avgrate_vec,
-                    f"{simulation_vector_description(avgrate_split[0])} ({avgrate_vec})",
+                vectors.append(
+                    (
+                        avgrate_vec,
+                        f"{simulation_vector_description(avgrate_split[0])} ({avgrate_vec})",
+                    )
                 )
-                self._add_vector(
-                    self.vector_data,
-                    interval_vec,
-                    f"{simulation_vector_description(interval_split[0])} ({interval_vec})",
+                vectors.append(
+                    (
+                        interval_vec,
+                        f"{simulation_vector_description(interval_split[0])} ({interval_vec})",
+                    )
                 )
+        self.vector_data = create_vector_selector_data(vectors)
 
         self.ensembles = list(self.smry["ENSEMBLE"].unique())
         self.theme = webviz_settings.theme
@@ -290,36 +303,6 @@ folder, to avoid risk of not extracting the right data.
         self.allow_delta = len(self.ensembles) > 1
         self.set_callbacks(app)
 
-    @staticmethod
-    def _add_vector(vector_data: list, vector: str, description: str) -> None:
-        split = vector.split(":")
-
-        if next((x for x in vector_data if x["name"] == split[0]), None) is None:
-            vector_data.append(
-                {
-                    "name": split[0],
-                    "description": description,
-                    "children": [],
-                }
-            )
-
-        if len(split) == 2:
-            for x in vector_data:
-                if x["name"] == split[0]:
-                    if (
-                        next(
-                            (y for y in x["children"] if y["name"] == split[1]),
-                            None,
-                        )
-                        is None
-                    ):
-                        x["children"].append(
-                            {
-                                "name": split[1],
-                            }
-                        )
-                    break
-
     @property
     def ens_colors(self) -> dict:
         return unique_colors(self.ensembles, self.theme)
@@ -627,6 +610,9 @@ folder, to avoid risk of not extracting the right data.
                             storage_type="session",
                             data=json.dumps(self.plot_options.get("date", None)),
                         ),
+                        dcc.Store(id=self.uuid("graph-ids"), data=[self.uuid("graph")]),
+                        dcc.Store(id=self.uuid("graph-sizes")),
+                        dcc.Store(id=self.uuid("date-range")),
                     ],
                 ),
             ],
@@ -634,8 +620,21 @@ folder, to avoid risk of not extracting the right data.
 
     # pylint: disable=too-many-statements
     def set_callbacks(self, app: dash.Dash) -> None:
+        app.clientside_callback(
+            ClientsideFunction(
+                namespace="clientside", function_name="get_element_sizes"
+            ),
+            Output(self.uuid("graph-sizes"), "data"),
+            Input(self.uuid("graph"), "relayoutData"),
+            State(self.uuid("graph-ids"), "data"),
+            State(self.uuid("graph-sizes"), "data"),
+        )
+
         @app.callback(
-            Output(self.uuid("graph"), "figure"),
+            [
+                Output(self.uuid("graph"), "figure"),
+                Output(self.uuid("date-range"), "data"),
+            ],
             [
                 Input(self.uuid("vectors"), "selectedNodes"),
                 Input(self.uuid("ensemble"), "value"),
@@ -647,7 +646,10 @@ folder, to avoid risk of not extracting the right data.
                 Input(self.uuid("date"), "data"),
                 Input(self.uuid("trace_options"), "value"),
                 Input(self.uuid("stat_options"), "value"),
+                Input(self.uuid("graph"), "relayoutData"),
+                Input(self.uuid("graph-sizes"), "data"),
             ],
+            [State(self.uuid("date-range"), "data")],
         )
         # pylint: disable=too-many-instance-attributes, too-many-arguments, too-many-locals, too-many-branches
         def _update_graph(
@@ -661,7 +663,10 @@ folder, to avoid risk of not extracting the right data.
             stored_date: str,
             trace_options: List[str],
             stat_options: List[str],
-        ) -> dict:
+            relayout_data: Optional[dict],
+            graph_sizes: Optional[dict],
+            stored_date_range: Optional[List[str]],
+        ) -> Tuple[dict, Optional[List[str]]]:
             """Callback to update all graphs based on selections"""
 
             if not isinstance(ensembles, list):
@@ -670,6 +675,45 @@ folder, to avoid risk of not extracting the right data.
             if calc_mode not in ["ensembles", "delta_ensembles"]:
                 raise PreventUpdate
 
+            # The zoom is kept, and the realizations are refetched for the zoomed
+            # date range, as long as the selections are unchanged. Only the
+            # realizations depend on the zoom and the graph size.
+            triggered = dash.callback_context.triggered[0]["prop_id"]
+            date_range = None
+            if triggered == f"{self.uuid('graph')}.relayoutData":
+                if visualization != "realizations" or not relayout_data:
+                    raise PreventUpdate
+                date_range = get_date_range(relayout_data)
+                if date_range is None and not any(
+                    key.endswith("autorange") for key in relayout_data
+                ):
+                    # E.g. autosize events, or zooming in the histograms, which
+                    # keep the previous date range
+                    raise PreventUpdate
+            elif triggered == f"{self.uuid('graph-sizes')}.data":
+                if visualization != "realizations":
+                    raise PreventUpdate
+                date_range = (
+                    [pd.Timestamp(date) for date in stored_date_range]
+                    if stored_date_range
+                    else None
+                )
+            uirevision = json.dumps(
+                [
+                    vectors,
+                    ensembles,
+                    calc_mode,
+                    base_ens,
+                    delta_ens,
+                    visualization,
+                    cum_interval,
+                    stored_date,
+                    trace_options,
+                    stat_options,
+                ]
+            )
+            graph_width = ((graph_sizes or {}).get(self.uuid("graph")) or [None])[0]
+
             if vectors is None:
                 vectors = self.plot_options.get("vectors", [self.smry_cols[0]])
 
@@ -731,6 +775,9 @@ folder, to avoid risk of not extracting the right data.
                 visualization=visualization,
                 time_index=self.time_index,
                 cum_interval=cum_interval,
+                delta_rows=get_cached_delta_rows(self.smry, base_ens, delta_ens)
+                if calc_mode == "delta_ensembles"
+                else None,
             )
 
             for i, vector in enumerate(vectors):
@@ -766,6 +813,8 @@ folder, to avoid risk of not extracting the right data.
                         colors=self.ens_colors,
                         line_shape=line_shape,
                         interval=cum_interval,
+                        max_points=2 * (graph_width or DEFAULT_GRAPH_WIDTH),
+                        date_range=date_range,
                     )
                 else:
                     raise PreventUpdate
@@ -815,6 +864,7 @@ folder, to avoid risk of not extracting the right data.
                 barmode="overlay",
                 bargap=0.01,
                 bargroupgap=0.2,
+                uirevision=uirevision,
             )
             fig["layout"] = self.theme.create_themed_layout(fig["layout"])
 
@@ -829,7 +879,10 @@ folder, to avoid risk of not extracting the right data.
                 if "xaxis6" in fig["layout"]:
                     fig["layout"]["xaxis6"]["matches"] = None
                     fig["layout"]["xaxis6"]["showticklabels"] = True
-            return fig
+            return (
+                encode_figure(fig),
+                [str(date) for date in date_range] if date_range else None,
+            )
 
         @app.callback(
             self.plugin_data_output,
@@ -879,6 +932,9 @@ folder, to avoid risk of not extracting the right data.
                 visualization=visualization,
                 time_index=self.time_index,
                 cum_interval=cum_interval,
+                delta_rows=get_cached_delta_rows(self.smry, base_ens, delta_ens)
+                if calc_mode == "delta_ensembles"
+                else None,
             )
             for vector, df in dfs.items():
                 if visualization in ["fanchart", "statistics"]:
@@ -1007,9 +1063,13 @@ def calculate_vector_dataframes(
     visualization: str,
     time_index: str,
     cum_interval: str,
+    delta_rows: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> dict:
+    """In delta mode, delta_rows are the aligned rows of the two ensembles in
+    smry from `get_delta_rows`, used for vectors that are not calculated"""
     dfs = {}
     for vector in vectors:
+        calculated = vector.startswith(("AVG_", "INTVL_"))
         if vector.startswith("AVG_"):
             total_vector = f"{vector[4:7] + vector[7:].replace('R', 'T', 1)}"
             data = filter_df(smry, ensembles, total_vector, smry_meta, calc_mode)
@@ -1031,10 +1091,14 @@ def calculate_vector_dataframes(
                 time_index_input=time_index,
                 as_rate=False,
             )
+        elif calc_mode == "delta_ensembles":
+            data = calculate_delta(
+                smry, ensembles[0], ensembles[1], vectors=[vector], rows=delta_rows
+            )
         else:
             data = filter_df(smry, ensembles, vector, smry_meta, calc_mode)
 
-        if calc_mode == "delta_ensembles":
+        if calc_mode == "delta_ensembles" and calculated:
             data = calculate_delta(data, ensembles[0], ensembles[1])
 
         dfs[vector] = {"data": data}
@@ -1057,7 +1121,10 @@ def filter_df(
     calc_mode: str,
 ) -> pd.DataFrame:
     """Filter dataframe for current vector. Include history
-    vector if present"""
+    vector if present, undefined for future dates.
+
+    Only the rows of the selected ensembles are copied, and future dates are
+    found by comparing the parsed dates directly."""
     columns = ["REAL", "ENSEMBLE", "DATE", vector]
     historical_vector_name = historical_vector(vector=vector, smry_meta=smry_meta)
     if (
@@ -1066,30 +1133,69 @@ def filter_df(
         and not "delta" in calc_mode
     ):
         columns.append(historical_vector_name)
-    fdf = df[columns].copy()
+    fdf = df.loc[df["ENSEMBLE"].isin(ensembles).to_numpy(), columns]
     if historical_vector_name in fdf.columns:
         fdf.loc[
-            fdf["DATE"].astype("str") > str(datetime.datetime.now()),
-            historical_vector_name,
+            (fdf["DATE"] > datetime.datetime.now()).to_numpy(), historical_vector_name
         ] = np.nan
-    return fdf.loc[fdf["ENSEMBLE"].isin(ensembles)]
+    return fdf
+
+
+def get_delta_rows(
+    df: pd.DataFrame, base_ens: str, delta_ens: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the rows (positions) in df of the base and the delta ensemble for
+    each (DATE, REAL) that is present in both ensembles, sorted by DATE and REAL"""
+    ensembles = df["ENSEMBLE"].to_numpy()
+    base_rows = np.flatnonzero(ensembles == base_ens)
+    delta_rows = np.flatnonzero(ensembles == delta_ens)
+    rows = (
+        df[["DATE", "REAL"]]
+        .iloc[base_rows]
+        .assign(BASE_ROW=base_rows)
+        .merge(
+            df[["DATE", "REAL"]].iloc[delta_rows].assign(DELTA_ROW=delta_rows),
+            on=["DATE", "REAL"],
+        )
+        .sort_values(["DATE", "REAL"], kind="stable")
+    )
+    return rows["BASE_ROW"].to_numpy(), rows["DELTA_ROW"].to_numpy()
 
 
-def calculate_delta(df: pd.DataFrame, base_ens: str, delta_ens: str) -> pd.DataFrame:
-    """Calculate delta between two ensembles"""
-    base_df = (
-        df.loc[df["ENSEMBLE"] == base_ens]
-        .set_index(["DATE", "REAL"])
-        .drop("ENSEMBLE", axis=1)
+@CACHE.memoize(timeout=CACHE.TIMEOUT)
+def get_cached_delta_rows(
+    df: pd.DataFrame, base_ens: str, delta_ens: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """`get_delta_rows`, computed once per summary data and pair of ensembles"""
+    return get_delta_rows(df, base_ens, delta_ens)
+
+
+def calculate_delta(
+    df: pd.DataFrame,
+    base_ens: str,
+    delta_ens: str,
+    vectors: Optional[List[str]] = None,
+    rows: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> pd.DataFrame:
+    """Calculate delta between two ensembles for the given vectors (default all),
+    for each (DATE, REAL) where both ensembles have values. The aligned rows of
+    the ensembles may be given, e.g. precomputed with `get_delta_rows`"""
+    if vectors is None:
+        vectors = [col for col in df.columns if col not in ["ENSEMBLE", "DATE", "REAL"]]
+    base_rows, delta_rows = (
+        rows if rows is not None else get_delta_rows(df, base_ens, delta_ens)
     )
-    delta_df = (
-        df.loc[df["ENSEMBLE"] == delta_ens]
-        .set_index(["DATE", "REAL"])
-        .drop("ENSEMBLE", axis=1)
+    values = [df[vector].to_numpy(dtype=np.float64) for vector in vectors]
+    delta = np.column_stack([val[base_rows] - val[delta_rows] for val in values])
+    defined = ~np.isnan(delta).any(axis=1)
+    return pd.DataFrame(
+        {
+            "DATE": df["DATE"].to_numpy()[base_rows[defined]],
+            "REAL": df["REAL"].to_numpy()[base_rows[defined]],
+            **{vector: delta[defined, idx] for idx, vector in enumerate(vectors)},
+            "ENSEMBLE": f"({base_ens}) - ({delta_ens})",
+        }
     )
-    dframe = base_df.sub(delta_df).reset_index()
-    dframe["ENSEMBLE"] = f"({base_ens}) - ({delta_ens})"
-    return dframe.dropna(axis=0, how="any")
 
 
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
@@ -1101,11 +1207,10 @@ def add_histogram_traces(
     interval: str,
 ) -> List[dict]:
     """Renders a histogram trace per ensemble for a given date"""
-    dframe[("DATE")] = dframe[("DATE")].astype(str)
     date = date_to_interval_conversion(
         date=date, vector=vector, interval=interval, as_date=True
     )
-    data = dframe.loc[dframe[("DATE")] == date]
+    data = dframe.loc[(dframe["DATE"] == pd.Timestamp(date)).to_numpy()]
 
     return [
         {
@@ -1143,25 +1248,53 @@ def add_observation_trace(obs: dict) -> List[dict]:
     ]
 
 
+def get_date_range(relayout_data: Optional[dict]) -> Optional[list]:
+    """Returns the zoomed date range from a relayout event, or None if the
+    time series are not zoomed. The histograms have numeric x axes, and are
+    not considered."""
+    relayout_data = relayout_data or {}
+    for key, value in relayout_data.items():
+        if key.startswith("xaxis") and key.endswith(".range[0]"):
+            date_range = [value, relayout_data[key.replace("[0]", "[1]")]]
+        elif key.startswith("xaxis") and key.endswith(".range"):
+            date_range = value
+        else:
+            continue
+        if all(isinstance(date, str) for date in date_range):
+            try:
+                return [pd.Timestamp(date) for date in date_range]
+            except ValueError:
+                return None
+    return None
+
+
+# pylint: disable=too-many-arguments
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
 def add_realization_traces(
-    dframe: pd.DataFrame, vector: str, colors: dict, line_shape: str, interval: str
+    dframe: pd.DataFrame,
+    vector: str,
+    colors: dict,
+    line_shape: str,
+    interval: str,
+    max_points: int,
+    date_range: Optional[list] = None,
 ) -> List[dict]:
-    """Renders line trace for each realization, includes history line if present"""
+    """Renders one line trace per ensemble, containing all its realizations.
+    The realizations are downsampled to about max_points samples each, e.g.
+    twice the plot width in pixels, after cropping to date_range if given."""
     hovertemplate = render_hovertemplate(vector, interval)
     return [
-        {
-            "line": {"shape": line_shape},
-            "x": list(real_df["DATE"]),
-            "y": list(real_df[vector]),
-            "hovertemplate": f"{hovertemplate}Realization: {real}, Ensemble: {ensemble}",
-            "name": ensemble,
-            "legendgroup": ensemble,
-            "marker": {"color": colors.get(ensemble, colors[list(colors.keys())[0]])},
-            "showlegend": real_no == 0,
-        }
-        for ens_no, (ensemble, ens_df) in enumerate(dframe.groupby("ENSEMBLE"))
-        for real_no, (real, real_df) in enumerate(ens_df.groupby("REAL"))
+        create_realizations_trace(
+            downsample_realizations(ens_df, vector, max_points, date_range),
+            vector,
+            name=ensemble,
+            color=colors.get(ensemble, colors[list(colors.keys())[0]]),
+            line_shape=line_shape,
+            hovertemplate=(
+                f"{hovertemplate}Realization: %{{customdata}}, Ensemble: {ensemble}"
+            ),
+        )
+        for ensemble, ens_df in dframe.groupby("ENSEMBLE")
     ]
 
 
@@ -1,5 +1,5 @@
 # pylint: disable=too-many-lines
-from typing import Optional, List, Tuple, Callable, Union, Any
+from typing import Optional, Dict, List, Tuple, Callable, Union, Any
 from pathlib import Path
 import fnmatch
 import warnings
@@ -9,6 +9,7 @@ from copy import deepcopy
 import yaml
 import numpy as np
 import pandas as pd
+import scipy.sparse
 import dash
 from dash_table import DataTable
 import dash_html_components as html
@@ -37,6 +38,8 @@ from .._utils.unique_theming import unique_colors
 from .._utils.simulation_timeseries import (
     set_simulation_line_shape_fallback,
     get_simulation_line_shape,
+    create_realizations_trace,
+    group_values_to_dense,
 )
 from .._utils.colors import hex_to_rgba
 
@@ -227,6 +230,7 @@ folder, to avoid risk of not extracting the right data.
         self.fip_arrays = list(
             {simulation_region_vector_breakdown(col)[1] for col in self.smry_cols}
         )
+        self.region_vectors = RegionVectorBlocks(self.smry)
         self.set_callbacks(app)
 
     @property
@@ -648,7 +652,7 @@ folder, to avoid risk of not extracting the right data.
                 vector_base = vector
             try:
                 df, ref_vector = filter_and_aggregate_vectors(
-                    smry=self.smry,
+                    region_vectors=self.region_vectors,
                     ensembles=ensembles,
                     groupby=groupby,
                     vector=vector_base,
@@ -1047,9 +1051,96 @@ def render_table(
     )
 
 
+class RegionVectorBlocks:
+    """Region vectors of the summary data, arranged in one dense float32 block
+    per base vector and FIP array (e.g. ROIP:1, ROIP:2, ... for ROIP and FIPNUM),
+    with one row per row of the summary data. Any aggregation of regions into
+    groups is then a single sparse matrix product with the rows of the selected
+    ensembles, instead of summing DataFrame columns per group. The blocks are
+    created on first use, and kept for the lifetime of the plugin.
+    """
+
+    def __init__(self, smry: pd.DataFrame) -> None:
+        self._smry = smry
+        self._ensemble_rows = smry.groupby("ENSEMBLE").indices
+        self._blocks: Dict[Tuple[str, str], Tuple[Dict[str, int], np.ndarray]] = {}
+
+    def get_block(self, vector: str, fip: str) -> Tuple[Dict[str, int], np.ndarray]:
+        """Returns the column of each region vector in the block, and the block"""
+        if (vector, fip) not in self._blocks:
+            prefix = simulation_region_vector_recompose(
+                vector_base_name=vector, fiparray=fip, node=""
+            )
+            columns = [col for col in self._smry.columns if col.startswith(prefix)]
+            # Undefined values are skipped, as in DataFrame.sum
+            block = np.nan_to_num(self._smry[columns].to_numpy(dtype=np.float32))
+            self._blocks[(vector, fip)] = (
+                {col: idx for idx, col in enumerate(columns)},
+                block,
+            )
+        return self._blocks[(vector, fip)]
+
+    def get_rows(self, ensembles: list) -> Union[slice, np.ndarray]:
+        """Returns the rows of the given ensembles in the summary data, as a
+        slice when they are contiguous"""
+        rows = np.sort(
+            np.concatenate(
+                [np.zeros(0, dtype=np.int64)]
+                + [
+                    self._ensemble_rows[ens]
+                    for ens in ensembles
+                    if ens in self._ensemble_rows
+                ]
+            )
+        )
+        if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+            return slice(rows[0], rows[-1] + 1)
+        return rows
+
+    def aggregate(
+        self, ensembles: list, vector: str, fip: str, groups: Dict[str, List[str]]
+    ) -> pd.DataFrame:
+        """Returns ENSEMBLE, REAL and DATE for the rows of the given ensembles,
+        and the sum of the region vectors in each group"""
+        column_of_vector, block = self.get_block(vector, fip)
+        missing = [
+            vec
+            for vectors in groups.values()
+            for vec in vectors
+            if vec not in column_of_vector
+        ]
+        if missing:
+            raise KeyError(missing)
+        # Sparse (region vectors x groups) matrix, marking the vectors in each group
+        columns = [
+            column_of_vector[vec] for vectors in groups.values() for vec in vectors
+        ]
+        group_idx = np.repeat(
+            np.arange(len(groups)), [len(vectors) for vectors in groups.values()]
+        )
+        matrix = scipy.sparse.csr_matrix(
+            (np.ones(len(columns), dtype=np.float32), (columns, group_idx)),
+            shape=(block.shape[1], len(groups)),
+        )
+
+        rows = self.get_rows(ensembles)
+        df = self._smry[["ENSEMBLE", "REAL", "DATE"]].iloc[rows]
+        return pd.concat(
+            [
+                df,
+                pd.DataFrame(
+                    np.asarray(block[rows] @ matrix, dtype=np.float64),
+                    index=df.index,
+                    columns=[f"AGG_{vector}_filtered_on_{group}" for group in groups],
+                ),
+            ],
+            axis=1,
+        )
+
+
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
 def filter_and_aggregate_vectors(
-    smry: pd.DataFrame,
+    region_vectors: RegionVectorBlocks,
     ensembles: list,
     groupby: str,
     vector: str,
@@ -1064,7 +1155,6 @@ def filter_and_aggregate_vectors(
     """
     if groupby != "ENSEMBLE" and len(ensembles) > 1:  # This should never happen
         raise ValueError("Cannot have multiple ensembles unless you group by ensemble")
-    df = smry[smry["ENSEMBLE"].isin(ensembles)]
     if fipdesc is None or fip not in fipdesc["FIP"].values:
         if groupby == "ENSEMBLE":
             nodes = filters
@@ -1087,26 +1177,18 @@ def filter_and_aggregate_vectors(
         for subgroup, values in nodes.items()
     }
     # Storing a full vector name that exists in the dataset to be used for metadata
-    ref_vector = ""
-    for _, vector_list in subgroup_vectors.items():
-        for vec in vector_list:
-            if vec in smry.columns:
-                ref_vector = vec
-                break
-        else:
-            continue
-        break
-
-    # Aggregate, concatenate and return.
-    return (
-        pd.concat(
-            [df[["ENSEMBLE", "REAL", "DATE"]]]
-            + [
-                df[vectors].sum(axis=1).to_frame(f"AGG_{vector}_filtered_on_{subgroup}")
-                for subgroup, vectors in subgroup_vectors.items()
-            ],
-            axis=1,
+    column_of_vector, _ = region_vectors.get_block(vector, fip)
+    ref_vector = next(
+        (
+            vec
+            for vectors in subgroup_vectors.values()
+            for vec in vectors
+            if vec in column_of_vector
         ),
+        "",
+    )
+    return (
+        region_vectors.aggregate(ensembles, vector, fip, subgroup_vectors),
         ref_vector,
     )
 
@@ -1146,11 +1228,15 @@ def get_nodes(groupby: str, fipdesc: pd.DataFrame, fip: str, filters: dict) -> d
     return nodes
 
 
-# TODO(Sigurd) What is the correct return type of this function? numpy.ndarray?
-def calc_real_recovery(df: pd.DataFrame, agg_vectors: List[str]):  # type: ignore
-    first = df[agg_vectors].values[0]
-    with np.errstate(invalid="ignore"):
-        return (first - df[agg_vectors].values) / first
+def calc_real_recovery(df: pd.DataFrame, agg_vectors: List[str]) -> np.ndarray:
+    """Recovery of the aggregated vectors relative to the first row of each
+    realization, for all ensembles and realizations at once"""
+    values = df[agg_vectors].to_numpy(dtype=np.float64)
+    real_ids = df.groupby(["ENSEMBLE", "REAL"], sort=False).ngroup().to_numpy()
+    _, first_rows = np.unique(real_ids, return_index=True)
+    first = values[first_rows[real_ids]]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (first - values) / first
 
 
 # pylint: disable=too-many-arguments, too-many-locals, unused-argument
@@ -1167,89 +1253,97 @@ def per_real_calculations(
     visualization: str,
     line_shape: str,
 ) -> tuple:
-    """All calls that are per realization are called here to avoid multiple loops:
-    That includes calculation of recovery and making traces per realization.
+    """All calculations that are per realization are done here:
+    That includes calculation of recovery and making traces of the realizations,
+    with one trace per ensemble and aggregated vector.
     This method assumes that the DataFrame 'df' has already been processed with
     the 'filter_and_aggregate_vectors' method.
     """
     if groupby != "ENSEMBLE" and len(ensembles) > 1:  # This should never happen
         raise ValueError("Cannot have multiple ensembles unless you group by ensemble")
-    traces = []
-    ens_dfs = []
     # Find aggregated vectors
-    agg_vectors = df.columns[df.columns.str.contains("AGG_.*")]
+    agg_vectors = list(df.columns[df.columns.str.contains("AGG_.*")])
     # Subgroups from aggregated vector names to be used for e.g. legend.
     groupby_names = [
         agg_vector.split("_filtered_on_")[-1] for agg_vector in agg_vectors
     ]
-    # Make recovery vector names if relevant
+    plot_vectors = agg_vectors
     if mode == "rec":
-        rec_vectors = ["REC" + vec[3:] for vec in agg_vectors]
-    # Iterate over ensembles and realizations
-    for ens, ens_df in df.groupby("ENSEMBLE"):
-        ens_rec = []
-        if mode == "rec" and ens not in rec_ensembles:
-            continue
-        for real_no, (real, real_df) in enumerate(ens_df.groupby("REAL")):
-            if mode == "rec":
-                rec = calc_real_recovery(real_df, agg_vectors)
-                ens_rec.extend(rec)
+        rec_df = df[df["ENSEMBLE"].isin(rec_ensembles)]
+        if rec_df.empty:
+            return ([], df)
+        # We want to store calculated recovery for statistical graphs and tables
+        plot_vectors = ["REC" + vec[3:] for vec in agg_vectors]
+        df = pd.concat(
+            [
+                rec_df,
+                pd.DataFrame(
+                    calc_real_recovery(rec_df, agg_vectors),
+                    index=rec_df.index,
+                    columns=plot_vectors,
+                ),
+            ],
+            axis=1,
+        )
+        df = df.sort_values("ENSEMBLE", kind="stable", ignore_index=True)
 
-            if visualization == "realizations":
-                for i, vec in enumerate(agg_vectors):
-                    name = ens if groupby == "ENSEMBLE" else groupby_names[i]
-                    traces.append(
-                        {
-                            "x": real_df["DATE"],
-                            "y": rec[:, i] if mode == "rec" else real_df[vec],
-                            "hovertext": (
-                                f"{groupby.lower().capitalize()}: {name} "
-                                + f"Realization: {real}"
-                            ),
-                            "name": name,
-                            "legendgroup": name,
-                            "marker": {"color": groupby_colors[groupby][name]},
-                            "showlegend": real_no == 0,
-                            "line": {"shape": line_shape},
-                        }
-                    )
-        if mode == "rec":
-            # We want to store calculated recovery for statistical graphs and tables
-            ens_dfs.append(
-                pd.concat(
-                    [
-                        ens_df.reset_index(drop=True),
-                        pd.DataFrame(ens_rec, columns=rec_vectors).reset_index(
-                            drop=True
+    traces = []
+    if visualization == "realizations":
+        for ens, ens_df in df.groupby("ENSEMBLE"):
+            for plot_vector, groupby_name in zip(plot_vectors, groupby_names):
+                name = ens if groupby == "ENSEMBLE" else groupby_name
+                traces.append(
+                    create_realizations_trace(
+                        ens_df,
+                        plot_vector,
+                        name=name,
+                        color=groupby_colors[groupby][name],
+                        line_shape=line_shape,
+                        hovertemplate=(
+                            "(%{x}, %{y})<br>"
+                            f"{groupby.lower().capitalize()}: {name} "
+                            "Realization: %{customdata}"
                         ),
-                    ],
-                    axis=1,
+                    )
                 )
-            )
-    # Concat ensemble dfs with calculated recovery
-    if ens_dfs:
-        df = pd.concat(ens_dfs, ignore_index=True)
     return (traces, df)
 
 
 def calc_statistics(df: pd.DataFrame) -> pd.DataFrame:
-    # Switched P10 and P90 due to convention in petroleum industry
-    def p10(x: np.ndarray) -> float:
-        return np.nanpercentile(x, q=90)
-
-    def p90(x: np.ndarray) -> float:
-        return np.nanpercentile(x, q=10)
-
-    stat_dfs = []
-    for ens, ens_df in df.groupby("ENSEMBLE"):
-        stat_dfs.append(
-            ens_df.drop(columns=["REAL", "ENSEMBLE"])
-            .groupby("DATE", as_index=False)
-            .agg([np.nanmean, np.nanstd, np.nanmin, np.nanmax, p10, p90])
-            .reset_index()
-            .assign(ENSEMBLE=ens)
-        )
-    return pd.concat(stat_dfs)
+    """Statistics of all vectors per ensemble and date, computed for all
+    ensembles in one pass over a dense (ensembles x dates, realizations,
+    vectors) array"""
+    vectors = [
+        col
+        for col in df.columns
+        if col not in ReservoirSimulationTimeSeriesRegional.ENSEMBLE_COLUMNS
+    ]
+    keys, dense = group_values_to_dense(df, ["ENSEMBLE", "DATE"], vectors)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        # Switched P10 and P90 due to convention in petroleum industry
+        percentiles = np.nanpercentile(dense, q=[90, 10], axis=1)
+        statistics = {
+            "nanmean": np.nanmean(dense, axis=1),
+            "nanstd": np.nanstd(dense, axis=1, ddof=1),
+            "nanmin": np.nanmin(dense, axis=1),
+            "nanmax": np.nanmax(dense, axis=1),
+            "p10": percentiles[0],
+            "p90": percentiles[1],
+        }
+    stat_df = pd.DataFrame(
+        {
+            ("DATE", ""): keys.get_level_values("DATE"),
+            **{
+                (vector, stat): values[:, idx]
+                for idx, vector in enumerate(vectors)
+                for stat, values in statistics.items()
+            },
+            ("ENSEMBLE", ""): keys.get_level_values("ENSEMBLE"),
+        }
+    )
+    stat_df.columns = pd.MultiIndex.from_tuples(stat_df.columns)
+    return stat_df
 
 
 def add_statistic_traces(
@@ -1,21 +1,27 @@
-from typing import List, Dict, Any, Union, Tuple, Callable
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable
 import json
 from uuid import uuid4
 from pathlib import Path
 
 import dash
 from dash.exceptions import PreventUpdate
-from dash.dependencies import Input, Output, State
+from dash.dependencies import Input, Output, State, ClientsideFunction
 import dash_html_components as html
 import dash_core_components as dcc
 import webviz_core_components as wcc
 from webviz_config import WebvizPluginABC
 from webviz_config import WebvizSettings
 from webviz_config.webviz_store import webvizstore
+from webviz_config.webviz_assets import WEBVIZ_ASSETS
 from webviz_config.utils import calculate_slider_step
 import numpy as np
 
-from .._datainput.seismic import load_cube_data, get_iline, get_xline, get_zslice
+import webviz_subsurface
+from .._datainput.seismic import load_cube, get_iline, get_xline, get_zslice
+from .._utils.decimation import crop_section, decimate_section
+
+# Used for decimation until the client has reported the size of the graphs
+DEFAULT_GRAPH_SIZE = (1000, 400)
 
 
 class SegyViewer(WebvizPluginABC):
@@ -30,6 +36,9 @@ The plots are linked and updates are done by clicking in the plots.
 * **`colors`:** List of hex colors use. \
 Note that apostrophies should be used to avoid that hex colors are read as comments. E.g. \
 `'#000000'` for black.
+* **`decimation`:** How sections larger than the plot are reduced before being sent to \
+the browser, either `maxabs` (keep the largest amplitude, default), `rms` or `stride`. \
+Full resolution is shown when zooming in.
 
 ---
 
@@ -48,11 +57,13 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
         segyfiles: List[Path],
         zunit: str = "depth (m)",
         colors: list = None,
+        decimation: str = "maxabs",
     ):
 
         super().__init__()
 
         self.zunit = zunit
+        self.decimation = decimation
         self.segyfiles: List[str] = [str(segy) for segy in segyfiles]
         self.initial_colors = (
             colors
@@ -77,19 +88,25 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
         self.init_state.get("uirevision", str(uuid4()))
 
         self.plotly_theme = webviz_settings.theme.plotly_theme
+        WEBVIZ_ASSETS.add(
+            Path(webviz_subsurface.__file__).parent
+            / "_assets"
+            / "js"
+            / "clientside_functions.js"
+        )
         self.set_callbacks(app)
 
     def update_state(self, cubepath: str, **kwargs: Any) -> Dict[str, Any]:
-        cube = load_cube_data(get_path(cubepath))
+        cube = load_cube(get_path(cubepath))
         state = {
             "cubepath": cubepath,
             "iline": int(cube.ilines[int(len(cube.ilines) / 2)]),
             "xline": int(cube.xlines[int(len(cube.xlines) / 2)]),
             "zslice": float(cube.zslices[int(len(cube.zslices) / 2)]),
-            "min_value": float(f"{round(cube.values.min(), 2):2f}"),
-            "max_value": float(f"{round(cube.values.max(), 2):2f}"),
-            "color_min_value": float(f"{round(cube.values.min(), 2):2f}"),
-            "color_max_value": float(f"{round(cube.values.max(), 2):2f}"),
+            "min_value": float(f"{round(cube.value_min, 2):2f}"),
+            "max_value": float(f"{round(cube.value_max, 2):2f}"),
+            "color_min_value": float(f"{round(cube.value_min, 2):2f}"),
+            "color_max_value": float(f"{round(cube.value_max, 2):2f}"),
             "uirevision": str(uuid4()),
             "colorscale": self.initial_colors,
         }
@@ -248,12 +265,45 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
                         storage_type="session",
                         data=json.dumps(self.init_state),
                     ),
+                    dcc.Store(
+                        id=self.uuid("graph-ids"),
+                        data=[
+                            self.uuid("inline"),
+                            self.uuid("xline"),
+                            self.uuid("zslice"),
+                        ],
+                    ),
+                    dcc.Store(id=self.uuid("graph-sizes")),
                 ]
             ),
         )
 
+    def display_settings(
+        self, graph: str, graph_sizes: Optional[dict], relayout_data: Optional[dict]
+    ) -> Dict[str, Any]:
+        """Returns the arguments to `make_heatmap` controlling decimation
+        for a graph"""
+        size = (graph_sizes or {}).get(self.uuid(graph)) or DEFAULT_GRAPH_SIZE
+        return {
+            "display_size": (size[1], size[0]),
+            "view_range": get_view_range(relayout_data),
+            "decimation": self.decimation,
+        }
+
     # pylint: disable=too-many-statements
     def set_callbacks(self, app: dash.Dash) -> None:
+        app.clientside_callback(
+            ClientsideFunction(
+                namespace="clientside", function_name="get_element_sizes"
+            ),
+            Output(self.uuid("graph-sizes"), "data"),
+            Input(self.uuid("inline"), "relayoutData"),
+            Input(self.uuid("xline"), "relayoutData"),
+            Input(self.uuid("zslice"), "relayoutData"),
+            State(self.uuid("graph-ids"), "data"),
+            State(self.uuid("graph-sizes"), "data"),
+        )
+
         @app.callback(
             Output(self.uuid("state-storage"), "data"),
             [
@@ -322,14 +372,22 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
 
         @app.callback(
             Output(self.uuid("zslice"), "figure"),
-            [Input(self.uuid("state-storage"), "data")],
+            [
+                Input(self.uuid("state-storage"), "data"),
+                Input(self.uuid("graph-sizes"), "data"),
+                Input(self.uuid("zslice"), "relayoutData"),
+            ],
         )
-        def _set_zslice(state_data_str: Union[str, None]) -> dict:
+        def _set_zslice(
+            state_data_str: Union[str, None],
+            graph_sizes: Optional[dict],
+            relayout_data: Optional[dict],
+        ) -> dict:
             """Updates z-slice heatmap"""
-            if not state_data_str:
+            if not state_data_str or ignore_relayout(relayout_data):
                 raise PreventUpdate
             state = json.loads(state_data_str)
-            cube = load_cube_data(get_path(state["cubepath"]))
+            cube = load_cube(get_path(state["cubepath"]))
             shapes = [
                 {
                     "type": "line",
@@ -349,11 +407,13 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
                 },
             ]
 
-            zslice_arr = get_zslice(cube, state["zslice"])
+            zslice_arr = get_zslice(get_path(state["cubepath"]), state["zslice"])
 
             fig = make_heatmap(
                 zslice_arr,
                 self.plotly_theme,
+                xaxis=cube.ilines,
+                yaxis=cube.xlines,
                 showscale=True,
                 text=str(state["zslice"]),
                 title=f'Zslice {state["zslice"]} ({self.zunit})',
@@ -364,6 +424,7 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
                 zmax=state["color_max_value"],
                 colorscale=state["colorscale"],
                 uirevision=state["uirevision"],
+                **self.display_settings("zslice", graph_sizes, relayout_data),
             )
             fig["layout"]["shapes"] = shapes
             fig["layout"]["xaxis"].update({"constrain": "domain"})
@@ -372,14 +433,22 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
 
         @app.callback(
             Output(self.uuid("inline"), "figure"),
-            [Input(self.uuid("state-storage"), "data")],
+            [
+                Input(self.uuid("state-storage"), "data"),
+                Input(self.uuid("graph-sizes"), "data"),
+                Input(self.uuid("inline"), "relayoutData"),
+            ],
         )
-        def _set_iline(state_data_str: Union[str, None]) -> dict:
+        def _set_iline(
+            state_data_str: Union[str, None],
+            graph_sizes: Optional[dict],
+            relayout_data: Optional[dict],
+        ) -> dict:
             """Updates inline heatmap"""
-            if not state_data_str:
+            if not state_data_str or ignore_relayout(relayout_data):
                 raise PreventUpdate
             state = json.loads(state_data_str)
-            cube = load_cube_data(get_path(state["cubepath"]))
+            cube = load_cube(get_path(state["cubepath"]))
             shapes = [
                 {
                     "type": "line",
@@ -398,7 +467,7 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
                     "line": {"width": 1, "dash": "dot"},
                 },
             ]
-            iline_arr = get_iline(cube, state["iline"])
+            iline_arr = get_iline(get_path(state["cubepath"]), state["iline"])
 
             fig = make_heatmap(
                 iline_arr,
@@ -412,20 +481,29 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
                 zmax=state["color_max_value"],
                 colorscale=state["colorscale"],
                 uirevision=state["uirevision"],
+                **self.display_settings("inline", graph_sizes, relayout_data),
             )
             fig["layout"]["shapes"] = shapes
             return fig
 
         @app.callback(
             Output(self.uuid("xline"), "figure"),
-            [Input(self.uuid("state-storage"), "data")],
+            [
+                Input(self.uuid("state-storage"), "data"),
+                Input(self.uuid("graph-sizes"), "data"),
+                Input(self.uuid("xline"), "relayoutData"),
+            ],
         )
-        def _set_xline(state_data_str: Union[str, None]) -> dict:
+        def _set_xline(
+            state_data_str: Union[str, None],
+            graph_sizes: Optional[dict],
+            relayout_data: Optional[dict],
+        ) -> dict:
             """Update xline heatmap"""
-            if not state_data_str:
+            if not state_data_str or ignore_relayout(relayout_data):
                 raise PreventUpdate
             state = json.loads(state_data_str)
-            cube = load_cube_data(get_path(state["cubepath"]))
+            cube = load_cube(get_path(state["cubepath"]))
             shapes = [
                 {
                     "type": "line",
@@ -444,7 +522,7 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
                     "line": {"width": 1, "dash": "dot"},
                 },
             ]
-            xline_arr = get_xline(cube, state["xline"])
+            xline_arr = get_xline(get_path(state["cubepath"]), state["xline"])
             fig = make_heatmap(
                 xline_arr,
                 self.plotly_theme,
@@ -457,6 +535,7 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
                 zmax=state["color_max_value"],
                 colorscale=state["colorscale"],
                 uirevision=state["uirevision"],
+                **self.display_settings("xline", graph_sizes, relayout_data),
             )
             fig["layout"]["shapes"] = shapes
             return fig
@@ -515,8 +594,17 @@ def make_heatmap(
     title: str = None,
     yaxis_title: str = None,
     xaxis_title: str = None,
+    display_size: Optional[Tuple[int, int]] = None,
+    view_range: Optional[Dict[str, List[float]]] = None,
+    decimation: str = "stride",
 ) -> Dict[str, Any]:
-    """Createst heatmap plot"""
+    """Createst heatmap plot.
+
+    If display_size is given as (rows, columns), the section is decimated to
+    that size. If view_range is given as the zoomed x and/or y range, a second
+    heatmap with the section at display resolution within the zoomed range is
+    added on top.
+    """
     colors = (
         [[i / (len(colorscale) - 1), color] for i, color in enumerate(colorscale)]
         if colorscale
@@ -537,26 +625,67 @@ def make_heatmap(
             "xaxis": {"title": xaxis_title},
         }
     )
+    xaxis = np.arange(arr.shape[1]) if xaxis is None else np.asarray(xaxis)
+    yaxis = np.arange(arr.shape[0]) if yaxis is None else np.asarray(yaxis)
+
+    sections = [(arr, xaxis, yaxis)]
+    if display_size is not None:
+        sections = [decimate_section(arr, xaxis, yaxis, display_size, decimation)]
+        if view_range is not None:
+            zoomed = crop_section(
+                arr, xaxis, yaxis, view_range.get("x"), view_range.get("y")
+            )
+            if zoomed[0].size > 0 and zoomed[0].shape != arr.shape:
+                sections.append(decimate_section(*zoomed, display_size, decimation))
 
     return {
         "data": [
             {
                 "type": "heatmap",
                 "text": text if text else None,
-                "z": arr.tolist(),
-                "x": xaxis,
-                "y": yaxis,
+                "z": values.tolist(),
+                "x": x.tolist(),
+                "y": y.tolist(),
                 "zsmooth": "best",
-                "showscale": showscale,
+                "showscale": showscale and idx == 0,
                 "colorscale": colors,
                 "zmin": zmin,
                 "zmax": zmax,
             }
+            for idx, (values, x, y) in enumerate(sections)
         ],
         "layout": layout,
     }
 
 
+def get_view_range(relayout_data: Optional[dict]) -> Optional[Dict[str, List[float]]]:
+    """Returns the zoomed x and y ranges from a relayout event, or None if the
+    graph is not zoomed"""
+    if not relayout_data:
+        return None
+    view_range = {}
+    for axis in ["x", "y"]:
+        if f"{axis}axis.range[0]" in relayout_data:
+            view_range[axis] = [
+                relayout_data[f"{axis}axis.range[0]"],
+                relayout_data[f"{axis}axis.range[1]"],
+            ]
+        elif f"{axis}axis.range" in relayout_data:
+            view_range[axis] = relayout_data[f"{axis}axis.range"]
+    return view_range if view_range else None
+
+
+def ignore_relayout(relayout_data: Optional[dict]) -> bool:
+    """Relayout events that neither zoom nor reset the zoom (e.g. autosize)
+    should not trigger a new figure"""
+    ctx = dash.callback_context.triggered[0]["prop_id"]
+    return (
+        ctx.endswith(".relayoutData")
+        and get_view_range(relayout_data) is None
+        and not any(key.endswith("autorange") for key in (relayout_data or {}))
+    )
+
+
 @webvizstore
 def get_path(path: str) -> Path:
     return Path(path)
@@ -9,11 +9,14 @@ from dash.exceptions import PreventUpdate
 
 from webviz_subsurface._models import SurfaceSetModel, WellSetModel
 from webviz_subsurface._components import ColorPicker
+from webviz_subsurface._utils.typed_arrays import decode_array, encode_trace
 
 from ..figures.intersection import (
     get_plotly_trace_statistical_surface,
-    get_plotly_trace_realization_surface,
+    get_plotly_traces_realization_surfaces,
+    get_plotly_trace_realization_surfaces_compact,
     get_plotly_trace_well_trajectory,
+    get_plotly_trace_well_crossings,
     get_plotly_traces_uncertainty_envelope,
     get_plotly_zonelog_trace,
 )
@@ -39,6 +42,10 @@ def update_intersection(
         Input({"id": get_uuid("map"), "element": "stored_yline"}, "data"),
         Input({"id": get_uuid("intersection-data"), "element": "well"}, "value"),
         Input(get_uuid("realization-store"), "data"),
+        Input(
+            {"id": get_uuid("intersection-data"), "element": "realization_display"},
+            "value",
+        ),
         State(
             {"id": get_uuid("intersection-data"), "element": "surface_attribute"},
             "value",
@@ -64,6 +71,7 @@ def update_intersection(
         yline: Optional[List],
         wellname: str,
         realizations: List[int],
+        realization_display: List[str],
         surfaceattribute: str,
         surfacenames: List[str],
         statistics: List[str],
@@ -152,27 +160,55 @@ def update_intersection(
                             )
                             traces.append(trace)
                             showlegend = False
-                    if "Realizations" in statistics:
-                        for real in realizations:
-                            trace = get_plotly_trace_realization_surface(
+                    if "Realizations" in statistics and "compact" in (
+                        realization_display or []
+                    ):
+                        traces.append(
+                            get_plotly_trace_realization_surfaces_compact(
                                 surfaceset=surfset,
                                 fence_spec=fence_spec,
                                 legendname=f"{surfacename}({ensemble})",
                                 name=surfacename,
                                 attribute=surfaceattribute,
-                                realization=real,
+                                realizations=realizations,
                                 color=color,
                                 showlegend=showlegend,
                             )
-                            traces.append(trace)
-                            showlegend = False
+                        )
+                        showlegend = False
+                    elif "Realizations" in statistics:
+                        traces.extend(
+                            get_plotly_traces_realization_surfaces(
+                                surfaceset=surfset,
+                                fence_spec=fence_spec,
+                                legendname=f"{surfacename}({ensemble})",
+                                name=surfacename,
+                                attribute=surfaceattribute,
+                                realizations=realizations,
+                                color=color,
+                                showlegend=showlegend,
+                            )
+                        )
+                        showlegend = False
+        line = {"polyline": polyline, "xline": xline, "yline": yline}.get(
+            intersection_source
+        )
+        if line is not None:
+            crossing_wells = well_set_model.get_wells_crossing_polyline(line)
+            if crossing_wells:
+                traces.append(
+                    get_plotly_trace_well_crossings(
+                        [well_set_model.get_well(name) for name in crossing_wells],
+                        fence_spec,
+                    )
+                )
         if intersection_source == "well":
             well = well_set_model.get_well(wellname)
             traces.append(get_plotly_trace_well_trajectory(well))
             if well.zonelogname is not None:
                 traces.extend(get_plotly_zonelog_trace(well, zonelog))
 
-        return traces
+        return [encode_trace(trace) for trace in traces]
 
     @app.callback(
         Output(get_uuid("intersection-graph-layout"), "data"),
@@ -290,24 +326,15 @@ def update_intersection(
 
         user_range = []
         if not (zmax is None and zmin is None):
+            zmin_data, zmax_data = _get_depth_range(data)
             if "lock" in zrange_locks:
                 if zmax is None:
-                    zmax = max(
-                        max(x for x in item["y"] if x is not None) for item in data
-                    )
+                    zmax = zmax_data
                 if zmin is None:
-                    zmin = min(
-                        min(x for x in item["y"] if x is not None) for item in data
-                    )
+                    zmin = zmin_data
                 user_range = [zmax, zmin]
 
             if "truncate" in zrange_locks:
-                zmin_data = min(
-                    min(x for x in item["y"] if x is not None) for item in data
-                )
-                zmax_data = max(
-                    max(x for x in item["y"] if x is not None) for item in data
-                )
                 zmax = zmax if zmax is not None else zmax_data
                 zmin = zmin if zmin is not None else zmin_data
 
@@ -458,3 +485,13 @@ def get_fencespec_from_polyline(
     return poly.get_fence(
         distance=distance, atleast=atleast, nextend=nextend, asnumpy=True
     )
+
+
+def _get_depth_range(data: List[dict]) -> Tuple[float, float]:
+    """Returns the minimum and maximum depth of the intersection traces. The
+    traces may contain None values, or be encoded as typed arrays."""
+    yvalues = [decode_array(item["y"]) for item in data]
+    return (
+        float(min(np.nanmin(values) for values in yvalues)),
+        float(max(np.nanmax(values) for values in yvalues)),
+    )
@@ -3,7 +3,7 @@ import warnings
 
 import xtgeo
 import dash
-from dash.dependencies import Input, Output, State
+from dash.dependencies import Input, Output, State, ClientsideFunction
 from dash.exceptions import PreventUpdate
 
 from webviz_subsurface._models import SurfaceSetModel, SurfaceLeafletModel, WellSetModel
@@ -12,6 +12,10 @@ from webviz_subsurface._datainput.well import (
     create_leaflet_well_marker_layer,
 )
 
+# Maximum map distance from a click to a well trajectory for the well to be selected
+WELL_PICK_RADIUS = 100
+
+
 # pylint: disable=too-many-statements
 def update_maps(
     app: dash.Dash,
@@ -328,6 +332,18 @@ def update_maps(
                 return None
         raise PreventUpdate
 
+    # Clicks that add points to a polyline being drawn are not passed on, so
+    # drawing close to a well does not select it. Done clientside, as the
+    # state of the draw tools is only known in the browser.
+    app.clientside_callback(
+        ClientsideFunction(
+            namespace="clientside", function_name="get_click_when_not_drawing"
+        ),
+        Output({"id": get_uuid("map"), "element": "stored_click"}, "data"),
+        Input(get_uuid("leaflet-map1"), "click_position"),
+        State(get_uuid("leaflet-map1"), "id"),
+    )
+
     @app.callback(
         Output(
             {"id": get_uuid("intersection-data"), "element": "source"},
@@ -339,22 +355,39 @@ def update_maps(
         ),
         Input(get_uuid("leaflet-map1"), "clicked_shape"),
         Input(get_uuid("leaflet-map1"), "polyline_points"),
+        Input({"id": get_uuid("map"), "element": "stored_click"}, "data"),
     )
     # pylint: disable=protected-access
     def _update_from_map_click(
         clicked_shape: Optional[Dict],
         _polyline: List[List[float]],
+        click_position: Optional[List[float]],
     ) -> Tuple[str, Union[dash.dash._NoUpdate, str]]:
         """Update intersection source and optionally selected well when
-        user clicks a shape in map"""
+        user clicks a shape in map, or clicks close to a well"""
         ctx = dash.callback_context.triggered[0]
         if "polyline_points" in ctx["prop_id"]:
             return "polyline", dash.no_update
+        if "stored_click" in ctx["prop_id"]:
+            if click_position is None or well_set_model is None:
+                raise PreventUpdate
+            # Click position is given as [y, x]
+            wellname = well_set_model.get_nearest_well(
+                x=click_position[1],
+                y=click_position[0],
+                max_distance=WELL_PICK_RADIUS,
+            )
+            if wellname is None:
+                raise PreventUpdate
+            return "well", wellname
         if clicked_shape is None:
             raise PreventUpdate
         if clicked_shape.get("id") == "random_line":
             return "polyline", dash.no_update
-        if clicked_shape.get("id") in well_set_model.well_names:
+        if (
+            well_set_model is not None
+            and clicked_shape.get("id") in well_set_model.wells
+        ):
             return "well", clicked_shape.get("id")
         raise PreventUpdate
 
@@ -2,10 +2,15 @@ from typing import Dict, List, Optional, Any
 
 import numpy as np
 import xtgeo
+from scipy.spatial import cKDTree
 from webviz_config.common_cache import CACHE
 
 from webviz_subsurface._models import SurfaceSetModel
 from webviz_subsurface._utils.colors import hex_to_rgba
+from webviz_subsurface._utils.zonelog import get_zone_top_indices
+
+# Number of points above which WebGL is used to render traces
+SCATTERGL_POINT_LIMIT = 10000
 
 
 # pylint: disable=too-many-arguments
@@ -151,30 +156,80 @@ def get_plotly_traces_uncertainty_envelope(
 
 # pylint: disable=too-many-arguments
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
-def get_plotly_trace_realization_surface(
+def get_plotly_traces_realization_surfaces(
     surfaceset: SurfaceSetModel,
     fence_spec: np.ndarray,
     name: str,
     legendname: str,
     attribute: str,
-    realization: int,
+    realizations: List[int],
+    showlegend: bool = False,
+    sampling: Optional[str] = "billinear",
+    color: str = "red",
+) -> List[Dict[str, Any]]:
+    """Returns plotly line traces for a surface for a set of realizations.
+    All realizations are sampled along the fence in one batch."""
+    fence_values = surfaceset.get_realization_fence_values(
+        name=name,
+        attribute=attribute,
+        realizations=realizations,
+        fence_spec=fence_spec,
+        sampling=sampling,
+    )
+    return [
+        {
+            "x": fence_spec[:, 3],
+            "y": values,
+            "name": legendname,
+            "text": f"{legendname} realization: {realization}",
+            "showlegend": showlegend and idx == 0,
+            "hoverinfo": "y+x+text",
+            "mode": "lines",
+            "marker": {"color": hex_to_rgba(hex_string=color, opacity=0.5)},
+        }
+        for idx, (realization, values) in enumerate(zip(realizations, fence_values))
+    ]
+
+
+# pylint: disable=too-many-arguments
+@CACHE.memoize(timeout=CACHE.TIMEOUT)
+def get_plotly_trace_realization_surfaces_compact(
+    surfaceset: SurfaceSetModel,
+    fence_spec: np.ndarray,
+    name: str,
+    legendname: str,
+    attribute: str,
+    realizations: List[int],
     showlegend: bool = False,
     sampling: Optional[str] = "billinear",
     color: str = "red",
 ) -> Dict[str, Any]:
-    """Returns a plotly line trace for a surface"""
-    surface = surfaceset.get_realization_surface(
-        name=name, attribute=attribute, realization=realization
+    """Returns a single plotly line trace for a surface for a set of realizations.
+    Realizations are concatenated with gaps in between, and the realization
+    number of each point is stored as customdata for hover information."""
+    fence_values = surfaceset.get_realization_fence_values(
+        name=name,
+        attribute=attribute,
+        realizations=realizations,
+        fence_spec=fence_spec,
+        sampling=sampling,
     )
-    fencexy = get_surface_randomline(surface, fence_spec, sampling)
+    # Add a gap (NaN, serialized as null) after each realization
+    nreals, npoints = fence_values.shape
+    yvals = np.hstack([fence_values, np.full((nreals, 1), np.nan)]).ravel()
+    xvals = np.tile(np.append(fence_spec[:, 3], np.nan), nreals)
     return {
-        "x": fencexy[:, 0],
-        "y": fencexy[:, 1],
+        "type": "scattergl" if yvals.size > SCATTERGL_POINT_LIMIT else "scatter",
+        "x": xvals,
+        "y": yvals,
+        "customdata": np.repeat(np.array(realizations, dtype=np.int32), npoints + 1),
         "name": legendname,
-        "text": f"{legendname} realization: {realization}",
+        "hovertemplate": (
+            f"{legendname} realization: %{{customdata}}<br>%{{x}}, %{{y}}<extra></extra>"
+        ),
         "showlegend": showlegend,
-        "hoverinfo": "y+x+text",
         "mode": "lines",
+        "connectgaps": False,
         "marker": {"color": hex_to_rgba(hex_string=color, opacity=0.5)},
     }
 
@@ -187,28 +242,27 @@ def get_plotly_zonelog_trace(
     """Zonetops are extracted from a zonelog and plotted as markers"""
 
     df = well.dataframe
-
-    # Find zone transitions
-    df["transitions"] = df[zonelog].diff()
+    zonevals = df[zonelog].values
+    top_indices = get_zone_top_indices(zonevals)
+    if len(top_indices) == 0:
+        return []
     logrecord = well.get_logrecord(zonelog)
-    traces = []
-    for idx in range(0, df.shape[0] - 1):
-        # Use current sample if moving upwards in stratigraphy
-        # Use next sample if moving downwards in stratigraphy
-        if df.iloc[idx + 1]["transitions"] < 0 or df.iloc[idx]["transitions"] > 0:
-            traces.append(
-                {
-                    "x": [df.iloc[idx]["R_HLEN"]],
-                    "y": [df.iloc[idx]["Z_TVDSS"]],
-                    "marker": {"size": 10, "color": "red"},
-                    "showlegend": False,
-                    "hoverinfo": "y+name+text",
-                    "text": "TVDSS",
-                    "hoverlabel": {"namelength": -1},
-                    "name": f"Zonetop: <br>{logrecord[df.iloc[idx][zonelog]]}",
-                }
-            )
-    return traces
+    return [
+        {
+            "x": df["R_HLEN"].values[top_indices],
+            "y": df["Z_TVDSS"].values[top_indices],
+            "mode": "markers",
+            "marker": {"size": 10, "color": "red"},
+            "showlegend": False,
+            "hoverinfo": "y+text",
+            "text": [
+                f"Zonetop: <br>{logrecord.get(int(zone), int(zone))}"
+                for zone in zonevals[top_indices]
+            ],
+            "hoverlabel": {"namelength": -1},
+            "name": "Zonetops",
+        }
+    ]
 
 
 @CACHE.memoize(timeout=CACHE.TIMEOUT)
@@ -235,6 +289,33 @@ def get_plotly_trace_well_trajectory(well: xtgeo.Well) -> Dict[str, Any]:
     }
 
 
+def get_plotly_trace_well_crossings(
+    wells: List[xtgeo.Well], fence_spec: np.ndarray
+) -> Dict[str, Any]:
+    """Mark where wells cross a fence, at the depth of the trajectory sample
+    closest to the fence"""
+    fence_tree = cKDTree(fence_spec[:, :2])
+    hlen = []
+    depth = []
+    for well in wells:
+        dfr = well.dataframe
+        distance, fence_idx = fence_tree.query(dfr[["X_UTME", "Y_UTMN"]].values)
+        closest = int(np.argmin(distance))
+        hlen.append(float(fence_spec[fence_idx[closest], 3]))
+        depth.append(float(dfr["Z_TVDSS"].values[closest]))
+    return {
+        "x": hlen,
+        "y": depth,
+        "text": [well.name for well in wells],
+        "name": "Wells",
+        "mode": "markers+text",
+        "textposition": "top center",
+        "showlegend": False,
+        "hoverinfo": "text+y",
+        "marker": {"color": "black", "size": 8},
+    }
+
+
 def get_surface_randomline(
     surface: xtgeo.RegularSurface,
     fence_spec: np.ndarray,
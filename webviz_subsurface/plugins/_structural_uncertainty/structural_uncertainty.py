@@ -97,6 +97,8 @@ Activate to precalculate these percentiles for all realizations. \
                 depth_truncations: # Truncations to use for yaxis range
                     min: 1500
                     max: 3000
+                compact_realizations: True # Draw all realizations of a surface
+                                           # as one trace (faster for many realizations)
             colors: # Colors to use for surfaces in the intersection view specified
                     # for each ensemble
                 topupperreek:
@@ -169,6 +171,13 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
         if wellfolder is not None:
             self._wellfiles = json.load(find_files(wellfolder, wellsuffix))
 
+        # Precompute well fences for the initial intersection resolution/extension
+        resolution = self._initial_settings.get("intersection_data", {}).get(
+            "resolution", 10
+        )
+        extension = self._initial_settings.get("intersection_data", {}).get(
+            "extension", 500
+        )
         self._well_set_model = WellSetModel(
             self._wellfiles,
             zonelog=zonelog,
@@ -176,6 +185,7 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
             tvdmin=well_tvdmin,
             tvdmax=well_tvdmax,
             downsample_interval=well_downsample_interval,
+            precompute_fences=[(resolution, extension / resolution)],
         )
         self._use_wells = bool(self._wellfiles)
         if (
@@ -29,6 +29,7 @@ def clientside_stores(
                 id={"id": get_uuid("map"), "element": "stored_polyline"},
                 storage_type="session",
             ),
+            dcc.Store(id={"id": get_uuid("map"), "element": "stored_click"}),
             dcc.Store(
                 id={"id": get_uuid("map"), "element": "stored_xline"},
                 storage_type="session",
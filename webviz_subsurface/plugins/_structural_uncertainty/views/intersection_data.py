@@ -290,6 +290,7 @@ def options_layout(
     resolution: float,
     extension: int,
     initial_layout: Dict,
+    compact_realizations: bool,
 ) -> html.Div:
 
     return html.Div(
@@ -389,6 +390,19 @@ def options_layout(
                         ],
                         value=["uirevision"] if "uirevision" in initial_layout else [],
                     ),
+                    wcc.Checklist(
+                        id={
+                            "id": uuid,
+                            "element": "realization_display",
+                        },
+                        options=[
+                            {
+                                "label": "Merge realizations to one trace",
+                                "value": "compact",
+                            },
+                        ],
+                        value=["compact"] if compact_realizations else [],
+                    ),
                 ],
             ),
         ],
@@ -406,6 +420,7 @@ def settings_layout(get_uuid: Callable, initial_settings: Dict) -> html.Div:
                 resolution=initial_settings.get("resolution", 10),
                 extension=initial_settings.get("extension", 500),
                 initial_layout=initial_settings.get("intersection_layout", {}),
+                compact_realizations=initial_settings.get("compact_realizations", True),
             ),
             open_modal_layout(
                 modal_id="color",
@@ -2,6 +2,7 @@ from typing import List
 from uuid import uuid4
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import xtgeo
 from dash.exceptions import PreventUpdate
@@ -15,7 +16,12 @@ from webviz_config.webviz_store import webvizstore
 from webviz_config.utils import calculate_slider_step
 
 from webviz_subsurface._models import SurfaceLeafletModel
-from .._datainput.grid import load_grid, load_grid_parameter
+from .._datainput.grid import (
+    load_grid_geometry,
+    load_grid_parameter_values,
+    load_surface_grid_cells,
+)
+from .._utils.grid_geometry import sample_cells
 from .._datainput.surface import get_surface_fence
 
 
@@ -23,8 +29,7 @@ class SurfaceWithGridCrossSection(WebvizPluginABC):
     """Visualizes surfaces in a map view and grid parameters in a cross section view. \
 The cross section is defined by a polyline interactively edited in the map view.
 
-!> This is an experimental plugin exploring how we can visualize 3D grid data in Webviz. \
-The performance is currently slow for large grids.
+!> This is an experimental plugin exploring how we can visualize 3D grid data in Webviz.
 
 ---
 
@@ -312,9 +317,17 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
             if surface_type == "attribute":
                 min_val = color_values[0] if color_values else None
                 max_val = color_values[1] if color_values else None
-                grid = load_grid(get_path(self.gridfile))
-                gridparameter = load_grid_parameter(grid, get_path(gridparameter))
-                surface.slice_grid3d(grid, gridparameter)
+                cells = load_surface_grid_cells(
+                    get_path(self.gridfile), get_path(surfacepath)
+                )
+                surface.values = np.ma.masked_invalid(
+                    sample_cells(
+                        load_grid_parameter_values(
+                            get_path(self.gridfile), get_path(gridparameter)
+                        ),
+                        cells,
+                    )
+                )
 
             return [
                 SurfaceLeafletModel(
@@ -339,11 +352,14 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
         def _render_fence(coords, gridparameter, surfacepath, color_values, colorscale):
             if not coords:
                 raise PreventUpdate
-            grid = load_grid(get_path(self.gridfile))
-            gridparameter = load_grid_parameter(grid, get_path(gridparameter))
+            geometry = load_grid_geometry(get_path(self.gridfile))
             fence = get_fencespec(coords)
-            hmin, hmax, vmin, vmax, values = grid.get_randomline(
-                fence, gridparameter, zincrement=0.5
+            hmin, hmax, vmin, vmax, values = geometry.get_randomline(
+                fence,
+                load_grid_parameter_values(
+                    get_path(self.gridfile), get_path(gridparameter)
+                ),
+                zincrement=0.5,
             )
 
             surface = xtgeo.RegularSurface(get_path(surfacepath))
@@ -375,11 +391,12 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
             [State(self.ids("gridparameter"), "value")],
         )
         def _update_color_slider(_clicks, gridparameter):
-            grid = load_grid(get_path(self.gridfile))
-            gridparameter = load_grid_parameter(grid, get_path(gridparameter))
+            values = load_grid_parameter_values(
+                get_path(self.gridfile), get_path(gridparameter)
+            )
 
-            minv = float(f"{gridparameter.values.min():2f}")
-            maxv = float(f"{gridparameter.values.max():2f}")
+            minv = float(f"{np.nanmin(values):2f}")
+            maxv = float(f"{np.nanmax(values):2f}")
             value = [minv, maxv]
             step = calculate_slider_step(minv, maxv, steps=100)
             return minv, maxv, value, step
@@ -15,7 +15,7 @@ from webviz_config.webviz_store import webvizstore
 from webviz_config.utils import calculate_slider_step
 
 from webviz_subsurface._models import SurfaceLeafletModel
-from .._datainput.seismic import load_cube_data
+from .._datainput.seismic import load_cube
 from .._datainput.surface import get_surface_fence
 
 
@@ -300,8 +300,7 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
             if surface_type == "attribute":
                 min_val = color_values[0] if color_values else None
                 max_val = color_values[1] if color_values else None
-                cube = load_cube_data(get_path(cubepath))
-                surface.slice_cube(cube)
+                surface = load_cube(get_path(cubepath)).slice_surface(surface)
             return [
                 SurfaceLeafletModel(
                     surface,
@@ -325,7 +324,7 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
         def _render_fence(coords, cubepath, surfacepath, color_values, colorscale):
             if not coords:
                 raise PreventUpdate
-            cube = load_cube_data(get_path(cubepath))
+            cube = load_cube(get_path(cubepath))
             fence = get_fencespec(coords)
             hmin, hmax, vmin, vmax, values = cube.get_randomline(fence)
 
@@ -359,9 +358,9 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
         )
         def _update_color_slider(_clicks, cubepath):
 
-            cube = load_cube_data(get_path(cubepath))
-            minv = float(f"{cube.values.min():2f}")
-            maxv = float(f"{cube.values.max():2f}")
+            cube = load_cube(get_path(cubepath))
+            minv = float(f"{cube.value_min:2f}")
+            maxv = float(f"{cube.value_max:2f}")
             value = [minv, maxv]
             step = calculate_slider_step(minv, maxv, steps=100)
             return minv, maxv, value, step
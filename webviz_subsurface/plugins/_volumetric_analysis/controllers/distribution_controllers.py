@@ -16,6 +16,7 @@ from webviz_subsurface._components.tornado._tornado_data import TornadoData
 from webviz_subsurface._components.tornado._tornado_bar_chart import TornadoBarChart
 from webviz_subsurface._components.tornado._tornado_table import TornadoTable
 from webviz_subsurface._models import InplaceVolumesModel
+from webviz_subsurface._utils.typed_arrays import encode_figure
 from webviz_subsurface._abbreviations.volume_terminology import (
     volume_description,
     volume_unit,
@@ -155,6 +156,7 @@ def distribution_controllers(
                     figure.update_xaxes({"matches": None})
                 if not selections["Y axis matches"]:
                     figure.update_yaxes({"matches": None})
+            figure = encode_figure(figure.to_dict())
         else:
             figure = dash.no_update
 
@@ -308,7 +310,7 @@ def distribution_controllers(
     )
     def _update_page_conv(
         selections: dict, page_selected: str, figure: go.Figure
-    ) -> go.Figure:
+    ) -> dict:
         if page_selected != "conv":
             raise PreventUpdate
 
@@ -372,7 +374,7 @@ def distribution_controllers(
                 figure.update_xaxes({"matches": None})
             if not selections["Y axis matches"]:
                 figure.update_yaxes(dict(matches=None))
-        return figure
+        return encode_figure(figure.to_dict())
 
     @app.callback(
         Output(
@@ -15,7 +15,7 @@ from webviz_config.deprecation_decorators import deprecated_plugin
 
 from webviz_subsurface._models import SurfaceLeafletModel
 from .._datainput.xsection import XSectionFigure
-from .._datainput.seismic import load_cube_data
+from .._datainput.seismic import load_cube
 from .._datainput.well import load_well, make_well_layer
 from .._datainput.surface import load_surface
 
@@ -306,7 +306,7 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
             )
 
             if "show_seismic" in options:
-                cube = load_cube_data(get_path(cubefile))
+                cube = load_cube(get_path(cubefile))
                 xsect.plot_cube(cube)
 
             xsect.plot_well(
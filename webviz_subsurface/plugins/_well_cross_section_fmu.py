@@ -24,7 +24,7 @@ from webviz_config.deprecation_decorators import deprecated_plugin
 from webviz_subsurface._models import SurfaceLeafletModel
 from .._datainput.fmu_input import get_realizations
 from .._datainput.xsection import XSectionFigure
-from .._datainput.seismic import load_cube_data
+from .._datainput.seismic import load_cube
 from .._datainput.well import load_well
 
 # pylint: disable=too-many-instance-attributes
@@ -524,7 +524,7 @@ e.g. [xtgeo](https://xtgeo.readthedocs.io/en/latest/).
                 )
 
             if "show_seismic" in options:
-                cube = load_cube_data(get_path(segyfile))
+                cube = load_cube(get_path(segyfile))
                 xsect.plot_cube(cube)
 
             xsect.plot_well(